@@ -1,7 +1,6 @@
 from flask import Flask
-from app.models import User
 from config import Config
-from app.extensions import db, login_manager, migrate
+from app.extensions import db, login_manager, migrate, cache, live
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -11,14 +10,28 @@ def create_app(config_class=Config):
     db.init_app(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    live.init_app(app)
+
+    from app.search import init_search
+    init_search(app)
+
+    from app.assets import init_assets
+    init_assets(app)
+
+    from app.telemetry import init_pool_telemetry
+    init_pool_telemetry(app)
+
+    if app.config.get('SQL_PROFILING'):
+        from app.profiling import init_request_profiling
+        init_request_profiling(app)
 
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = "warning"
 
-    # 🔑 USER LOADER (THIS FIXES YOUR ERROR)
-    @login_manager.user_loader
-    def load_user(user_id):
-        return User.query.get(int(user_id))
+    # 🔑 USER LOADER (cached snapshot, see app/identity.py)
+    from app.identity import load_user
+    login_manager.user_loader(load_user)
 
     # Register Blueprints
     from app.auth.routes import auth_bp
@@ -32,5 +45,11 @@ def create_app(config_class=Config):
     app.register_blueprint(users_bp, url_prefix='/users')
     app.register_blueprint(errors_bp)
 
+    # CLI Commands
+    from app.cli import export_command, jobs_cli, perf_cli
+    app.cli.add_command(perf_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(export_command)
+
     return app
 
@@ -1,7 +1,12 @@
 # app/admin/routes.py
+import os
+
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app, abort,session
 from flask_login import login_required, current_user
 
+from app.extensions import live
+from app.jobs import queue_stats
+from app.telemetry import pool_metrics
 
 
 admin_bp = Blueprint(
@@ -14,4 +19,22 @@ admin_bp = Blueprint(
 @admin_bp.route("/dashboard")
 @login_required
 def dashboard():
-    return render_template("admin/dashboard.html")
+    if current_user.role != 'admin':
+        flash('Access Denied: Admins only.', 'danger')
+        return redirect(url_for('public.index'))
+
+    profiler = current_app.extensions.get('sql_profiler')
+    return render_template("admin/dashboard.html",
+                           routes=profiler.top() if profiler else None,
+                           db_pool=pool_metrics(current_app))
+
+
+@admin_bp.route("/metrics")
+@login_required
+def metrics():
+    """Connection pool and live stream telemetry for this worker process, job queue depth / latency"""
+    if current_user.role != 'admin':
+        return jsonify({'status': 'error', 'message': 'Admins only'}), 403
+
+    return jsonify({'pid': os.getpid(), 'db_pool': pool_metrics(current_app), 'live': dict(live.stats),
+                    'jobs': queue_stats()})
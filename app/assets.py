@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+import click
+from flask import current_app, request, send_from_directory
+from flask.cli import AppGroup
+
+# ==========================================
+# STATIC ASSET FINGERPRINTING
+# ==========================================
+# url_for('static', filename='css/style.css') -> /static/css/style.3f2a9c1d.css
+#
+# The hash comes from a manifest (built by `flask assets build`, or computed
+# at startup when the file is missing), so a fingerprinted URL never changes
+# content and can be cached for a year. Requests for it are mapped back to the
+# real file; if a .br / .gz sibling exists and the client accepts it, that is
+# sent instead. Uploaded avatars are content-addressed already (see
+# app/avatars.py) and get the same immutable headers without a manifest entry.
+MANIFEST_NAME = '.manifest.json'
+SKIP_DIRS = ('images/uploads',)
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.map')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_PREFIXES = ('images/uploads/avatars/',)
+IMMUTABLE_EXCEPTIONS = ('images/uploads/avatars/default.png',)
+
+assets_cli = AppGroup('assets', help='Static asset manifest and precompression.')
+
+
+def _iter_static_files(static_folder):
+    for root, dirs, files in os.walk(static_folder):
+        rel_root = os.path.relpath(root, static_folder).replace(os.sep, '/')
+        rel_root = '' if rel_root == '.' else rel_root + '/'
+        dirs[:] = [d for d in dirs if not (rel_root + d).startswith(SKIP_DIRS)]
+        for name in files:
+            if name == MANIFEST_NAME or name.endswith(('.gz', '.br')) or name.startswith('.'):
+                continue
+            yield rel_root + name
+
+
+def _fingerprint(static_folder, filename):
+    sha = hashlib.sha256()
+    with open(os.path.join(static_folder, filename), 'rb') as fh:
+        for chunk in iter(lambda: fh.read(64 * 1024), b''):
+            sha.update(chunk)
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{sha.hexdigest()[:8]}{ext}"
+
+
+def build_manifest(static_folder):
+    """{'css/style.css': 'css/style.3f2a9c1d.css', ...}"""
+    return {name: _fingerprint(static_folder, name) for name in sorted(_iter_static_files(static_folder))}
+
+
+def load_manifest(static_folder):
+    path = os.path.join(static_folder, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path) as fh:
+            return json.load(fh)
+    return build_manifest(static_folder)
+
+
+def precompress(static_folder, filename):
+    """Writes .gz (and .br when the optional brotli package is installed) next to the file"""
+    source = os.path.join(static_folder, filename)
+    with open(source, 'rb') as fh:
+        data = fh.read()
+    written = []
+    with gzip.open(source + '.gz', 'wb', compresslevel=9) as out:
+        out.write(data)
+    written.append('gz')
+    try:
+        import brotli  # optional dependency
+    except ImportError:
+        return written
+    with open(source + '.br', 'wb') as out:
+        out.write(brotli.compress(data, quality=11))
+    written.append('br')
+    return written
+
+
+# ==========================================
+# FLASK INTEGRATION
+# ==========================================
+def init_assets(app):
+    app.cli.add_command(assets_cli)
+    if not app.config.get('STATIC_FINGERPRINT', True) or not app.static_folder:
+        return
+
+    manifest = load_manifest(app.static_folder)
+    app.extensions['asset_manifest'] = {'files': manifest, 'reverse': {v: k for k, v in manifest.items()}}
+
+    @app.url_defaults
+    def _fingerprint_static_urls(endpoint, values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = manifest[values['filename']]
+
+    app.view_functions['static'] = serve_static
+
+
+def serve_static(filename):
+    """Replacement for Flask's static view that understands fingerprinted names"""
+    static_folder = current_app.static_folder
+    reverse = current_app.extensions['asset_manifest']['reverse']
+    max_age = current_app.config.get('STATIC_MAX_AGE', 31536000)
+
+    original = reverse.get(filename)
+    immutable = original is not None or (filename.startswith(IMMUTABLE_PREFIXES)
+                                         and filename not in IMMUTABLE_EXCEPTIONS)
+    if original is None:
+        original = filename
+
+    response = None
+    if original.endswith(COMPRESSIBLE):
+        for encoding, suffix in ENCODINGS:
+            sibling = os.path.join(static_folder, original + suffix)
+            if request.accept_encodings.quality(encoding) > 0 and os.path.isfile(sibling):
+                response = send_from_directory(static_folder, original + suffix,
+                                               mimetype=mimetypes.guess_type(original)[0])
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = send_from_directory(static_folder, original)
+        response.vary.add('Accept-Encoding')
+    else:
+        response = send_from_directory(static_folder, original)
+
+    if immutable:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+    return response
+
+
+@assets_cli.command('build')
+@click.option('--no-compress', is_flag=True, help='Skip writing .gz / .br siblings.')
+def build(no_compress):
+    """Hashes app/static into .manifest.json and precompresses text assets."""
+    static_folder = current_app.static_folder
+    manifest = build_manifest(static_folder)
+    with open(os.path.join(static_folder, MANIFEST_NAME), 'w') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    click.echo(f"✅ {len(manifest)} files fingerprinted into {MANIFEST_NAME}")
+
+    if not no_compress:
+        texts = [name for name in manifest if name.endswith(COMPRESSIBLE)]
+        formats = set()
+        for name in texts:
+            formats.update(precompress(static_folder, name))
+        click.echo(f"✅ {len(texts)} text assets precompressed ({', '.join(sorted(formats)) or 'none'})")
@@ -105,6 +105,7 @@ def reset_request():
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
         send_reset_email(user)
+        db.session.commit()
         flash('An email has been sent with instructions to reset your password.', 'info')
         return redirect(url_for('auth.login'))
 
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import secrets
+
+from flask import current_app
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy import update
+
+from app.extensions import db, cache
+from app.jobs import enqueue, job
+from app.models import User
+
+
+# ==========================================
+# AVATAR PIPELINE
+# ==========================================
+# Uploads are streamed to disk in chunks while being hashed, so a 10 MB photo
+# never sits in memory. The file is named after its content hash: the same
+# picture uploaded twice is stored (and resized) once. Resizing to the fixed
+# thumbnail sizes runs as a background job (app/jobs.py, so the workers must
+# see the same upload directory); when it finishes, the user's avatar column
+# is switched to the hash and the previous avatar's files are deleted if
+# nobody else uses them.
+#
+# User.avatar holds either a legacy file name ('default.png', 'ab12cd.jpg')
+# or a 16 character content hash whose files are <hash>_<size>.<webp|jpg>.
+AVATAR_DIR = 'static/images/uploads/avatars'
+AVATAR_SIZES = (64, 256)
+AVATAR_FORMATS = {'webp': ('WEBP', {'quality': 80, 'method': 4}),
+                  'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True})}
+DEFAULT_AVATAR = 'default.png'
+CHUNK_SIZE = 64 * 1024
+
+
+class AvatarError(ValueError):
+    pass
+
+
+def avatar_dir():
+    return os.path.join(current_app.root_path, AVATAR_DIR)
+
+
+def is_content_hash(avatar):
+    return bool(avatar) and '.' not in avatar
+
+
+def thumbnail_name(digest, size, fmt):
+    return f"{digest}_{size}.{fmt}"
+
+
+def _thumbnail_paths(digest):
+    return [os.path.join(avatar_dir(), thumbnail_name(digest, size, fmt))
+            for size in AVATAR_SIZES for fmt in AVATAR_FORMATS]
+
+
+# --- 1. Upload (request thread) ---
+def stream_to_disk(file_storage, max_bytes):
+    """Copies the upload in chunks, hashing as it goes. Returns (digest, temp path)."""
+    os.makedirs(avatar_dir(), exist_ok=True)
+    tmp_path = os.path.join(avatar_dir(), f".upload-{secrets.token_hex(8)}")
+    sha, written = hashlib.sha256(), 0
+    try:
+        with open(tmp_path, 'wb') as out:
+            while True:
+                chunk = file_storage.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise AvatarError(f"Avatar must be smaller than {max_bytes // (1024 * 1024)} MB.")
+                sha.update(chunk)
+                out.write(chunk)
+        # Header-only check: rejects non-images without decoding the pixels
+        with Image.open(tmp_path) as img:
+            img.verify()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        os.remove(tmp_path)
+        raise AvatarError("Avatar must be a JPEG, PNG, GIF or WebP image.")
+    except AvatarError:
+        os.remove(tmp_path)
+        raise
+    return sha.hexdigest()[:16], tmp_path
+
+
+def save_avatar(user, file_storage):
+    """
+    Stores the upload and schedules the swap. Returns True when the avatar is
+    already in place (duplicate content), False when it is being processed.
+    """
+    digest, tmp_path = stream_to_disk(file_storage, current_app.config.get('AVATAR_MAX_BYTES', 10 * 1024 * 1024))
+
+    if all(os.path.exists(p) for p in _thumbnail_paths(digest)):
+        os.remove(tmp_path)  # already stored: dedup
+        swap_avatar(user.id, digest)
+        return True
+
+    enqueue('avatars.process', {'user_id': user.id, 'digest': digest, 'source': tmp_path})
+    db.session.commit()
+    return False
+
+
+# --- 2. Resize (background job) ---
+def make_thumbnails(source, digest):
+    """Writes every size / format for one image (atomic renames, safe to run twice)"""
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)  # phone photos are often stored rotated
+        img = img.convert('RGBA' if img.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        for size in AVATAR_SIZES:
+            thumb = ImageOps.fit(img, (size, size), Image.LANCZOS)
+            for fmt, (pil_format, options) in AVATAR_FORMATS.items():
+                out = thumb.convert('RGB') if pil_format == 'JPEG' else thumb
+                path = os.path.join(avatar_dir(), thumbnail_name(digest, size, fmt))
+                tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+                out.save(tmp_path, pil_format, **options)
+                os.replace(tmp_path, path)
+
+
+@job('avatars.process', max_attempts=3)
+def process_avatar(user_id, digest, source):
+    """Safe to run again: thumbnails are written atomically and the swap is idempotent"""
+    if not os.path.exists(source):  # a previous run got this far
+        if all(os.path.exists(p) for p in _thumbnail_paths(digest)):
+            swap_avatar(user_id, digest)
+        return
+    try:
+        make_thumbnails(source, digest)
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        current_app.logger.exception("Avatar of user %s can't be decoded, dropped", user_id)
+        os.remove(source)  # retrying won't help
+        return
+    swap_avatar(user_id, digest)
+    os.remove(source)
+
+
+# --- 3. Swap + garbage collection ---
+def swap_avatar(user_id, digest):
+    """Points the user at the new avatar, then deletes the old one's files if unreferenced"""
+    old = db.session.query(User.avatar).filter(User.id == user_id).scalar()
+    if old == digest:
+        return
+    db.session.execute(update(User).where(User.id == user_id).values(avatar=digest))
+    cache.invalidate_after_commit(db.session, f"user:{user_id}")
+    db.session.commit()
+    collect_avatar(old)
+
+
+def collect_avatar(avatar):
+    """Removes an avatar's files once no user references it (never the default)"""
+    if not avatar or avatar == DEFAULT_AVATAR:
+        return
+    if db.session.query(User.id).filter(User.avatar == avatar).first() is not None:
+        return
+    paths = _thumbnail_paths(avatar) if is_content_hash(avatar) else [os.path.join(avatar_dir(), avatar)]
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,216 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from sqlalchemy import event as sa_event
+
+
+# ==========================================
+# 1. BACKENDS
+# ==========================================
+class CacheBackend:
+    """Minimal key/value interface every cache backend implements"""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def counter(self, key):
+        raise NotImplementedError
+
+    def incr(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-process TTL + LRU cache (default). Each worker keeps its own copy."""
+
+    def __init__(self, max_entries=1024, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._counters = {}         # tag versions; never evicted, or old entries could resurface
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def counter(self, key):
+        return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    Shared cache for multi-worker deployments.
+    `client` is anything speaking the redis-py API (redis.Redis, fakeredis, ...).
+    """
+
+    def __init__(self, client, default_ttl=300, prefix='suyash:'):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl or None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def counter(self, key):
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+# ==========================================
+# 2. APP CACHE (Flask extension)
+# ==========================================
+class Cache:
+    """
+    Flask extension wrapping the configured backend.
+
+    Entries are grouped under tags ('events', 'event:12', ...). Every tag has a
+    version number that is part of the entry's key, so invalidating a tag is
+    a single counter bump and stale entries simply age out. Tags are bumped
+    automatically after a commit touches a model registered with
+    invalidate_on().
+    """
+
+    def __init__(self, app=None):
+        self._tag_rules = {}  # model class -> fn(obj) returning tags
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('CACHE_BACKEND', 'memory')
+        ttl = app.config.get('CACHE_DEFAULT_TTL', 300)
+        if backend == 'redis':
+            import redis  # optional dependency, only needed for the shared backend
+            client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+            app.extensions['cache'] = RedisCache(client, default_ttl=ttl)
+        else:
+            app.extensions['cache'] = MemoryCache(app.config.get('CACHE_MAX_ENTRIES', 1024), default_ttl=ttl)
+        self._register_session_hooks()
+
+    @property
+    def backend(self):
+        return current_app.extensions['cache']
+
+    # --- Plain key/value ---
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(key, value, ttl)
+
+    def delete(self, key):
+        self.backend.delete(key)
+
+    def clear(self):
+        self.backend.clear()
+
+    # --- Tagged entries ---
+    def tag_version(self, tag):
+        return self.backend.counter(f"tag:{tag}")
+
+    def bump(self, *tags):
+        for tag in tags:
+            self.backend.incr(f"tag:{tag}")
+
+    def _versioned_key(self, key, tags):
+        versions = '.'.join(str(self.tag_version(tag)) for tag in tags)
+        return f"{key}@{versions}"
+
+    def memoize(self, key, producer, tags=(), ttl=None):
+        """Returns the cached value for key, calling producer() on a miss"""
+        full_key = self._versioned_key(key, tags)
+        value = self.backend.get(full_key)
+        if value is None:
+            value = producer()
+            self.backend.set(full_key, value, ttl)
+        return value
+
+    # --- Invalidation on writes ---
+    def invalidate_on(self, model, tags):
+        """tags: fn(obj) -> list of tags to bump when obj is inserted/updated/deleted"""
+        self._tag_rules[model] = tags
+
+    def invalidate_after_commit(self, session, *tags):
+        """For writes the ORM doesn't see (Core UPDATEs): bump tags once the transaction commits"""
+        session.info.setdefault('cache_tags', set()).update(tags)
+
+    def _register_session_hooks(self):
+        from app.extensions import db
+        session_cls = db.session.session_factory.class_
+        if sa_event.contains(session_cls, 'after_flush', self._collect):
+            return
+        sa_event.listen(session_cls, 'after_flush', self._collect)
+        sa_event.listen(session_cls, 'after_commit', self._apply)
+        sa_event.listen(session_cls, 'after_rollback', self._discard)
+
+    def _collect(self, session, flush_context):
+        pending = session.info.setdefault('cache_tags', set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            rule = self._tag_rules.get(type(obj))
+            if rule is not None:
+                pending.update(rule(obj))
+
+    def _apply(self, session):
+        tags = session.info.pop('cache_tags', None)
+        if tags and has_app_context() and 'cache' in current_app.extensions:
+            self.bump(*tags)
+
+    def _discard(self, session):
+        session.info.pop('cache_tags', None)
@@ -0,0 +1,204 @@
+import sys
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import AppGroup, with_appcontext
+from sqlalchemy import insert, text
+
+from app.extensions import db
+from app.models import User, Sport, Venue, Event, Team, Player, Fixture
+
+perf_cli = AppGroup('perf', help='Performance checks and harnesses.')
+
+
+def _scratch_app():
+    """A throwaway app bound to in-memory SQLite so checks never touch the real DB"""
+    from app import create_app
+    from config import ScratchConfig
+    return create_app(ScratchConfig)
+
+
+def _seed_listing_rows(n_events, teams_per_event=0, players_per_team=0):
+    """Bulk-inserts a synthetic dataset (Core executemany, no per-row ORM work)"""
+    n_refs = max(3, n_events // 200)
+    db.session.execute(insert(Sport), [
+        {'id': i + 1, 'name': f'Sport {i}', 'type': 'team', 'config_schema': {'roles': []}} for i in range(n_refs)
+    ])
+    db.session.execute(insert(Venue), [
+        {'id': i + 1, 'name': f'Venue {i}', 'city': 'Raipur'} for i in range(n_refs)
+    ])
+    db.session.execute(insert(User), [
+        {'id': i + 1, 'username': f'mgr{i}', 'email': f'mgr{i}@example.com', 'role': 'manager',
+         'password_hash': 'x'} for i in range(n_refs)
+    ])
+
+    start = datetime.now()
+    statuses = ['upcoming', 'live', 'completed']
+    db.session.execute(insert(Event), [
+        {'id': i + 1, 'title': f'Listing Cup {i}', 'sport_id': i % n_refs + 1, 'venue_id': (i * 7) % n_refs + 1,
+         'manager_id': (i * 13) % n_refs + 1, 'start_date': start + timedelta(hours=i), 'status': statuses[i % 3]}
+        for i in range(n_events)
+    ])
+
+    if teams_per_event:
+        teams = [{'id': e * teams_per_event + t + 1, 'event_id': e + 1, 'name': f'Team {e}-{t}'}
+                 for e in range(n_events) for t in range(teams_per_event)]
+        db.session.execute(insert(Team), teams)
+        db.session.execute(insert(Fixture), [
+            {'event_id': team['event_id'], 'team_a_id': team['id'], 'team_b_id': team['id'],
+             'start_time': start + timedelta(hours=team['id'])} for team in teams[::2]
+        ])
+        if players_per_team:
+            db.session.execute(insert(Player), [
+                {'team_id': team['id'], 'name': f"Player {team['id']}-{p}", 'details': {}}
+                for team in teams for p in range(players_per_team)
+            ])
+    db.session.commit()
+
+
+@perf_cli.command('listing-queries')
+@click.option('--small', default=10, help='Events in the first run.')
+@click.option('--large', default=200, help='Events in the second run.')
+def listing_queries(small, large):
+    """Asserts the listing routes cost the same number of queries at any size."""
+    from app.profiling import count_queries
+
+    results = {}
+    for size in (small, large):
+        app = _scratch_app()
+        with app.app_context():
+            db.create_all()
+            _seed_listing_rows(size)
+            client = app.test_client()
+            with count_queries() as index_q:
+                client.get('/')
+            with count_queries() as filter_q:
+                client.post('/api/filter_events', data={'sport_id': 'all'})
+            results[size] = (index_q.count, filter_q.count)
+            click.echo(f"{size:>6} events: index={index_q.count} queries, filter_events={filter_q.count} queries")
+            db.session.remove()
+
+    if results[small] != results[large]:
+        click.echo("❌ Query count grows with the number of events (N+1).")
+        sys.exit(1)
+    click.echo("✅ Listing routes run a constant number of queries.")
+
+
+@perf_cli.command('explain-listings')
+@click.option('--events', default=20000, help='Events to seed into the scratch database.')
+@click.option('--configured-db', is_flag=True,
+              help="EXPLAIN against the app's own database instead of a seeded scratch copy.")
+def explain_listings(events, configured_db):
+    """Fails if any registered listing query does a full table scan."""
+    from flask import current_app
+    from app.profiling import full_scans
+    from app.queries import LISTING_QUERIES
+
+    app = current_app._get_current_object() if configured_db else _scratch_app()
+    with app.app_context():
+        if not configured_db:
+            click.echo(f"Seeding {events} events into scratch SQLite...")
+            db.create_all()
+            _seed_listing_rows(events, teams_per_event=4, players_per_team=3)
+            db.session.execute(text('ANALYZE'))
+
+        event = db.session.query(Event).order_by(Event.id.desc()).first()
+        team = Team.query.filter_by(event_id=event.id).first() or Team.query.first()
+        sample = {'event_id': event.id, 'sport_id': event.sport_id, 'venue_id': event.venue_id,
+                  'manager_id': event.manager_id, 'team_id': team.id if team else 0}
+
+        failures = []
+        for name, factory in LISTING_QUERIES.items():
+            scans = full_scans(factory(sample))
+            click.echo(f"{'❌' if scans else '✅'} {name}" + (f"  (full scan: {', '.join(scans)})" if scans else ''))
+            if scans:
+                failures.append(name)
+        db.session.remove()
+
+    if failures:
+        click.echo(f"{len(failures)} listing queries fall back to full scans.")
+        sys.exit(1)
+
+
+@click.command('export')
+@click.argument('dataset', type=click.Choice(['teams', 'players', 'fixtures', 'scores']))
+@click.argument('event_ids', nargs=-1, type=int, required=True)
+@click.option('--format', '-f', 'fmt', type=click.Choice(['csv', 'jsonl', 'parquet']), default='csv')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, allow_dash=True), default='-',
+              help='File to write (default: stdout).')
+@with_appcontext
+def export_command(dataset, event_ids, fmt, output):
+    """Streams DATASET of the given events, e.g. `flask export scores 3 4 -f parquet -o season.parquet`."""
+    from app.exports import ExportError, export
+
+    try:
+        chunks = export(dataset, event_ids, fmt)
+    except ExportError as e:
+        raise click.ClickException(str(e))
+    with click.open_file(output, 'wb') as fh:
+        for chunk in chunks:
+            fh.write(chunk)
+
+
+jobs_cli = AppGroup('jobs', help='Background job queue (see app/jobs.py).')
+
+
+@jobs_cli.command('work')
+@click.option('--concurrency', '-c', type=int, default=None, help='Jobs run at once (default: JOBS_CONCURRENCY).')
+@click.option('--pool', type=click.Choice(['thread', 'process']), default=None,
+              help='Run handlers on threads or forked processes (default: JOBS_POOL).')
+@click.option('--poll-interval', type=float, default=None, help='Seconds between polls when idle.')
+@click.option('--burst', is_flag=True, help='Exit once no job is due instead of waiting for more.')
+@with_appcontext
+def jobs_work(concurrency, pool, poll_interval, burst):
+    """Runs queued jobs until SIGTERM / Ctrl-C (running jobs are finished first)."""
+    import signal
+    from flask import current_app
+    from app.jobs import Worker
+
+    app = current_app._get_current_object()
+    config = app.config
+    worker = Worker(app, concurrency=concurrency or config['JOBS_CONCURRENCY'],
+                    processes=(pool or config['JOBS_POOL']) == 'process',
+                    poll_interval=poll_interval or config['JOBS_POLL_INTERVAL'],
+                    lease_seconds=config['JOBS_LEASE_SECONDS'])
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    click.echo(f"Worker {worker.worker_id}: {worker.concurrency} {'processes' if worker.processes else 'threads'}"
+               f"{', burst' if burst else ''}")
+    stats = worker.run(burst=burst)
+    click.echo(', '.join(f"{key}={value}" for key, value in stats.items()))
+
+
+@jobs_cli.command('stats')
+@with_appcontext
+def jobs_stats():
+    """Queue depth and wait / run latency as JSON."""
+    import json
+    from app.jobs import queue_stats
+
+    click.echo(json.dumps(queue_stats(), indent=2))
+
+
+@jobs_cli.command('retry')
+@click.argument('job_ids', nargs=-1, type=int)
+@with_appcontext
+def jobs_retry(job_ids):
+    """Queues failed jobs again: the given ids, or all of them."""
+    from app.jobs import retry_failed
+
+    click.echo(f"{retry_failed(job_ids)} job(s) queued again.")
+
+
+@jobs_cli.command('purge')
+@click.option('--days', type=int, default=None, help='Keep jobs finished more recently (default: JOBS_KEEP_DAYS).')
+@click.option('--failed', is_flag=True, help='Delete old failed jobs too.')
+@with_appcontext
+def jobs_purge(days, failed):
+    """Deletes finished jobs older than --days."""
+    from flask import current_app
+    from app.jobs import purge
+
+    days = current_app.config['JOBS_KEEP_DAYS'] if days is None else days
+    deleted = purge(days, statuses=('done', 'failed') if failed else ('done',))
+    click.echo(f"{deleted} job(s) deleted.")
@@ -0,0 +1,61 @@
+import hashlib
+from datetime import timezone
+
+from flask import current_app, make_response, request
+
+
+# ==========================================
+# HTTP CONDITIONAL RESPONSES
+# ==========================================
+# Routes compute a cheap validator (an updated_at read) first and only build
+# the response when the client's copy is stale:
+#
+#     return conditional(etag_for('team', team_id, team.updated_at), team.updated_at,
+#                        lambda: jsonify({...}), private=True)
+def etag_for(*parts):
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode()).hexdigest()[:20]
+
+
+def _as_utc(value):
+    return value.replace(tzinfo=timezone.utc, microsecond=0) if value and value.tzinfo is None else value
+
+
+def _is_fresh(etag, last_modified):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.if_none_match:  # takes precedence over If-Modified-Since (RFC 9110)
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return _as_utc(last_modified) <= request.if_modified_since
+    return False
+
+
+def _apply_headers(response, etag, last_modified, max_age, private):
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = _as_utc(last_modified)
+    if private:
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True  # store, but revalidate every time
+    if private:
+        response.vary.add('Cookie')
+    return response
+
+
+def conditional(etag, last_modified, build, max_age=0, private=False):
+    """
+    Returns 304 (build() is never called) when the request's If-None-Match /
+    If-Modified-Since still match, else build()'s response with the validators set.
+    """
+    if _is_fresh(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:  # errors are never cached
+            return response
+    return _apply_headers(response, etag, last_modified, max_age, private)
@@ -0,0 +1,214 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.extensions import db
+from app.models import Fixture, Player, Team, Venue
+
+
+# ==========================================
+# STREAMING EXPORTS
+# ==========================================
+# A dataset is a typed column list plus a generator of row tuples reading
+# the database through a server-side cursor (yield_per): rows are fetched,
+# encoded and handed to the client YIELD_PER at a time, so memory stays flat
+# and the first bytes leave before the last rows are read, whatever the size
+# of the event. Encoders turn (columns, rows) into chunks of bytes.
+#
+# While a streamed result is open the connection can't run anything else
+# (MySQL server-side cursors), so whatever a dataset needs besides its main
+# query is loaded before the first row is fetched.
+YIELD_PER = 1000
+FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson', 'parquet': 'application/vnd.apache.parquet'}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def _stream(stmt, yield_per=YIELD_PER):
+    return db.session.execute(stmt.execution_options(yield_per=yield_per))
+
+
+# --- Datasets: columns as (name, type) and a row generator per dataset ---
+TEAM_COLUMNS = (('event_id', int), ('team_id', int), ('name', str), ('city', str), ('coach_name', str),
+                ('captain_id', int))
+PLAYER_COLUMNS = (('event_id', int), ('team_id', int), ('team_name', str), ('player_id', int), ('name', str),
+                  ('details', dict))
+FIXTURE_COLUMNS = (('event_id', int), ('fixture_id', int), ('title', str), ('start_time', datetime),
+                   ('end_time', datetime), ('venue_id', int), ('venue_name', str), ('team_a_id', int),
+                   ('team_a_name', str), ('team_b_id', int), ('team_b_name', str), ('version', int))
+SCORE_COLUMNS = (('event_id', int), ('fixture_id', int), ('fixture_title', str), ('start_time', datetime),
+                 ('team_id', int), ('team_name', str), ('player_id', int), ('player_name', str), ('metric', str),
+                 ('value', float))
+
+
+def team_rows(event_ids):
+    return _stream(select(Team.event_id, Team.id, Team.name, Team.city, Team.coach_name, Team.captain_id)
+                   .where(Team.event_id.in_(event_ids)).order_by(Team.event_id, Team.id))
+
+
+def player_rows(event_ids):
+    return _stream(select(Team.event_id, Team.id, Team.name, Player.id, Player.name, Player.details)
+                   .join(Player, Player.team_id == Team.id)
+                   .where(Team.event_id.in_(event_ids)).order_by(Team.event_id, Team.id, Player.id))
+
+
+def fixture_rows(event_ids):
+    team_a, team_b = aliased(Team), aliased(Team)
+    return _stream(select(Fixture.event_id, Fixture.id, Fixture.title, Fixture.start_time, Fixture.end_time,
+                          Fixture.venue_id, Venue.name, Fixture.team_a_id, team_a.name, Fixture.team_b_id,
+                          team_b.name, Fixture.version)
+                   .outerjoin(Venue, Venue.id == Fixture.venue_id)
+                   .outerjoin(team_a, team_a.id == Fixture.team_a_id)
+                   .outerjoin(team_b, team_b.id == Fixture.team_b_id)
+                   .where(Fixture.event_id.in_(event_ids)).order_by(Fixture.event_id, Fixture.start_time, Fixture.id))
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def score_rows(event_ids):
+    """score_data flattened to one row per (fixture, player, metric), derived totals included"""
+    players = {player_id: (team_id, team_name, name) for player_id, name, team_id, team_name in db.session.execute(
+        select(Player.id, Player.name, Team.id, Team.name)
+        .join(Team, Team.id == Player.team_id).where(Team.event_id.in_(event_ids)))}
+    result = _stream(select(Fixture.event_id, Fixture.id, Fixture.title, Fixture.start_time, Fixture.score_data)
+                     .where(Fixture.event_id.in_(event_ids), Fixture.score_data.isnot(None))
+                     .order_by(Fixture.event_id, Fixture.start_time, Fixture.id),
+                     yield_per=YIELD_PER // 10)  # a fixture's score_data expands to dozens of rows
+    for event_id, fixture_id, title, start_time, scores in result:
+        for pid, entry in (scores or {}).items():
+            player_id = int(pid) if str(pid).isdigit() else None
+            team_id, team_name, name = players.get(player_id, (None, None, None))
+            for metric, value in (entry if isinstance(entry, dict) else {}).items():
+                yield (event_id, fixture_id, title, start_time, team_id, team_name, player_id, name,
+                       metric, _number(value))
+
+
+DATASETS = {
+    'teams': (TEAM_COLUMNS, team_rows),
+    'players': (PLAYER_COLUMNS, player_rows),
+    'fixtures': (FIXTURE_COLUMNS, fixture_rows),
+    'scores': (SCORE_COLUMNS, score_rows),
+}
+
+
+# --- Encoders: (columns, rows) -> chunks of bytes ---
+def _batches(rows, size=YIELD_PER):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _plain(value):
+    """JSON columns as text, timestamps as ISO 8601"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    yield buffer.getvalue().encode()  # the header goes out before the first query result
+    for batch in _batches(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([['' if v is None else _plain(v) for v in row] for row in batch])
+        yield buffer.getvalue().encode()
+
+
+def encode_jsonl(columns, rows):
+    names = [name for name, _ in columns]
+    for batch in _batches(rows):
+        yield ''.join(json.dumps(dict(zip(names, row)), default=_plain, separators=(',', ':')) + '\n'
+                      for row in batch).encode()
+
+
+class _Drain:
+    """Write-only file object whose contents are taken after every row group"""
+
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:  # optional dependency, only needed for Parquet
+        raise ExportError("Parquet export needs pyarrow installed; use csv or jsonl")
+    return pyarrow
+
+
+def encode_parquet(columns, rows):
+    pa = _pyarrow()
+    types = {int: pa.int64(), float: pa.float64(), str: pa.string(), dict: pa.string(),
+             datetime: pa.timestamp('us')}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    json_columns = {i for i, (_, kind) in enumerate(columns) if kind is dict}
+    sink = _Drain()
+    with pa.parquet.ParquetWriter(sink, schema, compression='snappy') as writer:
+        for batch in _batches(rows):  # one row group per batch
+            values = list(zip(*batch))
+            arrays = [pa.array([_plain(v) for v in values[i]] if i in json_columns else values[i], type=field.type)
+                      for i, field in enumerate(schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    yield sink.take()  # footer
+
+
+ENCODERS = {'csv': encode_csv, 'jsonl': encode_jsonl, 'parquet': encode_parquet}
+
+
+def export(dataset, event_ids, fmt):
+    """
+    Generator of bytes for the dataset of the given events. Unknown
+    datasets / formats (or Parquet without pyarrow) raise ExportError
+    right away, before anything is streamed.
+    """
+    if dataset not in DATASETS:
+        raise ExportError(f"Unknown dataset '{dataset}' (expected one of: {', '.join(DATASETS)})")
+    if fmt not in ENCODERS:
+        raise ExportError(f"Unknown format '{fmt}' (expected one of: {', '.join(ENCODERS)})")
+    if fmt == 'parquet':
+        _pyarrow()
+    columns, rows = DATASETS[dataset]
+    return ENCODERS[fmt](columns, _lazy(rows, list(event_ids)))
+
+
+def _lazy(rows, event_ids):
+    """Runs the dataset's queries on the first next(), so the header can be sent before them"""
+    yield from rows(event_ids)
@@ -1,8 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
+from app.cache import Cache
+from app.live import Broker
 
 db = SQLAlchemy()
 login_manager = LoginManager()
 migrate = Migrate()
+cache = Cache()
+live = Broker()
 
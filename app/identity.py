@@ -0,0 +1,40 @@
+from flask import current_app
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.extensions import db, cache
+from app.models import User
+
+
+# ==========================================
+# CACHED USER LOADER (Flask-Login)
+# ==========================================
+# Flask-Login asks for the user on every authenticated request. Instead of a
+# SELECT each time we keep a small snapshot of the columns pages actually use
+# in the app cache (bounded LRU, short TTL) and attach it to the session with
+# merge(load=False), which issues no SQL. The result is a normal persistent
+# User: editing it and committing works as before, and anything not in the
+# snapshot (password_hash, saved_events, ...) loads on first access.
+#
+# Any committed write to a User row (update_profile, change_password, role
+# changes) bumps its user:<id> tag, see app/models.py.
+SNAPSHOT_FIELDS = ('id', 'username', 'email', 'role', 'avatar')
+
+
+def _snapshot(user_id):
+    row = db.session.query(*(getattr(User, f) for f in SNAPSHOT_FIELDS)).filter(User.id == user_id).first()
+    return dict(row._mapping) if row else {}  # {} caches "no such user" too
+
+
+def load_user(user_id):
+    user_id = int(user_id)
+    ttl = current_app.config.get('USER_CACHE_TTL', 60)
+    if not ttl:
+        return db.session.get(User, user_id)
+
+    snapshot = cache.memoize(f"user:{user_id}", lambda: _snapshot(user_id), tags=[f"user:{user_id}"], ttl=ttl)
+    if not snapshot:
+        return None
+
+    user = User(**snapshot)
+    make_transient_to_detached(user)  # clean, with an identity key; missing columns load lazily
+    return db.session.merge(user, load=False)
@@ -0,0 +1,293 @@
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import threading
+import traceback
+import uuid
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, update
+
+from app.extensions import db
+from app.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# BACKGROUND JOBS
+# ==========================================
+# A durable queue in the application database (the `jobs` table), no broker:
+#
+#   enqueue('avatars.process', {...})   INSERTs in the caller's transaction, so
+#                                       a job exists only once the request
+#                                       commits, and never runs before that.
+#   flask jobs work                     claims due jobs, runs them on a thread
+#                                       (or process) pool and records done /
+#                                       retry with backoff / failed.
+#
+# Claiming is SELECT ... FOR UPDATE SKIP LOCKED (MySQL 8) followed by an
+# UPDATE guarded on status='queued', so two workers never run the same job,
+# even where SKIP LOCKED is ignored (SQLite). Each claim carries a lease: the
+# job of a worker that died is queued again once its lease expires. A job can
+# therefore run more than once, and handlers are written to allow it.
+_handlers = {}
+
+Claimed = namedtuple('Claimed', 'id name payload attempts max_attempts token')
+
+
+class UnknownJob(KeyError):
+    pass
+
+
+def job(name, max_attempts=None):
+    """
+    Registers a handler, called with the payload as keyword arguments inside
+    an app context; the worker commits after it returns, rolls back if it raises.
+        @job('standings.rebuild')
+        def rebuild(event_id): ...
+    """
+    def register(fn):
+        fn.job_name, fn.max_attempts = name, max_attempts
+        _handlers[name] = fn
+        return fn
+    return register
+
+
+def enqueue(name, payload=None, delay=0, unique_key=None, max_attempts=None):
+    """
+    Adds a job to the current session (the caller commits) and returns its
+    id. With a unique_key, nothing is added while a job with that key is
+    still queued; the queued job's id is returned instead.
+    """
+    handler = _handlers.get(name)
+    if handler is None:
+        raise UnknownJob(name)
+    if unique_key:
+        queued = db.session.query(Job.id).filter(Job.unique_key == unique_key, Job.status == 'queued').scalar()
+        if queued is not None:
+            return queued
+    new_job = Job(name=name, payload=payload or {}, unique_key=unique_key,
+                  run_at=datetime.utcnow() + timedelta(seconds=delay),
+                  max_attempts=max_attempts or handler.max_attempts or current_app.config['JOBS_MAX_ATTEMPTS'])
+    db.session.add(new_job)
+    db.session.flush()
+    return new_job.id
+
+
+def backoff(attempt, base, cap):
+    """Seconds before retry number `attempt`: doubling from `base`, capped, with jitter"""
+    return min(cap, base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+# --- Execution (pool thread or child process) ---
+_worker_app = None  # set by Worker.run(); forked children inherit it
+
+
+def _init_child():
+    """Process pool: connections inherited from the parent must not be shared"""
+    with _worker_app.app_context():
+        db.engine.dispose(close=False)
+
+
+def _execute(name, payload):
+    with _worker_app.app_context():
+        try:
+            _handlers[name](**(payload or {}))
+            db.session.commit()
+        except BaseException:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+
+# ==========================================
+# WORKER
+# ==========================================
+class Worker:
+    """
+    Polls the queue from one thread and keeps up to `concurrency` jobs
+    running on the pool. All bookkeeping (claim, done, retry) happens on the
+    polling thread; the pool only runs handlers. stop() lets the running
+    jobs finish and records them before returning from run().
+    """
+
+    def __init__(self, app, concurrency=4, processes=False, poll_interval=1.0, lease_seconds=300):
+        self.app = app
+        self.concurrency = concurrency
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease_seconds)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"[:50]
+        self.stats = {'claimed': 0, 'done': 0, 'retried': 0, 'failed': 0, 'requeued': 0}
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def _pool(self):
+        if self.processes:
+            return ProcessPoolExecutor(self.concurrency, mp_context=multiprocessing.get_context('fork'),
+                                       initializer=_init_child)
+        return ThreadPoolExecutor(self.concurrency, thread_name_prefix='job')
+
+    def run(self, burst=False):
+        """Works until stop(); with burst=True, returns once nothing is due"""
+        global _worker_app
+        _worker_app = self.app
+        running = {}  # future -> Claimed
+        next_sweep = datetime.min
+        with self.app.app_context(), self._pool() as pool:
+            try:
+                while not self._stop.is_set():
+                    if datetime.utcnow() >= next_sweep:
+                        self.renew_leases(running.values())
+                        self.requeue_expired()
+                        next_sweep = datetime.utcnow() + self.lease / 10
+                    claimed = self.claim(self.concurrency - len(running)) if len(running) < self.concurrency else []
+                    for item in claimed:
+                        running[pool.submit(_execute, item.name, item.payload)] = item
+                    if not running:
+                        if burst:
+                            break
+                        self._stop.wait(self.poll_interval)
+                        continue
+                    finished, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self.finish(running.pop(future), future.exception())
+            finally:
+                for future in list(running):  # stopping: let the running jobs complete
+                    error = future.exception()
+                    self.finish(running.pop(future), error)
+                db.session.remove()
+        return self.stats
+
+    # --- Queue operations (polling thread) ---
+    def claim(self, limit):
+        now = datetime.utcnow()
+        ids = [job_id for (job_id,) in db.session.query(Job.id)
+               .filter(Job.status == 'queued', Job.run_at <= now)
+               .order_by(Job.run_at, Job.id).limit(limit).with_for_update(skip_locked=True)]
+        if not ids:
+            db.session.rollback()  # end the snapshot, or the next poll won't see new jobs
+            return []
+        token = f"{self.worker_id}:{uuid.uuid4().hex[:12]}"
+        db.session.execute(update(Job).where(Job.id.in_(ids), Job.status == 'queued')
+                           .values(status='running', locked_by=token, locked_until=now + self.lease,
+                                   started_at=now, attempts=Job.attempts + 1)
+                           .execution_options(synchronize_session=False))
+        claimed = [Claimed(*row, token) for row in db.session.query(
+            Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+            .filter(Job.id.in_(ids), Job.locked_by == token).order_by(Job.run_at, Job.id)]
+        db.session.commit()
+        self.stats['claimed'] += len(claimed)
+        return claimed
+
+    def finish(self, item, error):
+        now = datetime.utcnow()
+        values = {'locked_by': None, 'locked_until': None}
+        if error is None:
+            values.update(status='done', finished_at=now, last_error=None)
+            self.stats['done'] += 1
+        else:
+            text = ''.join(traceback.format_exception(type(error), error, error.__traceback__))[-4000:]
+            if item.name not in _handlers or item.attempts >= item.max_attempts:
+                values.update(status='failed', finished_at=now, last_error=text)
+                self.stats['failed'] += 1
+                logger.error("Job %s (%s) failed for good after %s attempts: %s", item.id, item.name,
+                             item.attempts, error)
+            else:
+                config = self.app.config
+                delay = backoff(item.attempts, config['JOBS_BACKOFF_BASE'], config['JOBS_BACKOFF_MAX'])
+                values.update(status='queued', run_at=now + timedelta(seconds=delay), last_error=text)
+                self.stats['retried'] += 1
+                logger.warning("Job %s (%s) attempt %s failed, retrying in %.0fs: %s", item.id, item.name,
+                               item.attempts, delay, error)
+        # Guarded on our token: if the lease ran out and another worker took the job, its result wins
+        db.session.execute(update(Job).where(Job.id == item.id, Job.locked_by == item.token).values(**values)
+                           .execution_options(synchronize_session=False))
+        db.session.commit()
+
+    def renew_leases(self, items):
+        """Heartbeat: jobs still running here keep their lease, however long they take"""
+        tokens = {item.token for item in items}
+        if tokens:
+            db.session.execute(update(Job).where(Job.status == 'running', Job.locked_by.in_(tokens))
+                               .values(locked_until=datetime.utcnow() + self.lease)
+                               .execution_options(synchronize_session=False))
+            db.session.commit()
+
+    def requeue_expired(self):
+        """Jobs whose worker died (lease passed) go back to the queue, or fail when out of attempts"""
+        now = datetime.utcnow()
+        lost = (Job.status == 'running', Job.locked_until < now)
+        released = {'locked_by': None, 'locked_until': None, 'last_error': 'lease expired (worker lost)'}
+        failed = db.session.execute(update(Job).where(*lost, Job.attempts >= Job.max_attempts)
+                                    .values(status='failed', finished_at=now, **released)
+                                    .execution_options(synchronize_session=False)).rowcount
+        requeued = db.session.execute(update(Job).where(*lost).values(status='queued', run_at=now, **released)
+                                      .execution_options(synchronize_session=False)).rowcount
+        db.session.commit()
+        self.stats['failed'] += failed
+        self.stats['requeued'] += requeued
+
+
+# ==========================================
+# METRICS & MAINTENANCE
+# ==========================================
+def _summary(sorted_values):
+    if not sorted_values:
+        return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    last = len(sorted_values) - 1
+    return {'p50': round(sorted_values[round(0.50 * last)], 1), 'p95': round(sorted_values[round(0.95 * last)], 1),
+            'max': round(sorted_values[last], 1)}
+
+
+def queue_stats(window=500):
+    """
+    Queue depth per status, how late the oldest due job is, and over the
+    last `window` finished jobs: wait (due -> picked up) and run time in ms.
+    """
+    now = datetime.utcnow()
+    depth = dict(db.session.query(Job.status, func.count(Job.id)).group_by(Job.status))
+    due = db.session.query(func.count(Job.id), func.min(Job.run_at)).filter(
+        Job.status == 'queued', Job.run_at <= now).one()
+    recent = (db.session.query(Job.run_at, Job.started_at, Job.finished_at)
+              .filter(Job.status == 'done').order_by(Job.finished_at.desc()).limit(window).all())
+    waits = sorted(max(0.0, (started - run_at).total_seconds() * 1000) for run_at, started, _ in recent)
+    runs = sorted((finished - started).total_seconds() * 1000 for _, started, finished in recent)
+    return {
+        'depth': {status: depth.get(status, 0) for status in ('queued', 'running', 'done', 'failed')},
+        'due': due[0],
+        'oldest_due_seconds': round((now - due[1]).total_seconds(), 1) if due[1] else 0.0,
+        'wait_ms': _summary(waits),
+        'run_ms': _summary(runs),
+        'sample': len(recent),
+    }
+
+
+def purge(older_than_days, statuses=('done',)):
+    """Deletes finished jobs older than the cutoff; returns how many"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = db.session.execute(delete(Job).where(Job.status.in_(statuses), Job.finished_at < cutoff)
+                                 .execution_options(synchronize_session=False)).rowcount
+    db.session.commit()
+    return deleted
+
+
+def retry_failed(job_ids=None):
+    """Puts failed jobs (all, or the given ids) back in the queue with fresh attempts"""
+    stmt = update(Job).where(Job.status == 'failed')
+    if job_ids:
+        stmt = stmt.where(Job.id.in_(job_ids))
+    retried = db.session.execute(stmt.values(status='queued', attempts=0, run_at=datetime.utcnow(),
+                                             finished_at=None)
+                                 .execution_options(synchronize_session=False)).rowcount
+    db.session.commit()
+    return retried
@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+from collections import deque
+
+from flask import current_app, has_app_context
+from sqlalchemy import event as sa_event
+
+
+# ==========================================
+# 1. BACKENDS
+# ==========================================
+# A backend only carries messages between workers; fan-out to the streams
+# connected to *this* worker is done by the Broker below. With the memory
+# backend a message reaches the subscribers of the publishing process only,
+# so multi-worker deployments use the redis one.
+class PubSubBackend:
+    """Minimal interface every pub/sub backend implements"""
+
+    def start(self, deliver):
+        """deliver(channel, message) is called for every message, from any worker"""
+        raise NotImplementedError
+
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryPubSub(PubSubBackend):
+    """In-process delivery (default, single worker)"""
+
+    def __init__(self):
+        self._deliver = None
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, channel, message):
+        if self._deliver is not None:
+            self._deliver(channel, message)
+
+
+class RedisPubSub(PubSubBackend):
+    """
+    Cross-worker delivery through Redis PUBLISH / PSUBSCRIBE.
+    `client` is anything speaking the redis-py API (redis.Redis, fakeredis, ...).
+    One listener thread per worker receives every channel and hands it to the broker.
+    """
+
+    def __init__(self, client, prefix='suyash:live:'):
+        self.client = client
+        self.prefix = prefix
+        self._pubsub = None
+        self._thread = None
+
+    def start(self, deliver):
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(f"{self.prefix}*")
+
+        def listen():
+            for item in self._pubsub.listen():
+                if item.get('type') != 'pmessage':
+                    continue
+                channel = item['channel']
+                channel = channel.decode() if isinstance(channel, bytes) else channel
+                deliver(channel[len(self.prefix):], json.loads(item['data']))
+
+        self._thread = threading.Thread(target=listen, name='live-pubsub', daemon=True)
+        self._thread.start()
+
+    def publish(self, channel, message):
+        self.client.publish(self.prefix + channel, json.dumps(message))
+
+    def close(self):
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+
+# ==========================================
+# 2. SUBSCRIPTIONS (one per connected stream)
+# ==========================================
+RESYNC = {'type': 'resync'}
+
+
+class Subscription:
+    """
+    Bounded mailbox for one client. A client that falls more than
+    `max_pending` messages behind has its backlog replaced by a single
+    'resync' message (reload the full scores) instead of growing memory
+    without limit or slowing the publisher down.
+    """
+
+    def __init__(self, broker, channels, max_pending):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.closed = False
+        self._pending = deque()
+        self._cond = threading.Condition()
+
+    def deliver(self, message):
+        """Returns True if the backlog was replaced by a resync"""
+        with self._cond:
+            overflow = len(self._pending) >= self.max_pending
+            if overflow:
+                self.dropped += len(self._pending)
+                self._pending.clear()
+                self._pending.append(RESYNC)
+            else:
+                self._pending.append(message)
+            self._cond.notify()
+        return overflow
+
+    def get(self, timeout=None):
+        """Next message, or None after `timeout` seconds without one"""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            return self._pending.popleft() if self._pending else None
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+
+
+class TooManySubscribers(RuntimeError):
+    pass
+
+
+# ==========================================
+# 3. BROKER (Flask extension)
+# ==========================================
+class Broker:
+    """
+    Flask extension: channels ('fixture:12', 'event:3') -> connected streams.
+
+    Publishing from request code is done with publish_after_commit(), so a
+    score delta is only pushed once it is durable, and never for a
+    transaction that rolled back (e.g. a version conflict retry).
+    """
+
+    def __init__(self, app=None):
+        self._channels = {}  # channel -> set(Subscription)
+        self._lock = threading.Lock()
+        self.stats = {'subscribers': 0, 'published': 0, 'delivered': 0, 'resyncs': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if app.config.get('LIVE_BACKEND', 'memory') == 'redis':
+            import redis  # optional dependency, only needed for the shared backend
+            backend = RedisPubSub(redis.Redis.from_url(app.config['LIVE_REDIS_URL']))
+        else:
+            backend = MemoryPubSub()
+        backend.start(self._fan_out)
+        app.extensions['live'] = backend
+        self._register_session_hooks()
+
+    @property
+    def backend(self):
+        return current_app.extensions['live']
+
+    # --- Subscribers (this worker) ---
+    def subscribe(self, channels, max_pending=64, max_subscribers=None):
+        with self._lock:
+            if max_subscribers is not None and self.stats['subscribers'] >= max_subscribers:
+                raise TooManySubscribers(max_subscribers)
+            subscription = Subscription(self, channels, max_pending)
+            for channel in subscription.channels:
+                self._channels.setdefault(channel, set()).add(subscription)
+            self.stats['subscribers'] += 1
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._channels.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._channels[channel]
+            self.stats['subscribers'] -= 1
+
+    def _fan_out(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        resyncs = sum(subscription.deliver(message) for subscription in subscribers)
+        # Publisher and listener threads both count: only under the lock
+        with self._lock:
+            self.stats['delivered'] += len(subscribers)
+            self.stats['resyncs'] += resyncs
+
+    # --- Publishing ---
+    def publish(self, channel, message):
+        with self._lock:
+            self.stats['published'] += 1
+        self.backend.publish(channel, message)
+
+    def publish_after_commit(self, session, channel, message):
+        session.info.setdefault('live_messages', []).append((channel, message))
+
+    def _register_session_hooks(self):
+        from app.extensions import db
+        session_cls = db.session.session_factory.class_
+        if sa_event.contains(session_cls, 'after_commit', self._flush_messages):
+            return
+        sa_event.listen(session_cls, 'after_commit', self._flush_messages)
+        sa_event.listen(session_cls, 'after_rollback', self._discard)
+
+    def _flush_messages(self, session):
+        messages = session.info.pop('live_messages', None)
+        if messages and has_app_context() and 'live' in current_app.extensions:
+            for channel, message in messages:
+                self.publish(channel, message)
+
+    def _discard(self, session):
+        session.info.pop('live_messages', None)
+
+
+# ==========================================
+# 4. SERVER-SENT EVENTS
+# ==========================================
+def format_sse(message):
+    """One SSE frame; the message 'type' becomes the event name"""
+    return f"event: {message.get('type', 'message')}\ndata: {json.dumps(message)}\n\n"
+
+
+def sse_stream(subscription, heartbeat, max_seconds, retry_ms=3000):
+    """
+    Generator for a streaming Response. Doesn't touch the app or the DB, so
+    no request context (or pooled connection) is held while a client idles.
+    Comment lines every `heartbeat` seconds keep proxies from closing the
+    connection and let the server notice clients that went away. After
+    `max_seconds` the stream ends and EventSource reconnects on its own.
+    The route also closes the subscription from response.call_on_close():
+    if the client leaves before the first chunk, this generator never starts
+    and its `finally` never runs.
+    """
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        while time.monotonic() < deadline:
+            message = subscription.get(timeout=heartbeat)
+            yield format_sse(message) if message is not None else ": keep-alive\n\n"
+    finally:
+        subscription.close()
@@ -1,16 +1,22 @@
 import time
+from datetime import datetime, timedelta
 from flask import current_app
 from flask_login import UserMixin
+from sqlalchemy import event as sa_event, inspect as sa_inspect, select, update
 from sqlalchemy.dialects.mysql import JSON
+from sqlalchemy.orm import Session
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from app.extensions import db
+from app.extensions import db, cache
 import jwt
 
 
 registrations = db.Table('registrations',
     db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
-    db.Column('event_id', db.Integer, db.ForeignKey('events.id'), primary_key=True)
+    db.Column('event_id', db.Integer, db.ForeignKey('events.id'), primary_key=True),
+    # The (user_id, event_id) primary key answers "does user U follow E";
+    # this one serves the reverse "who follows E" lookups
+    db.Index('ix_registrations_event', 'event_id')
 )
 
 
@@ -28,13 +34,20 @@ class User(db.Model, UserMixin):
     avatar = db.Column(db.String(20), default='default.png')
     events = db.relationship('Event', backref='manager', lazy=True)
 
-    # Relationship to access saved events
-    saved_events = db.relationship('Event', secondary=registrations, lazy='subquery',
+    # Relationship to access saved events. Loaded only when a page lists them;
+    # follow checks go through app.queries.is_following / followed_event_ids
+    saved_events = db.relationship('Event', secondary=registrations, lazy=True,
                                    backref=db.backref('participants_users', lazy=True))
 
     @property
     def avatar_url(self):
         """Helper to return full path for templates"""
+        return self.avatar_path()
+
+    def avatar_path(self, size=256, fmt='webp'):
+        """Static path of a resized avatar (legacy uploads are served as stored)"""
+        if self.avatar and '.' not in self.avatar:  # content hash, see app/avatars.py
+            return f"images/uploads/avatars/{self.avatar}_{size}.{fmt}"
         return f"images/uploads/avatars/{self.avatar}"
 
     # === ADD THESE TWO METHODS ===
@@ -78,6 +91,9 @@ class Sport(db.Model):
     # Lifting: { "roles": ["Lifter"], "stat_fields": ["snatch", "jerk", "total"] }
     config_schema = db.Column(JSON, nullable=False)
 
+    # Last write; drives the HTTP validators (ETag / Last-Modified, see app/conditional.py)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     events = db.relationship('Event', backref='sport', lazy=True)
 
 
@@ -94,6 +110,19 @@ class Venue(db.Model):
 # ==========================================
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # Search index (FULLTEXT on MySQL; see app/search.py)
+        db.Index('ix_events_title_description_ft', 'title', 'description', mysql_prefix='FULLTEXT'),
+        # Manager pages: counts by status, listings by date
+        db.Index('ix_events_manager_status', 'manager_id', 'status'),
+        db.Index('ix_events_manager_start', 'manager_id', 'start_date'),
+        # Public filters + (start_date, id) keyset pagination
+        db.Index('ix_events_start_id', 'start_date', 'id'),
+        db.Index('ix_events_sport_start', 'sport_id', 'start_date', 'id'),
+        db.Index('ix_events_venue_start', 'venue_id', 'start_date', 'id'),
+        db.Index('ix_events_status', 'status'),
+        db.Index('ix_events_updated_at', 'updated_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     sport_id = db.Column(db.Integer, db.ForeignKey('sports.id'), nullable=False)
@@ -111,6 +140,9 @@ class Event(db.Model):
     # JSON Settings
     rules_config = db.Column(JSON, nullable=True)
 
+    # Also touched when its teams, players or fixtures change (see section 9 below)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     # === ADD THIS RELATIONSHIP ===
     venue = db.relationship('Venue', backref='event_list', lazy=True)
     # =============================
@@ -125,6 +157,9 @@ class Event(db.Model):
 # ==========================================
 class Team(db.Model):
     __tablename__ = 'teams'
+    __table_args__ = (
+        db.Index('ix_teams_event', 'event_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
@@ -136,11 +171,17 @@ class Team(db.Model):
     # Captain logic: We store the player_id of the captain here
     captain_id = db.Column(db.Integer, nullable=True)
 
+    # Also touched when its players change
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     players = db.relationship('Player', backref='team', lazy=True)
 
 
 class Player(db.Model):
     __tablename__ = 'players'
+    __table_args__ = (
+        db.Index('ix_players_team', 'team_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
@@ -157,14 +198,29 @@ class Player(db.Model):
 # ==========================================
 # 5. MATCHES / FIXTURES (The Polymorphic Part)
 # ==========================================
+DEFAULT_MATCH_MINUTES = 90
+MAX_MATCH_MINUTES = 24 * 60  # upper bound on end_time - start_time, keeps clash lookups an index range
+
+
+def _default_end_time(context):
+    """Fixtures inserted without an end_time are booked for the default match length"""
+    return context.get_current_parameters()['start_time'] + timedelta(minutes=DEFAULT_MATCH_MINUTES)
+
+
 class Fixture(db.Model):
     __tablename__ = 'fixtures'
+    __table_args__ = (
+        db.Index('ix_fixtures_event_start', 'event_id', 'start_time'),
+        # Venue occupancy: "what overlaps [start, end) at venue V" is one index range
+        db.Index('ix_fixtures_venue_time', 'venue_id', 'start_time', 'end_time'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
     venue_id = db.Column(db.Integer, db.ForeignKey('venues.id'), nullable=True)
 
     start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False, default=_default_end_time)  # venue booked until
 
     # --- LOGIC FOR TEAM SPORTS (Cricket, Football, Kabaddi) ---
     team_a_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=True)
@@ -180,5 +236,181 @@ class Fixture(db.Model):
     # Football: { "team_a_goals": 2, "team_b_goals": 1 }
     # Weightlifting: { "results": [ { "player_id": 5, "snatch": 100, "jerk": 130 } ] }
     score_data = db.Column(JSON, nullable=True)
+
+    # Optimistic concurrency: every UPDATE checks and bumps this (see users/services.py)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
+
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     team_a_obj = db.relationship('Team', foreign_keys=[team_a_id], lazy=True)
-    team_b_obj = db.relationship('Team', foreign_keys=[team_b_id], lazy=True)
\ No newline at end of file
+    team_b_obj = db.relationship('Team', foreign_keys=[team_b_id], lazy=True)
+    aggregate = db.relationship('FixtureAggregate', uselist=False, lazy=True,
+                                cascade='all, delete-orphan', passive_deletes=True)
+
+
+# ==========================================
+# 6. NORMALIZED SCORES
+# ==========================================
+class ScoreEntry(db.Model):
+    """One row per recorded attempt / stat, mirrored from Fixture.score_data on every save"""
+    __tablename__ = 'score_entries'
+    __table_args__ = (
+        db.UniqueConstraint('fixture_id', 'player_id', 'metric', name='uq_score_entries_attempt'),
+        # Player history & leaderboards ("best s1 across the season")
+        db.Index('ix_score_entries_player_metric', 'player_id', 'metric'),
+        db.Index('ix_score_entries_metric_value', 'metric', 'value'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    fixture_id = db.Column(db.Integer, db.ForeignKey('fixtures.id', ondelete='CASCADE'), nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=False)
+    metric = db.Column(db.String(32), nullable=False)  # s1, c2, runs, goals...
+    value = db.Column(db.Float, nullable=False, default=0)
+    recorded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class FixtureAggregate(db.Model):
+    """Materialized per-fixture result, rewritten in the same transaction as the scores"""
+    __tablename__ = 'fixture_aggregates'
+
+    fixture_id = db.Column(db.Integer, db.ForeignKey('fixtures.id', ondelete='CASCADE'), primary_key=True)
+
+    # Team sports: sum of the sport's scoring_unit (runs / goals / points) per side
+    team_a_score = db.Column(db.Float, nullable=True)
+    team_b_score = db.Column(db.Float, nullable=True)
+
+    # Individual sports: best total in the session
+    top_player_id = db.Column(db.Integer, nullable=True)
+    top_total = db.Column(db.Float, nullable=True)
+
+    # { "<player_id>": {"best_snatch": 100, "best_cj": 120, "total": 220} }
+    summary = db.Column(JSON, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class Standing(db.Model):
+    """
+    One row per team (team sports) or lifter (individual sports) in an event.
+    Updated incrementally from fixture results by app/standings.py.
+    """
+    __tablename__ = 'standings'
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'team_id', 'player_id', name='uq_standings_entry'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id', ondelete='CASCADE'), nullable=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=True)
+    category = db.Column(db.String(50), nullable=True)  # weight class for lifters
+
+    # --- Team sports ---
+    played = db.Column(db.Integer, nullable=False, default=0)
+    won = db.Column(db.Integer, nullable=False, default=0)
+    drawn = db.Column(db.Integer, nullable=False, default=0)
+    lost = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Float, nullable=False, default=0)
+    score_for = db.Column(db.Float, nullable=False, default=0)      # runs / goals / points scored
+    score_against = db.Column(db.Float, nullable=False, default=0)
+    overs_for = db.Column(db.Float, nullable=False, default=0)      # cricket net run rate
+    overs_against = db.Column(db.Float, nullable=False, default=0)
+
+    # --- Individual sports ---
+    best_total = db.Column(db.Float, nullable=True)
+    sinclair_total = db.Column(db.Float, nullable=True)
+
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+# ==========================================
+# 7. BACKGROUND JOBS (see app/jobs.py)
+# ==========================================
+class Job(db.Model):
+    """
+    One unit of deferred work. Rows are inserted in the enqueuing request's
+    transaction, claimed by `flask jobs work`, retried with backoff and kept
+    after they finish (purged by age) for the latency metrics.
+    """
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),  # claim: queued and due, oldest first
+        db.Index('ix_jobs_status_finished', 'status', 'finished_at'),  # metrics + purge
+        db.Index('ix_jobs_unique_key', 'unique_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(64), nullable=False)  # registered handler, e.g. 'avatars.process'
+    payload = db.Column(JSON, nullable=True)
+    status = db.Column(db.String(16), nullable=False, default='queued')  # queued, running, done, failed
+    unique_key = db.Column(db.String(100), nullable=True)  # at most one queued job per key
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # not before (backoff)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    # Lease: a running job whose worker died is requeued once locked_until passes
+    locked_by = db.Column(db.String(64), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+
+
+# ==========================================
+# 8. CACHE INVALIDATION (see app/cache.py)
+# ==========================================
+# Bumped after commit whenever a row of that model is written
+def _player_event_tags(player):
+    # New players aren't attached to their team relationship yet during the flush
+    team = player.team or db.session.get(Team, player.team_id)
+    return [f"event:{team.event_id}", f"roster:{team.event_id}"] if team else []
+
+
+cache.invalidate_on(User, lambda user: [f"user:{user.id}"])
+cache.invalidate_on(Event, lambda event: ['events', f"event:{event.id}"])
+cache.invalidate_on(Sport, lambda sport: ['sports'])
+cache.invalidate_on(Venue, lambda venue: ['venues'])
+cache.invalidate_on(Team, lambda team: [f"event:{team.event_id}", f"roster:{team.event_id}"])
+cache.invalidate_on(Fixture, lambda fixture: [f"event:{fixture.event_id}"])
+cache.invalidate_on(Player, _player_event_tags)
+
+
+# ==========================================
+# 9. CHANGE TRACKING (updated_at on parents)
+# ==========================================
+# A player write touches its team and event, a team or fixture write touches
+# its event, so Event.updated_at alone says whether anything shown for the
+# event changed. Renaming a venue or a manager touches their events too (the
+# cards show both names). Done with Core UPDATEs after the flush.
+@sa_event.listens_for(Session, 'after_flush')
+def _touch_parents(session, flush_context):
+    event_ids, team_ids, venue_ids, manager_ids = set(), set(), set(), set()
+    for obj in list(session.new) + list(session.deleted) + \
+            [o for o in session.dirty if session.is_modified(o, include_collections=False)]:
+        if isinstance(obj, Player) and obj.team_id:
+            team_ids.add(obj.team_id)
+        elif isinstance(obj, (Team, Fixture)) and obj.event_id:
+            event_ids.add(obj.event_id)
+    for obj in session.dirty:
+        if isinstance(obj, Venue) and sa_inspect(obj).attrs.name.history.has_changes():
+            venue_ids.add(obj.id)
+        elif isinstance(obj, User) and sa_inspect(obj).attrs.username.history.has_changes():
+            manager_ids.add(obj.id)
+    if not (event_ids or team_ids or venue_ids or manager_ids):
+        return
+
+    now = datetime.utcnow()
+    conn = session.connection()
+    events = Event.__table__
+    if venue_ids or manager_ids:
+        conn.execute(update(events).where(events.c.venue_id.in_(venue_ids) | events.c.manager_id.in_(manager_ids))
+                     .values(updated_at=now))
+    if team_ids:
+        conn.execute(update(Team.__table__).where(Team.__table__.c.id.in_(team_ids)).values(updated_at=now))
+        event_ids.update(row.event_id for row in conn.execute(
+            select(Team.__table__.c.event_id).where(Team.__table__.c.id.in_(team_ids))))
+    if event_ids:
+        conn.execute(update(events).where(events.c.id.in_(event_ids)).values(updated_at=now))
@@ -0,0 +1,227 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.extensions import db
+
+
+# ==========================================
+# QUERY COUNTING
+# ==========================================
+class QueryCounter:
+    """Collects every SQL statement sent to the engine while active"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Usage:
+        with count_queries() as counter:
+            client.post('/api/filter_events', data={...})
+        print(counter.count)
+    """
+    engine = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter._on_execute)
+
+
+@contextmanager
+def assert_max_queries(limit, engine=None):
+    """Fails loudly if the wrapped block runs more than `limit` statements"""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(counter.statements))
+        raise AssertionError(f"Expected at most {limit} queries, got {counter.count}:\n{listing}")
+
+
+# ==========================================
+# EXPLAIN
+# ==========================================
+class Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper around any select (EXPLAIN QUERY PLAN on SQLite)"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    prefix = 'EXPLAIN QUERY PLAN ' if compiler.dialect.name == 'sqlite' else 'EXPLAIN '
+    return prefix + compiler.process(element.statement, **kw)
+
+
+def full_scans(query):
+    """
+    Runs EXPLAIN for an ORM query and returns the tables it reads with a full scan.
+    Index scans (e.g. an ordered walk of an index for LIMIT) are fine.
+    """
+    # Read the raw DBAPI rows: the compiled result map belongs to the inner
+    # SELECT and would run its column types over the EXPLAIN output
+    cursor = db.session.execute(Explain(query.statement)).cursor
+    names = [col[0] for col in cursor.description]
+    rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+    scans = []
+    for row in rows:
+        if 'detail' in row:  # SQLite
+            detail = row['detail']
+            if detail.startswith('SCAN ') and 'USING' not in detail and 'CONSTANT ROW' not in detail:
+                scans.append(detail.split()[1])
+        elif row.get('type') == 'ALL':  # MySQL
+            scans.append(row['table'])
+    return scans
+
+
+# ==========================================
+# REQUEST PROFILING (opt-in, SQL_PROFILING=1)
+# ==========================================
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement):
+    """Normalized SQL: literals -> ?, IN (?, ?, ...) -> (?...), collapsed whitespace"""
+    sql = _LITERAL_RE.sub('?', statement)
+    sql = sql.replace('%s', '?')  # MySQL drivers use format-style placeholders
+    sql = _IN_LIST_RE.sub('(?...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class RequestProfile:
+    """SQL issued while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement, elapsed_ms):
+        self.queries += 1
+        self.db_ms += elapsed_ms
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold):
+        """Statements run more than `threshold` times: the N+1 suspects"""
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n > threshold]
+
+
+class RouteStats:
+    """Per-endpoint totals across requests (this worker process only)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = {}
+
+    def add(self, endpoint, profile, request_ms, n_plus_one):
+        with self._lock:
+            row = self.routes.setdefault(endpoint, {
+                'endpoint': endpoint, 'requests': 0, 'queries': 0, 'db_ms': 0.0,
+                'max_db_ms': 0.0, 'max_queries': 0, 'request_ms': 0.0, 'n_plus_one': 0,
+            })
+            row['requests'] += 1
+            row['queries'] += profile.queries
+            row['db_ms'] += profile.db_ms
+            row['request_ms'] += request_ms
+            row['max_db_ms'] = max(row['max_db_ms'], profile.db_ms)
+            row['max_queries'] = max(row['max_queries'], profile.queries)
+            row['n_plus_one'] += bool(n_plus_one)
+
+    def top(self, limit=20):
+        with self._lock:
+            rows = [dict(row) for row in self.routes.values()]
+        for row in rows:
+            row['avg_db_ms'] = round(row['db_ms'] / row['requests'], 2)
+            row['avg_queries'] = round(row['queries'] / row['requests'], 1)
+            row['avg_request_ms'] = round(row['request_ms'] / row['requests'], 2)
+            row['db_ms'] = round(row['db_ms'], 2)
+            row['max_db_ms'] = round(row['max_db_ms'], 2)
+        return sorted(rows, key=lambda r: -r['db_ms'])[:limit]
+
+
+def init_request_profiling(app):
+    """
+    Hooks the engine's cursor events and the request cycle. Per request it
+    records query count, DB time and repeated statements, flags N+1
+    patterns, logs slow requests and adds a Server-Timing header.
+    """
+    stats = RouteStats()
+    app.extensions['sql_profiler'] = stats
+    threshold = app.config.get('SQL_PROFILING_N_PLUS_ONE', 5)
+    slow_ms = app.config.get('SQL_SLOW_REQUEST_MS', 500)
+    log = logging.getLogger('app.sql.slow')
+    if app.config.get('SQL_SLOW_LOG') and not log.handlers:
+        handler = logging.FileHandler(app.config['SQL_SLOW_LOG'])
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+
+    with app.app_context():
+        engine = db.engine
+
+    # The start time lives on the statement's execution context, not the pooled
+    # connection: a statement that raises never reaches after_cursor_execute
+    def _record(statement, context):
+        started = getattr(context, '_query_start', None)
+        profile = g.get('sql_profile') if has_request_context() else None
+        if started is not None and profile is not None and statement:
+            profile.record(statement, (time.perf_counter() - started) * 1000)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        _record(statement, context)
+
+    @event.listens_for(engine, 'handle_error')
+    def _failed(exception_context):
+        _record(exception_context.statement, exception_context.execution_context)
+
+    @app.before_request
+    def _begin_profile():
+        g.sql_profile = RequestProfile()
+
+    @app.after_request
+    def _end_profile(response):
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return response
+        request_ms = (time.perf_counter() - profile.started) * 1000
+        endpoint = request.endpoint or '<no route>'  # keep 404 probes from growing the table
+        n_plus_one = profile.repeated(threshold)
+        stats.add(endpoint, profile, request_ms, n_plus_one)
+
+        if n_plus_one:
+            log.warning("N+1 %s: %s", endpoint, '; '.join(f"{n}x {sql[:120]}" for sql, n in n_plus_one[:3]))
+        if request_ms >= slow_ms:
+            log.warning("SLOW %s %s %.0fms (db %.0fms, %d queries)",
+                        request.method, request.full_path.rstrip('?'), request_ms, profile.db_ms, profile.queries)
+        response.headers['Server-Timing'] = f"db;dur={profile.db_ms:.1f};desc=\"{profile.queries} queries\""
+        return response
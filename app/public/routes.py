@@ -1,79 +1,140 @@
-from flask import Blueprint, render_template, request, jsonify
+from datetime import date
+
+from flask import Blueprint, Response, render_template, request, jsonify, current_app, abort
 from flask_login import login_required,current_user
-from app.extensions import db
+from app.conditional import conditional, etag_for
+from app.extensions import db, cache, live
+from app.live import TooManySubscribers, sse_stream
 
-from app.models import Event, Team, Sport, Venue
+from app.models import Event, Fixture
+from app.standings import get_standings
+from app.queries import (EventListingQuery, InvalidCursor, followed_event_ids, homepage_stats, is_following,
+                         listing_version, load_event_details, set_following, sport_choices, venue_choices)
 
 public_bp = Blueprint('public', __name__)
 
 
 @public_bp.route('/')
 def index():
-    # Fetch Data for Filters
-    stats = {
-        'events': Event.query.filter(Event.status != 'completed').count(),
-        'active_now': Event.query.filter_by(status='live').count()
-    }
-    sports = Sport.query.all()
-    venues = Venue.query.all()  # For the venue filter
+    # Fetch Data for Filters (cached, invalidated on event / sport / venue writes)
+    stats = homepage_stats()
+    sports = sport_choices()
+    venues = venue_choices()  # For the venue filter
 
-    # Initial load (Recent 6)
-    upcoming_events = Event.query.order_by(Event.start_date.desc()).limit(9).all()
+    # First page of the unfiltered listing: same keyset paging as filter_events, so
+    # infinite scroll continues from next_cursor
+    upcoming_events, next_cursor = EventListingQuery().page(None, current_app.config['EVENTS_PAGE_SIZE'])
 
     return render_template('public/index.html',
                            stats=stats,
                            sports=sports,
                            venues=venues,
-                           events=upcoming_events)
+                           events=upcoming_events,
+                           next_cursor=next_cursor)
 
 
 # ==========================================
 # 1. ADVANCED FILTER API
 # ==========================================
-@public_bp.route('/api/filter_events', methods=['POST'])
+@public_bp.route('/api/filter_events', methods=['GET', 'POST'])
 def filter_events():
-    # 1. Get Filter Values
-    sport_id = request.form.get('sport_id')
-    venue_id = request.form.get('venue_id')
-    date_filter = request.form.get('date_filter')  # 'today', 'week', 'month'
-    search_query = request.form.get('search')
-
-    # 2. Base Query
-    query = Event.query
+    args = request.values  # GET (cacheable, revalidated with ETag) or the legacy form POST
 
-    # 3. Apply Filters
-    if sport_id and sport_id != 'all':
-        query = query.filter_by(sport_id=sport_id)
+    # 1. Get Filter Values
+    sport_id = args.get('sport_id')
+    venue_id = args.get('venue_id')
+    date_filter = args.get('date_filter')  # 'today', 'week', 'month'
+    search_query = args.get('search')
+
+    # 2. Paging (cursor is the opaque token returned by the previous page)
+    cursor = args.get('cursor')
+    page_size = min(args.get('limit', current_app.config['EVENTS_PAGE_SIZE'], type=int),
+                    current_app.config['EVENTS_MAX_PAGE_SIZE'])
+    page_size = max(page_size, 1)
+    output = args.get('format', 'html')  # 'html' or 'json'
+
+    # 3. Build & Execute (sport / venue / manager are joined in, no per-card lookups)
+    def build():
+        try:
+            events, next_cursor = (EventListingQuery()
+                                   .for_sport(sport_id)
+                                   .at_venue(venue_id)
+                                   .matching(search_query)
+                                   .starting_within(date_filter)
+                                   .page(cursor, page_size))
+        except InvalidCursor:
+            return jsonify({'status': 'error', 'message': 'Invalid cursor'}), 400
+
+        if output == 'json':
+            following = followed_event_ids(current_user, [e.id for e in events])
+            return jsonify({'events': [_card_data(e, e.id in following) for e in events],
+                            'next_cursor': next_cursor})
+
+        # Follow-up pages append to the grid, so don't render the "no events" placeholder
+        html = render_template('partials/event_cards.html', events=events) if events or not cursor else ''
+        return jsonify({'html': html, 'next_cursor': next_cursor})
+
+    # JSON cards carry the viewer's follow flags: not worth a per-user validator
+    if output == 'json' and current_user.is_authenticated:
+        return build()
+
+    # 4. Validator: any event / sport write, a venue or manager rename (or a new day, for relative date filters)
+    last_modified, event_count = listing_version()
+    etag = etag_for('events', last_modified, event_count, sorted(args.items(multi=True)),
+                    date.today() if date_filter in ('today', 'week', 'month') else '')
+    return conditional(etag, last_modified, build)
+
+
+def _card_data(event, following=False):
+    """Compact card payload for the JSON mode of filter_events"""
+    return {
+        'id': event.id,
+        'title': event.title,
+        'sport': event.sport.name,
+        'venue': event.venue.name if event.venue else None,
+        'manager': event.manager.username,
+        'start_date': event.start_date.isoformat(),
+        'status': event.status,
+        'following': following,
+    }
 
-    if venue_id and venue_id != 'all':
-        query = query.filter_by(venue_id=venue_id)
 
-    if search_query:
-        query = query.filter(Event.title.ilike(f"%{search_query}%"))
+@public_bp.route('/api/get_event_details', methods=['GET', 'POST'])
+def get_event_details():
+    event_id = request.values.get('event_id', type=int)
 
-    # Date Logic (simplified for example)
-    from datetime import datetime, timedelta
-    today = datetime.now()
-    if date_filter == 'week':
-        query = query.filter(Event.start_date <= today + timedelta(days=7))
-    elif date_filter == 'month':
-        query = query.filter(Event.start_date <= today + timedelta(days=30))
+    # Validator first: Event.updated_at is bumped by writes to its teams, players and fixtures
+    updated_at = db.session.query(Event.updated_at).filter(Event.id == event_id).scalar()
+    if updated_at is None:
+        abort(404)
+    etag = etag_for('event', event_id, updated_at, current_user.get_id(), is_following(current_user, event_id))
 
-    # Execute
-    events = query.order_by(Event.start_date.asc()).all()
+    def render_modal():
+        details = load_event_details(event_id, current_user)
+        return render_template('partials/event_details_modal_body.html',
+                               standings=get_standings(event_id, updated_at), **details)
 
-    return jsonify({'html': render_template('partials/event_cards.html', events=events)})
+    def build():
+        # Anonymous visitors all see the same fragment: render it once per event version. The
+        # version is in the key because tag bumps don't reach other workers' memory caches
+        if current_user.is_authenticated:
+            modal_html = render_modal()
+        else:
+            modal_html = cache.memoize(f"modal:event:{event_id}@{updated_at.isoformat()}", render_modal,
+                                       tags=[f"event:{event_id}", f"standings:{event_id}"])
 
+        return jsonify({'html': modal_html})
 
-@public_bp.route('/api/get_event_details', methods=['POST'])
-def get_event_details():
-    event_id = request.form.get('event_id')
-    event = Event.query.get_or_404(event_id)
+    return conditional(etag, updated_at, build, private=current_user.is_authenticated)
 
-    # Render the specific content for the modal
-    modal_html = render_template('partials/event_details_modal_body.html', event=event)
 
-    return jsonify({'html': modal_html})
+@public_bp.route('/api/event/<int:event_id>/standings')
+def get_event_standings(event_id):
+    # Points table / category rankings, served from cache between score saves
+    updated_at = db.session.query(Event.updated_at).filter(Event.id == event_id).scalar()
+    if updated_at is None:
+        return jsonify({'status': 'error', 'message': 'Event not found'}), 404
+    return jsonify(get_standings(event_id, updated_at))
 
 
 # ==========================================
@@ -82,16 +143,65 @@ def get_event_details():
 @public_bp.route('/api/event/toggle_save', methods=['POST'])
 @login_required
 def toggle_save_event():
-    event_id = request.form.get('event_id')
-    event = Event.query.get_or_404(event_id)
+    event_id = request.form.get('event_id', type=int)
+    if db.session.query(Event.id).filter_by(id=event_id).first() is None:
+        abort(404)
 
-    # Check if already saved
-    if event in current_user.saved_events:
-        current_user.saved_events.remove(event)
-        action = 'removed'
-    else:
-        current_user.saved_events.append(event)
-        action = 'saved'
+    # Primary key lookup instead of scanning current_user.saved_events
+    following = is_following(current_user, event_id)
+    set_following(current_user, event_id, not following)
+    action = 'removed' if following else 'saved'
 
     db.session.commit()
-    return jsonify({'status': 'success', 'action': action})
\ No newline at end of file
+    return jsonify({'status': 'success', 'action': action})
+
+
+@public_bp.route('/api/events/following', methods=['POST'])
+@login_required
+def following_events():
+    """Bulk follow state for a listing page: {'event_ids': [..]} -> {'following': [..]}"""
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get('event_ids', request.form.getlist('event_ids'))
+    try:
+        event_ids = [int(i) for i in raw_ids][:current_app.config['EVENTS_MAX_PAGE_SIZE'] * 4]
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'event_ids must be a list of integers'}), 400
+
+    return jsonify({'following': sorted(followed_event_ids(current_user, event_ids))})
+
+# ==========================================
+# 3. LIVE SCORE STREAMS (Server-Sent Events)
+# ==========================================
+# Pushes {'type': 'scores', 'fixture_id', 'version', 'players': {id: entry}}
+# whenever a save commits; clients load the full scores once, then apply the
+# deltas. A 'resync' event means the client fell behind and should reload.
+@public_bp.route('/api/fixture/<int:fixture_id>/stream')
+def fixture_stream(fixture_id):
+    if not db.session.query(Fixture.id).filter_by(id=fixture_id).first():
+        abort(404)
+    return _open_stream(f"fixture:{fixture_id}")
+
+
+@public_bp.route('/api/event/<int:event_id>/stream')
+def event_stream(event_id):
+    if not db.session.query(Event.id).filter_by(id=event_id).first():
+        abort(404)
+    return _open_stream(f"event:{event_id}")
+
+
+def _open_stream(channel):
+    config = current_app.config
+    try:
+        subscription = live.subscribe([channel], max_pending=config['LIVE_MAX_PENDING'],
+                                      max_subscribers=config['LIVE_MAX_SUBSCRIBERS'])
+    except TooManySubscribers:
+        return jsonify({'status': 'error', 'message': 'Too many live viewers, try again shortly'}), 503
+
+    # Not wrapped in stream_with_context: the request (and its DB session) ends here,
+    # the generator only waits on the subscription
+    response = Response(sse_stream(subscription, config['LIVE_HEARTBEAT'], config['LIVE_STREAM_MAX_SECONDS']),
+                        mimetype='text/event-stream')
+    response.call_on_close(subscription.close)  # also when the generator never started
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
@@ -0,0 +1,386 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from flask import current_app, g
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.extensions import db, cache
+from app.models import Event, Team, Player, Fixture, Sport, Venue, registrations
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ==========================================
+# KEYSET CURSORS
+# ==========================================
+def _encode(payload):
+    raw = json.dumps(payload, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(data, dict):
+            raise ValueError(data)
+        return data
+    except ValueError as e:
+        raise InvalidCursor(f"Malformed cursor: {token!r}") from e
+
+
+def encode_cursor(event):
+    """Opaque token pointing just after `event` in (start_date, id) order"""
+    return _encode({'d': event.start_date.isoformat(), 'i': event.id})
+
+
+def decode_cursor(token):
+    data = _decode(token)
+    try:
+        return datetime.fromisoformat(data['d']), int(data['i'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Malformed cursor: {token!r}") from e
+
+
+def _decode_offset(token):
+    """Search results are ranked, not date ordered, so their cursor is a position"""
+    try:
+        return max(int(_decode(token)['o']), 0)
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Malformed cursor: {token!r}") from e
+
+
+# ==========================================
+# EVENT LISTINGS (Cards, Dashboards, Tables)
+# ==========================================
+class EventListingQuery:
+    """
+    Query builder shared by every page that lists events.
+
+    The card / table templates touch event.sport, event.venue and
+    event.manager for every row, so those are joined in the same SELECT
+    instead of being lazy-loaded one row at a time.
+    """
+
+    def __init__(self, query=None):
+        self.query = query if query is not None else Event.query
+        self.ranking = None  # {event_id: position} when a search term is active
+        self._load_rosters = False
+
+    # --- Filters ---
+    def for_sport(self, sport_id):
+        if sport_id and sport_id != 'all':
+            self.query = self.query.filter(Event.sport_id == sport_id)
+        return self
+
+    def at_venue(self, venue_id):
+        if venue_id and venue_id != 'all':
+            self.query = self.query.filter(Event.venue_id == venue_id)
+        return self
+
+    def managed_by(self, manager_id):
+        self.query = self.query.filter(Event.manager_id == manager_id)
+        return self
+
+    def with_status(self, status):
+        self.query = self.query.filter(Event.status == status)
+        return self
+
+    def matching(self, search_query, backend=None):
+        """Restricts to search hits; page() then orders them by relevance"""
+        if not search_query:
+            return self
+        from app.search import get_search_backend
+
+        backend = backend or get_search_backend()
+        limit = current_app.config.get('SEARCH_MAX_RESULTS', 200)
+        hits = backend.search(search_query, limit=limit)
+        self.ranking = {event_id: position for position, (event_id, _score) in enumerate(hits)}
+        self.query = self.query.filter(Event.id.in_(list(self.ranking)))
+        return self
+
+    def starting_within(self, date_filter, now=None):
+        """date_filter is the form value: 'week', 'month' (anything else = no limit)"""
+        days = {'week': 7, 'month': 30}.get(date_filter)
+        if days:
+            today = now or datetime.now()
+            self.query = self.query.filter(Event.start_date <= today + timedelta(days=days))
+        return self
+
+    # --- Extra loads ---
+    def with_rosters(self):
+        """For pages that show team / fixture counts per event"""
+        self._load_rosters = True
+        return self
+
+    def _loaded(self, query):
+        query = query.options(
+            joinedload(Event.sport),
+            joinedload(Event.venue),
+            joinedload(Event.manager),
+        )
+        if self._load_rosters:
+            query = query.options(selectinload(Event.teams), selectinload(Event.fixtures))
+        return query
+
+    # --- Ordering & Execution ---
+    def soonest_first(self):
+        self.query = self.query.order_by(Event.start_date.asc(), Event.id.asc())
+        return self
+
+    def latest_first(self):
+        self.query = self.query.order_by(Event.start_date.desc(), Event.id.desc())
+        return self
+
+    def limit(self, n):
+        self.query = self.query.limit(n)
+        return self
+
+    def as_query(self):
+        """The SQLAlchemy query this builder will run (used by the EXPLAIN checker)"""
+        return self._loaded(self.query)
+
+    def all(self):
+        events = self._loaded(self.query).all()
+        if self.ranking is not None:
+            events.sort(key=lambda e: self.ranking[e.id])
+        return events
+
+    def page(self, cursor=None, size=12):
+        """
+        Keyset (seek) pagination over (start_date, id), soonest first.
+        Returns (events, next_cursor); next_cursor is None on the last page.
+        """
+        if self.ranking is not None:
+            return self._ranked_page(cursor, size)
+
+        if cursor:
+            after_date, after_id = decode_cursor(cursor)
+            self.query = self.query.filter(or_(
+                Event.start_date > after_date,
+                and_(Event.start_date == after_date, Event.id > after_id)
+            ))
+
+        # Fetch one extra row to know whether another page exists
+        rows = self.soonest_first().limit(size + 1).all()
+        events = rows[:size]
+        next_cursor = encode_cursor(events[-1]) if len(rows) > size else None
+        return events, next_cursor
+
+    def _ranked_page(self, cursor, size):
+        offset = _decode_offset(cursor) if cursor else 0
+
+        # Apply the other filters to the (bounded) hit list, then load one slice
+        matching_ids = [row.id for row in self.query.with_entities(Event.id)]
+        matching_ids.sort(key=self.ranking.get)
+        page_ids = matching_ids[offset:offset + size]
+
+        events = self._loaded(Event.query.filter(Event.id.in_(page_ids))).all() if page_ids else []
+        events.sort(key=lambda e: self.ranking[e.id])
+        next_cursor = _encode({'o': offset + size}) if len(matching_ids) > offset + size else None
+        return events, next_cursor
+
+
+# ==========================================
+# EVENT DETAILS (modal)
+# ==========================================
+def load_event_details(event_id, viewer=None):
+    """
+    Everything the event details modal renders, in a fixed number of queries:
+    event + sport + venue (1), teams (1), fixtures with both teams (1),
+    player counts per team (1) and the viewer's follow state (1).
+    """
+    event = (Event.query
+             .options(joinedload(Event.sport), joinedload(Event.venue),
+                      selectinload(Event.teams),
+                      selectinload(Event.fixtures).joinedload(Fixture.team_a_obj),
+                      selectinload(Event.fixtures).joinedload(Fixture.team_b_obj))
+             .filter(Event.id == event_id)
+             .first_or_404())
+
+    player_counts = dict(db.session.query(Player.team_id, func.count(Player.id))
+                         .join(Team, Team.id == Player.team_id)
+                         .filter(Team.event_id == event_id)
+                         .group_by(Player.team_id))
+
+    return {'event': event, 'player_counts': player_counts, 'is_following': is_following(viewer, event_id)}
+
+
+def listing_version():
+    """
+    (last modified, event count) for conditional listing responses, in one query.
+    The count catches deletes, which leave no updated_at behind.
+    """
+    sports_modified = db.session.query(func.max(Sport.updated_at)).scalar_subquery()
+    events_modified, event_count, sports_modified = db.session.query(
+        func.max(Event.updated_at), func.count(Event.id), sports_modified).one()
+    stamps = [stamp for stamp in (events_modified, sports_modified) if stamp is not None]
+    return (max(stamps) if stamps else None), event_count
+
+
+# ==========================================
+# EVENT ROSTER (scoring modal)
+# ==========================================
+def event_roster(event_id):
+    """
+    [{'id', 'name', 'team_name', 'details'}] for every player of the event, in
+    team order. One joined query projecting only those columns, cached until a
+    team or player of the event changes (score saves don't touch it).
+
+    The key carries the teams' version (a player write touches its team, the
+    count catches deletes): tag bumps only reach this worker's memory cache,
+    the version is what every worker reads from the database.
+    """
+    last_modified, team_count = (db.session.query(func.max(Team.updated_at), func.count(Team.id))
+                                 .filter(Team.event_id == event_id).one())
+    version = f"{last_modified.isoformat() if last_modified else '-'}/{team_count}"
+    return cache.memoize(f"roster:{event_id}@{version}", lambda: [
+        {'id': row.id, 'name': row.name, 'team_name': row.team_name, 'details': row.details}
+        for row in db.session.query(Player.id, Player.name, Player.details, Team.name.label('team_name'))
+        .join(Team, Team.id == Player.team_id)
+        .filter(Team.event_id == event_id)
+        .order_by(Team.id, Player.id)
+    ], tags=[f"roster:{event_id}"])
+
+
+# ==========================================
+# FOLLOW STATE
+# ==========================================
+# Answers come straight from the registrations primary key and are remembered
+# on `g` for the rest of the request, so a page asking about the same events
+# twice (cards + modal, toggle + re-render) only hits the DB once.
+def _follow_state():
+    if 'follow_state' not in g:
+        g.follow_state = {}
+    return g.follow_state
+
+
+def followed_event_ids(user, event_ids):
+    """Bulk check: the subset of event_ids the user follows (one indexed query)"""
+    event_ids = {int(i) for i in event_ids}
+    if user is None or not user.is_authenticated or not event_ids:
+        return set()
+
+    known = _follow_state()
+    missing = event_ids - known.keys()
+    if missing:
+        found = {row.event_id for row in db.session.query(registrations.c.event_id).filter(
+            registrations.c.user_id == user.id, registrations.c.event_id.in_(missing))}
+        known.update({event_id: event_id in found for event_id in missing})
+    return {event_id for event_id in event_ids if known[event_id]}
+
+
+def is_following(user, event_id):
+    return int(event_id) in followed_event_ids(user, [event_id])
+
+
+def set_following(user, event_id, follow):
+    """Adds / removes the registrations row directly, without loading user.saved_events"""
+    if follow:
+        db.session.execute(registrations.insert().values(user_id=user.id, event_id=event_id))
+    else:
+        db.session.execute(registrations.delete().where(
+            registrations.c.user_id == user.id, registrations.c.event_id == event_id))
+    _follow_state()[int(event_id)] = follow
+
+
+# ==========================================
+# CACHED AGGREGATES & REFERENCE LISTS
+# ==========================================
+# Served from the app cache; the tags are bumped by the session hooks when a
+# manager creates / edits / deletes an event (see bottom of app/models.py).
+def homepage_stats():
+    return cache.memoize('public:stats', lambda: {
+        'events': Event.query.filter(Event.status != 'completed').count(),
+        'active_now': Event.query.filter_by(status='live').count()
+    }, tags=['events'])
+
+
+def sport_choices():
+    """[{'id', 'name'}] for filter / form dropdowns"""
+    return cache.memoize('ref:sports', lambda: [
+        {'id': s.id, 'name': s.name} for s in Sport.query.order_by(Sport.id).all()
+    ], tags=['sports'])
+
+
+def venue_choices():
+    """[{'id', 'name', 'city'}] for filter / form dropdowns"""
+    return cache.memoize('ref:venues', lambda: [
+        {'id': v.id, 'name': v.name, 'city': v.city} for v in Venue.query.order_by(Venue.id).all()
+    ], tags=['venues'])
+
+
+# ==========================================
+# REGISTERED LISTING QUERIES
+# ==========================================
+# Every hot listing query is registered here so `flask perf explain-listings`
+# can EXPLAIN it and fail if it falls back to a full table scan.
+# Each factory receives a `sample` dict of ids that exist in the dataset.
+LISTING_QUERIES = {}
+
+
+def listing_query(name):
+    def register(factory):
+        LISTING_QUERIES[name] = factory
+        return factory
+    return register
+
+
+@listing_query('index.live_count')
+def _index_live_count(sample):
+    return Event.query.filter_by(status='live')
+
+
+@listing_query('index.first_page')
+def _index_first_page(sample):
+    return EventListingQuery().soonest_first().limit(13).as_query()
+
+
+@listing_query('filter_events.by_sport')
+def _filter_by_sport(sample):
+    return EventListingQuery().for_sport(sample['sport_id']).soonest_first().limit(13).as_query()
+
+
+@listing_query('filter_events.by_venue')
+def _filter_by_venue(sample):
+    return EventListingQuery().at_venue(sample['venue_id']).soonest_first().limit(13).as_query()
+
+
+@listing_query('filter_events.next_page')
+def _filter_next_page(sample):
+    event = Event.query.get(sample['event_id'])
+    listing = EventListingQuery()
+    listing.query = listing.query.filter(or_(
+        Event.start_date > event.start_date,
+        and_(Event.start_date == event.start_date, Event.id > event.id)
+    ))
+    return listing.soonest_first().limit(13).as_query()
+
+
+@listing_query('manager.live_count')
+def _manager_live_count(sample):
+    return Event.query.filter_by(manager_id=sample['manager_id'], status='live')
+
+
+@listing_query('manager.my_events')
+def _manager_my_events(sample):
+    return EventListingQuery().managed_by(sample['manager_id']).latest_first().as_query()
+
+
+@listing_query('manage_event.teams')
+def _event_teams(sample):
+    return Team.query.filter_by(event_id=sample['event_id'])
+
+
+@listing_query('team.players')
+def _team_players(sample):
+    return Player.query.filter_by(team_id=sample['team_id'])
+
+
+@listing_query('event.fixtures')
+def _event_fixtures(sample):
+    return Fixture.query.filter_by(event_id=sample['event_id']).order_by(Fixture.start_time)
@@ -0,0 +1,253 @@
+import csv
+import io
+import os
+from datetime import datetime
+
+from sqlalchemy import insert, update
+
+from app.extensions import db, cache
+from app.models import Event, Player, Team
+
+
+# ==========================================
+# BULK ROSTER IMPORT (CSV / XLSX)
+# ==========================================
+# One row per player, the team columns repeated on each of its players
+# (a row without a player creates just the team):
+#
+#     team, city, coach_name, player, role, jersey
+#     Patna Pirates, Patna, R. Kumar, Sachin Tanwar, Raider, 7
+#
+# The file is read row by row (csv module / openpyxl read-only mode), never
+# as a whole, and written chunk by chunk: the teams the chunk introduces with
+# one executemany INSERT, then its players with another. Everything happens
+# in the caller's transaction, so the caller decides whether a file with bad
+# rows is rejected as a whole or imported without them.
+TEAM_COLUMNS = {'team': 100, 'city': 50, 'coach_name': 100}  # column -> max length
+PLAYER_COLUMN = 'player'
+DETAIL_COLUMNS = {'role', 'position', 'weight_class', 'body_weight', 'weight', 'entry_total',
+                  'batting_style', 'bowling_style', 'jersey', 'jersey_no'}
+NUMERIC_DETAILS = {'body_weight', 'weight', 'entry_total', 'jersey', 'jersey_no'}
+HEADER_ALIASES = {'team_name': 'team', 'coach': 'coach_name', 'name': 'player', 'player_name': 'player',
+                  'category': 'weight_class', 'weight_category': 'weight_class'}
+MAX_NAME_LENGTH = 100
+
+
+class RosterImportError(ValueError):
+    """The file as a whole can't be imported (format, header, size)"""
+
+
+# --- Readers: yield lists of cell values, header first ---
+def _csv_rows(stream):
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise RosterImportError(f"Unreadable CSV: {e}")
+    finally:
+        text.detach()  # leave the upload's stream open for its owner
+
+
+def _xlsx_rows(stream):
+    try:
+        from openpyxl import load_workbook  # optional dependency, only needed for spreadsheets
+    except ImportError:
+        raise RosterImportError("Reading .xlsx files needs openpyxl installed; upload a CSV instead")
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except Exception as e:  # openpyxl raises zipfile / KeyError / InvalidFileException on bad files
+        raise RosterImportError(f"Unreadable spreadsheet: {e}")
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield ['' if value is None else value for value in row]
+    finally:
+        workbook.close()
+
+
+READERS = {'.csv': _csv_rows, '.xlsx': _xlsx_rows}
+
+
+def read_rows(stream, filename):
+    reader = READERS.get(os.path.splitext(filename or '')[1].lower())
+    if reader is None:
+        raise RosterImportError("Upload a .csv or .xlsx file")
+    return reader(stream)
+
+
+def roster_template(schema):
+    """CSV text with the header and one example row for a sport"""
+    if schema.get('categories'):
+        example = {'team': 'Raipur Lifting Club', 'city': 'Raipur', 'coach_name': 'A. Verma',
+                   'player': 'Ravi Sahu', 'weight_class': schema['categories'][0], 'body_weight': 72.5}
+    else:
+        example = {'team': 'Raipur Titans', 'city': 'Raipur', 'coach_name': 'A. Verma', 'player': 'Ravi Sahu'}
+        if schema.get('roles'):
+            example['role'] = schema['roles'][0]
+        example['jersey'] = 7
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(example))
+    writer.writeheader()
+    writer.writerow(example)
+    return out.getvalue()
+
+
+# --- Validation ---
+def _cell(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # spreadsheets hand back 7.0 for a jersey number
+    return str(value).strip()
+
+
+def _header(cells, schema):
+    columns = []
+    for cell in cells:
+        name = _cell(cell).lower().replace(' ', '_')
+        columns.append(HEADER_ALIASES.get(name, name))
+    allowed = set(TEAM_COLUMNS) | {PLAYER_COLUMN} | DETAIL_COLUMNS | set(schema.get('player_fields') or ())
+    unknown = [c for c in columns if c and c not in allowed]
+    if 'team' not in columns:
+        raise RosterImportError("The first row must be a header with at least a 'team' column")
+    if unknown:
+        raise RosterImportError(f"Unknown columns: {', '.join(unknown)}")
+    if len(set(c for c in columns if c)) != len([c for c in columns if c]):
+        raise RosterImportError("Duplicate column in the header")
+    return columns
+
+
+def _choice(value, options, label):
+    """Case-insensitive match against the sport's list; returns the canonical spelling"""
+    if not options:
+        raise ValueError(f"this sport has no {label}s")
+    for option in options:
+        if option.lower() == value.lower():
+            return option
+    raise ValueError(f"unknown {label} '{value}' (expected one of: {', '.join(options)})")
+
+
+def _details(record, schema):
+    details, errors = {}, []
+    for key, value in record.items():
+        if key in TEAM_COLUMNS or key == PLAYER_COLUMN or value == '':
+            continue
+        try:
+            if key in ('role', 'position'):
+                value = _choice(value, schema.get('roles') or [], 'role')
+            elif key == 'weight_class':
+                value = _choice(value, schema.get('categories') or [], 'weight category')
+            elif key in NUMERIC_DETAILS:
+                number = float(value)
+                value = int(number) if number.is_integer() else number
+        except ValueError as e:
+            message = str(e)
+            errors.append(f"{key}: {message if 'could not convert' not in message else 'not a number'}")
+            continue
+        details[key] = value
+    return details, errors
+
+
+def _check_lengths(record):
+    errors = [f"{column}: longer than {limit} characters"
+              for column, limit in TEAM_COLUMNS.items() if len(record.get(column, '')) > limit]
+    if len(record.get(PLAYER_COLUMN, '')) > MAX_NAME_LENGTH:
+        errors.append(f"{PLAYER_COLUMN}: longer than {MAX_NAME_LENGTH} characters")
+    return errors
+
+
+# --- Writing ---
+class _Batch:
+    """Rows of the current chunk waiting to be written"""
+
+    def __init__(self):
+        self.teams = {}  # key -> team row, for teams not in the database yet
+        self.players = []  # (team key, player row)
+
+
+def _write(event_id, batch, team_ids, touched):
+    if batch.teams:
+        db.session.execute(insert(Team), list(batch.teams.values()))
+        names = [row['name'] for row in batch.teams.values()]
+        for team_id, name in db.session.query(Team.id, Team.name).filter(Team.event_id == event_id,
+                                                                          Team.name.in_(names)):
+            team_ids[name.lower()] = team_id
+    if batch.players:
+        db.session.execute(insert(Player), [dict(row, team_id=team_ids[key]) for key, row in batch.players])
+        touched.update(team_ids[key] for key, _ in batch.players)
+
+
+def import_roster(event, rows, chunk_size=1000, max_rows=None, max_errors=200):
+    """
+    Imports teams and players from `rows` (a reader above) into the event.
+    Valid rows are written in the caller's transaction; the caller commits
+    or rolls back. Returns the report:
+        {'rows': n, 'teams_created': n, 'players_created': n,
+         'error_count': n, 'errors': [{'row': 3, 'errors': ['role: ...']}, ...]}
+    Row numbers count from the top of the file, the header included.
+    """
+    schema = event.sport.config_schema or {}
+    rows = enumerate(rows, start=1)
+    columns = None
+    for _, cells in rows:  # the header is the first non-empty row
+        if any(_cell(c) for c in cells):
+            columns = _header(cells, schema)
+            break
+    if columns is None:
+        raise RosterImportError("The file is empty")
+
+    team_ids = {name.lower(): team_id for team_id, name in
+                db.session.query(Team.id, Team.name).filter(Team.event_id == event.id)}
+    seen_players = {(team.lower(), player.lower()) for team, player in
+                    db.session.query(Team.name, Player.name).join(Player, Player.team_id == Team.id)
+                    .filter(Team.event_id == event.id)}
+    report = {'rows': 0, 'teams_created': 0, 'players_created': 0, 'error_count': 0, 'errors': []}
+    touched, batch = set(), _Batch()
+
+    for line, cells in rows:
+        values = [_cell(c) for c in cells]
+        if not any(values):
+            continue
+        report['rows'] += 1
+        if max_rows and report['rows'] > max_rows:
+            raise RosterImportError(f"Too many rows (the limit is {max_rows})")
+
+        record = dict(zip(columns, values))
+        record.pop('', None)
+        errors = _check_lengths(record)
+        team_name, player_name = record.get('team', ''), record.get(PLAYER_COLUMN, '')
+        details, detail_errors = _details(record, schema)
+        errors.extend(detail_errors)
+        if not team_name:
+            errors.append("team: required")
+        elif player_name and (team_name.lower(), player_name.lower()) in seen_players:
+            errors.append(f"player: '{player_name}' is already in {team_name}")
+
+        if errors:
+            report['error_count'] += 1
+            if len(report['errors']) < max_errors:
+                report['errors'].append({'row': line, 'errors': errors})
+            continue
+
+        key = team_name.lower()
+        if key not in team_ids and key not in batch.teams:
+            batch.teams[key] = {'event_id': event.id, 'name': team_name, 'city': record.get('city') or None,
+                                'coach_name': record.get('coach_name') or None}
+            report['teams_created'] += 1
+        if player_name:
+            batch.players.append((key, {'name': player_name, 'details': details}))
+            seen_players.add((key, player_name.lower()))
+            report['players_created'] += 1
+
+        if len(batch.teams) + len(batch.players) >= chunk_size:
+            _write(event.id, batch, team_ids, touched)
+            batch = _Batch()
+
+    _write(event.id, batch, team_ids, touched)
+    if report['teams_created'] or report['players_created']:
+        # Core inserts: the flush hooks (updated_at, cache tags) don't see these rows
+        now = datetime.utcnow()
+        if touched:
+            db.session.execute(update(Team).where(Team.id.in_(touched)).values(updated_at=now)
+                               .execution_options(synchronize_session=False))
+        db.session.execute(update(Event).where(Event.id == event.id).values(updated_at=now)
+                           .execution_options(synchronize_session=False))
+        cache.invalidate_after_commit(db.session, f"event:{event.id}", f"roster:{event.id}")
+    return report
@@ -0,0 +1,408 @@
+import heapq
+from bisect import bisect_right
+from datetime import datetime, time as dtime, timedelta
+
+from sqlalchemy import delete, insert
+
+from app.extensions import db, cache
+from app.models import DEFAULT_MATCH_MINUTES, MAX_MATCH_MINUTES, Fixture, Team, Venue
+
+# ==========================================
+# AUTOMATIC FIXTURE SCHEDULING
+# ==========================================
+# 1. Pairings: who plays whom, round by round (round-robin circle method,
+#    seeded knockout brackets with byes, groups feeding a knockout).
+# 2. Times: a greedy list scheduler books each match at the earliest start
+#    where a venue is free, both teams have rested and the match fits inside
+#    the daily window. Venues sit on a heap keyed by their next free minute,
+#    so each booking is O(log venues) plus the skips over existing bookings.
+# 3. Persistence: one executemany INSERT in the caller's transaction.
+#
+# Times are handled as integer minutes from midnight of the first day.
+FORMATS = ('round_robin', 'groups_knockout', 'single_elimination')
+KNOCKOUT_NAMES = {1: 'Final', 2: 'Semi-final', 4: 'Quarter-final'}
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+def match_minutes(rules_config, default=DEFAULT_MATCH_MINUTES):
+    """
+    Match length for an event, from Event.rules_config['standard'] (the
+    sport-specific inputs of the create event form), else `default`.
+    """
+    standard = (rules_config or {}).get('standard') or {}
+
+    def number(key):
+        try:
+            return float(standard.get(key) or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    if number('match_minutes'):
+        minutes = number('match_minutes')
+    elif number('Match Duration (mins)'):
+        minutes = number('Match Duration (mins)')
+    elif number('Half Duration (mins)'):
+        minutes = number('Half Duration (mins)') * 2 + 15  # plus half time
+    elif number('Overs Per Innings'):
+        minutes = number('Overs Per Innings') * 2 * 4 + 20  # ~4 min an over, innings break
+    else:
+        minutes = default
+    return max(1, min(int(minutes), MAX_MATCH_MINUTES))
+
+
+# --- 1. Pairings ---
+def round_robin_rounds(team_ids):
+    """Circle method: every pair meets once, each team plays at most once per round"""
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)  # bye
+    n = len(teams)
+    rounds = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            a, b = teams[i], teams[n - 1 - i]
+            if a is not None and b is not None:
+                pairs.append((a, b) if r % 2 == 0 else (b, a))  # alternate home / away
+        rounds.append(pairs)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def bracket_order(size):
+    """Seed positions so that 1 and 2 can only meet in the final: 8 -> [1, 8, 4, 5, 2, 7, 3, 6]"""
+    order = [1]
+    while len(order) < size:
+        order = [seed for s in order for seed in (s, 2 * len(order) + 1 - s)]
+    return order
+
+
+def _round_name(matches_in_round, index):
+    name = KNOCKOUT_NAMES.get(matches_in_round, f"Round of {matches_in_round * 2}")
+    return name if matches_in_round == 1 else f"{name} {index}"
+
+
+def _separate(slots, clash):
+    """Swaps lower seeds between first-round pairs until no pair clashes (e.g. same group)"""
+    for i in range(0, len(slots), 2):
+        if 'bye' in (slots[i], slots[i + 1]) or not clash(slots[i], slots[i + 1]):
+            continue
+        for j in range(1, len(slots), 2):
+            other = slots[j - 1]
+            if j != i + 1 and 'bye' not in (other, slots[j]) and \
+                    not clash(slots[i], slots[j]) and not clash(other, slots[i + 1]):
+                slots[i + 1], slots[j] = slots[j], slots[i + 1]
+                break
+
+
+def knockout_rounds(entries, clash=None):
+    """
+    entries: [(team_id or None, label or None)] best seed first; None stands
+    for a team decided later (a group qualifier, a previous winner).
+    Byes go to the top seeds; clash(a, b) -> True keeps two entries apart in
+    the first round. Returns rounds of match dicts.
+    """
+    size = 1
+    while size < len(entries):
+        size *= 2
+    slots = [entries[seed - 1] if seed <= len(entries) else 'bye' for seed in bracket_order(size)]
+    if clash is not None:
+        _separate(slots, clash)
+
+    rounds = []
+    while len(slots) > 1:
+        matches, winners = [], []
+        for i in range(0, len(slots), 2):
+            a, b = slots[i], slots[i + 1]
+            if a == 'bye' or b == 'bye':
+                winners.append(b if a == 'bye' else a)  # walks over (or 'bye' if both are)
+                continue
+            name = _round_name(len(slots) // 2, i // 2 + 1)
+            if a[0] is None and b[0] is None:  # placeholders: say where the teams come from
+                name += f" ({a[1]} v {b[1]})"
+            elif a[0] is None or b[0] is None:
+                name += f" (v {a[1] or b[1]})"
+            matches.append({'team_a_id': a[0], 'team_b_id': b[0], 'title': name})
+            winners.append((None, f"W {name.split(' (')[0]}"))
+        if matches:
+            rounds.append(matches)
+        slots = winners
+    return rounds
+
+
+def split_groups(team_ids, group_size):
+    """Snake seeding: the strongest teams end up in different groups"""
+    n_groups = max(1, -(-len(team_ids) // group_size))
+    groups = [[] for _ in range(n_groups)]
+    for i, team_id in enumerate(team_ids):
+        row, col = divmod(i, n_groups)
+        groups[col if row % 2 == 0 else n_groups - 1 - col].append(team_id)
+    return groups
+
+
+def _group_letter(index):
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+
+def plan_rounds(team_ids, fmt, group_size=4, advance=2):
+    """[(stage_barrier, [match, ...]), ...]; a barrier round waits for everything before it"""
+    if fmt not in FORMATS:
+        raise ScheduleError(f"Unknown format '{fmt}'")
+    if len(team_ids) < 2:
+        raise ScheduleError("At least two teams are needed")
+
+    if fmt == 'round_robin':
+        return [(False, [{'team_a_id': a, 'team_b_id': b, 'title': f"Round {r}"} for a, b in pairs])
+                for r, pairs in enumerate(round_robin_rounds(team_ids), start=1)]
+
+    if fmt == 'single_elimination':
+        return [(True, matches) for matches in knockout_rounds([(t, None) for t in team_ids])]
+
+    groups = split_groups(team_ids, group_size)
+    if any(len(group) < 2 for group in groups) or advance < 1 or any(len(g) < advance for g in groups):
+        raise ScheduleError("Groups need at least two teams and as many as advance from them")
+    letters = [_group_letter(i) for i in range(len(groups))]
+
+    # Group rounds are interleaved so every group progresses at the same pace
+    group_rounds = [round_robin_rounds(group) for group in groups]
+    rounds = []
+    for r in range(max(len(gr) for gr in group_rounds)):
+        matches = [{'team_a_id': a, 'team_b_id': b, 'title': f"Group {letter} · Round {r + 1}"}
+                   for letter, gr in zip(letters, group_rounds) if r < len(gr) for a, b in gr[r]]
+        rounds.append((False, matches))
+
+    qualifiers = [(None, f"{letter}{place}") for place in range(1, advance + 1) for letter in letters]
+    if len(qualifiers) > 1:
+        def same_group(a, b):  # no group rematch in the first knockout round
+            return a[1].rstrip('0123456789') == b[1].rstrip('0123456789')
+        rounds += [(True, matches) for matches in knockout_rounds(qualifiers, clash=same_group)]
+    return rounds
+
+
+# --- 2. Time slots ---
+class DailyWindow:
+    """Matches must start and end inside [day_start, day_end) every day"""
+
+    def __init__(self, day_start, day_end, duration):
+        self.start = day_start.hour * 60 + day_start.minute
+        self.end = day_end.hour * 60 + day_end.minute
+        self.duration = duration
+        if self.end - self.start < duration:
+            raise ScheduleError("The daily window is shorter than one match")
+
+    def fit(self, t):
+        """Earliest start >= t where the whole match is inside a window"""
+        day, minute = divmod(t, 1440)
+        if minute < self.start:
+            return day * 1440 + self.start
+        if minute + self.duration > self.end:
+            return (day + 1) * 1440 + self.start
+        return t
+
+
+class VenueCalendar:
+    """Existing bookings of one venue: merged, sorted (start, end) minutes"""
+
+    def __init__(self, busy=()):
+        merged = []
+        for start, end in sorted(busy):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [s for s, _ in merged]
+        self.ends = [e for _, e in merged]
+
+    def first_free(self, t, window):
+        """Earliest start >= t inside the window that overlaps no booking (O(log n) per skip)"""
+        while True:
+            t = window.fit(t)
+            i = bisect_right(self.starts, t + window.duration - 1) - 1
+            if i < 0 or self.ends[i] <= t:
+                return t
+            t = self.ends[i]
+
+
+# --- 3. Solver ---
+def assign_times(rounds, calendars, window, start, rest, changeover=0, horizon_days=366):
+    """
+    Books every match of `rounds` (from plan_rounds) on a venue and a start
+    minute. calendars: {venue_id: VenueCalendar}. Returns the matches with
+    'venue_id' and 'start' (minutes) filled in, in booking order.
+    """
+    if not calendars:
+        raise ScheduleError("No venue to schedule on")
+    horizon = start + horizon_days * 1440
+    heap = [(start, venue_id) for venue_id in sorted(calendars)]
+    heapq.heapify(heap)
+    team_free = {}
+    floor = last_end = start
+    booked = []
+
+    for barrier, matches in rounds:
+        if barrier and booked:
+            floor = max(floor, last_end + rest)  # next knockout round waits for the whole stage
+        for match in matches:
+            earliest = max(floor, team_free.get(match['team_a_id'], start), team_free.get(match['team_b_id'], start))
+            while True:
+                venue_free, venue_id = heapq.heappop(heap)
+                candidate = calendars[venue_id].first_free(max(venue_free, earliest), window)
+                if not heap or candidate <= max(heap[0][0], earliest):
+                    break
+                heapq.heappush(heap, (candidate, venue_id))  # a booking is in the way, try another venue
+            if candidate > horizon:
+                raise ScheduleError(f"Could not fit the schedule within {horizon_days} days")
+
+            end = candidate + window.duration
+            heapq.heappush(heap, (end + changeover, venue_id))
+            for team_id in (match['team_a_id'], match['team_b_id']):
+                if team_id is not None:
+                    team_free[team_id] = end + rest
+            last_end = max(last_end, end)
+            booked.append(dict(match, venue_id=venue_id, start=candidate))
+    return booked
+
+
+# --- 4. Persistence ---
+def parse_options(data):
+    """Request JSON -> schedule_event() keyword arguments (ScheduleError on bad input)"""
+    try:
+        options = {
+            'start': datetime.strptime(data['start'], '%Y-%m-%dT%H:%M') if data.get('start') else None,
+            'venue_ids': [int(v) for v in data.get('venue_ids') or []],
+            'day_start': dtime.fromisoformat(data.get('day_start') or '09:00'),
+            'day_end': dtime.fromisoformat(data.get('day_end') or '21:00'),
+            'minutes': int(data['match_minutes']) if data.get('match_minutes') else None,
+            'rest_minutes': int(data.get('rest_minutes', 120)),
+            'changeover_minutes': int(data.get('changeover_minutes', 15)),
+            'group_size': int(data.get('group_size', 4)),
+            'advance': int(data.get('advance', 2)),
+            'replace': bool(data.get('replace')),
+            'dry_run': bool(data.get('dry_run')),
+        }
+    except (TypeError, ValueError) as e:
+        raise ScheduleError(f"Invalid scheduling options: {e}")
+    if options['minutes'] is not None and options['minutes'] <= 0 or options['rest_minutes'] < 0 \
+            or options['changeover_minutes'] < 0 or options['group_size'] < 2:
+        raise ScheduleError("Durations must be positive and groups need at least two teams")
+    return options
+
+
+
+def _bookings(venue_ids, since, until=None):
+    """Fixtures at the venues (any event) still running at or after `since`: (venue_id, start, end) rows"""
+    query = db.session.query(Fixture.venue_id, Fixture.start_time, Fixture.end_time).filter(
+        Fixture.venue_id.in_(venue_ids),
+        Fixture.start_time > since - timedelta(minutes=MAX_MATCH_MINUTES),
+        Fixture.end_time > since)
+    if until is not None:
+        query = query.filter(Fixture.start_time < until)
+    return query.order_by(Fixture.venue_id, Fixture.start_time).all()
+
+
+def _busy_intervals(venue_ids, base):
+    """{venue_id: [(start, end) minutes from base]} for the scheduler"""
+    busy = {venue_id: [] for venue_id in venue_ids}
+    for venue_id, start_time, end_time in _bookings(venue_ids, base):
+        busy[venue_id].append((_minutes(start_time, base), _minutes(end_time, base)))
+    return busy
+
+
+def _minutes(moment, base):
+    return int((moment - base).total_seconds() // 60)
+
+
+def schedule_event(event, fmt, start=None, venue_ids=None, day_start=dtime(9), day_end=dtime(21),
+                   minutes=None, rest_minutes=120, changeover_minutes=15, group_size=4, advance=2,
+                   replace=False, dry_run=False):
+    """
+    Generates the event's fixtures and inserts them (caller commits).
+    Returns the fixture rows. replace=True first deletes this event's
+    fixtures that have no scores yet.
+    """
+    team_ids = [team_id for (team_id,) in
+                db.session.query(Team.id).filter(Team.event_id == event.id).order_by(Team.id)]
+    venue_ids = sorted({int(v) for v in (venue_ids or [])} or ({event.venue_id} if event.venue_id else set()))
+    if not venue_ids:
+        raise ScheduleError("Pick at least one venue (the event has none)")
+    if db.session.query(Venue.id).filter(Venue.id.in_(venue_ids)).count() != len(venue_ids):
+        raise ScheduleError("Unknown venue")
+
+    start = start or event.start_date
+    base = datetime.combine(start.date(), dtime())
+    duration = min(minutes, MAX_MATCH_MINUTES) if minutes else match_minutes(event.rules_config)
+    window = DailyWindow(day_start, day_end, duration)
+
+    if replace and not dry_run:
+        db.session.execute(delete(Fixture).where(Fixture.event_id == event.id, Fixture.score_data.is_(None))
+                           .execution_options(synchronize_session=False))
+
+    if not dry_run:
+        for venue_id in venue_ids:
+            lock_venue(venue_id)  # no add_fixture can slip into a slot we are about to fill
+    busy = _busy_intervals(venue_ids, base)
+    rounds = plan_rounds(team_ids, fmt, group_size=group_size, advance=advance)
+    booked = assign_times(rounds, {v: VenueCalendar(busy[v]) for v in venue_ids}, window,
+                          start=_minutes(start, base),
+                          rest=rest_minutes, changeover=changeover_minutes)
+
+    rows = [{'event_id': event.id, 'venue_id': m['venue_id'], 'team_a_id': m['team_a_id'],
+             'team_b_id': m['team_b_id'], 'title': m['title'][:100],
+             'start_time': base + timedelta(minutes=m['start']),
+             'end_time': base + timedelta(minutes=m['start'] + duration)} for m in booked]
+    if rows and not dry_run:
+        db.session.execute(insert(Fixture), rows)
+        event.updated_at = datetime.utcnow()  # Core insert: the flush hooks don't see these rows
+        cache.invalidate_after_commit(db.session, f"event:{event.id}")
+    return rows
+
+
+# ==========================================
+# VENUE OCCUPANCY
+# ==========================================
+# Fixtures carry their end_time, and no booking is longer than
+# MAX_MATCH_MINUTES, so "does anything overlap [start, end) at venue V" only
+# has to look at fixtures starting in (start - MAX_MATCH_MINUTES, end): a
+# range seek on ix_fixtures_venue_time, O(log n) whatever the venue's history.
+def lock_venue(venue_id):
+    """Serializes bookings of one venue until commit (SELECT ... FOR UPDATE; a no-op on SQLite)"""
+    db.session.query(Venue.id).filter(Venue.id == venue_id).with_for_update().first()
+
+
+def find_conflict(venue_id, start, end, exclude_id=None):
+    """The first fixture overlapping [start, end) at the venue, or None"""
+    query = db.session.query(Fixture).filter(
+        Fixture.venue_id == venue_id,
+        Fixture.start_time > start - timedelta(minutes=MAX_MATCH_MINUTES),
+        Fixture.start_time < end,
+        Fixture.end_time > start)
+    if exclude_id is not None:
+        query = query.filter(Fixture.id != exclude_id)
+    return query.order_by(Fixture.start_time).first()
+
+
+def free_slots(venue_id, day, minutes, day_start=dtime(9), day_end=dtime(21)):
+    """
+    Gaps of at least `minutes` at the venue within the day's window:
+    [(start, end), ...] as datetimes, plus the bookings they were cut from.
+    """
+    window_start, window_end = datetime.combine(day, day_start), datetime.combine(day, day_end)
+    bookings = _bookings([venue_id], window_start, until=window_end)
+
+    gaps, cursor = [], window_start
+    for _, start_time, end_time in bookings:
+        if start_time - cursor >= timedelta(minutes=minutes):
+            gaps.append((cursor, start_time))
+        cursor = max(cursor, end_time)
+    if window_end - cursor >= timedelta(minutes=minutes):
+        gaps.append((cursor, window_end))
+    return gaps, [(start_time, end_time) for _, start_time, end_time in bookings]
@@ -0,0 +1,255 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from flask import current_app, has_app_context
+from sqlalchemy import event as sa_event
+from sqlalchemy.dialects.mysql import match
+
+from app.extensions import db
+from app.models import Event
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Title hits count more than description hits
+FIELD_WEIGHTS = {'title': 3.0, 'description': 1.0}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ==========================================
+# 1. BACKENDS
+# ==========================================
+class SearchBackend:
+    """
+    Turns the `search` form value into a ranked list of event ids.
+    search() returns [(event_id, score), ...] best match first.
+    """
+    name = 'base'
+
+    def search(self, text, limit=200):
+        raise NotImplementedError
+
+    def index_events(self, events):
+        """Called after commit with (id, title, description) rows that were added or changed"""
+
+    def remove_events(self, event_ids):
+        """Called after commit with ids of deleted events"""
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """Uses the FULLTEXT index on events(title, description)"""
+    name = 'mysql'
+
+    def search(self, text, limit=200):
+        terms = tokenize(text)
+        if not terms:
+            return []
+
+        # Boolean mode so "crick" still finds "Cricket"; relevance is InnoDB's score
+        boolean_query = ' '.join(f"{t}*" for t in terms)
+        score = match(Event.title, Event.description, against=boolean_query).in_boolean_mode()
+
+        rows = (db.session.query(Event.id, score.label('score'))
+                .filter(score > 0)
+                .order_by(score.desc(), Event.id.asc())
+                .limit(limit)
+                .all())
+        return [(row.id, float(row.score)) for row in rows]
+
+
+class InMemorySearchBackend(SearchBackend):
+    """
+    Inverted index kept in process memory (fallback for SQLite / dev setups).
+
+    Exact term hits rank highest, then prefix hits ("crick" -> "cricket"),
+    then trigram look-alikes for typos ("crikcet" -> "cricket").
+    Built lazily from the events table and updated incrementally on commit.
+    """
+    name = 'memory'
+
+    PREFIX_WEIGHT = 0.7
+    TRIGRAM_WEIGHT = 0.5
+    TRIGRAM_MIN_SIMILARITY = 0.3  # same default as pg_trgm
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self.postings = defaultdict(dict)   # term -> {event_id: weight}
+        self.doc_terms = {}                 # event_id -> set(terms)
+        self.vocabulary = []                # sorted terms, for prefix lookups
+        self.trigram_index = defaultdict(set)  # trigram -> terms
+
+    # --- Index maintenance ---
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            rows = db.session.query(Event.id, Event.title, Event.description).yield_per(1000)
+            self._add_rows(rows)
+            self._built = True
+
+    def _add_rows(self, rows):
+        for event_id, title, description in rows:
+            self._remove(event_id)
+            weights = defaultdict(float)
+            for token in tokenize(title):
+                weights[token] += FIELD_WEIGHTS['title']
+            for token in tokenize(description):
+                weights[token] += FIELD_WEIGHTS['description']
+
+            for term, weight in weights.items():
+                if term not in self.postings:
+                    self.vocabulary.insert(bisect_left(self.vocabulary, term), term)
+                    for gram in trigrams(term):
+                        self.trigram_index[gram].add(term)
+                self.postings[term][event_id] = weight
+            self.doc_terms[event_id] = set(weights)
+
+    def _remove(self, event_id):
+        for term in self.doc_terms.pop(event_id, ()):
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(event_id, None)
+            if not docs:
+                del self.postings[term]
+                self.vocabulary.pop(bisect_left(self.vocabulary, term))
+                for gram in trigrams(term):
+                    self.trigram_index[gram].discard(term)
+
+    def index_events(self, rows):
+        with self._lock:
+            if self._built:
+                self._add_rows(rows)
+
+    def remove_events(self, event_ids):
+        with self._lock:
+            if self._built:
+                for event_id in event_ids:
+                    self._remove(event_id)
+
+    # --- Querying ---
+    def _expand(self, term):
+        """Returns {indexed_term: match_quality} for one query term"""
+        matches = {}
+        if term in self.postings:
+            matches[term] = 1.0
+
+        i = bisect_left(self.vocabulary, term)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+            matches.setdefault(self.vocabulary[i], self.PREFIX_WEIGHT)
+            i += 1
+
+        if not matches and len(term) >= 3:
+            grams = trigrams(term)
+            candidates = defaultdict(int)
+            for gram in grams:
+                for other in self.trigram_index.get(gram, ()):
+                    candidates[other] += 1
+            for other, shared in candidates.items():
+                similarity = shared / len(grams | trigrams(other))
+                if similarity >= self.TRIGRAM_MIN_SIMILARITY:
+                    matches[other] = self.TRIGRAM_WEIGHT * similarity
+        return matches
+
+    def search(self, text, limit=200):
+        terms = tokenize(text)
+        if not terms:
+            return []
+        self._ensure_built()
+
+        with self._lock:
+            total_docs = max(len(self.doc_terms), 1)
+            scores = None
+            for term in terms:
+                term_scores = defaultdict(float)
+                for indexed, quality in self._expand(term).items():
+                    for event_id, weight in self.postings[indexed].items():
+                        term_scores[event_id] = max(term_scores[event_id], quality * weight)
+
+                # Rarer query terms weigh more (idf over everything the term matched)
+                if term_scores:
+                    idf = math.log(1 + total_docs / len(term_scores))
+                    term_scores = {eid: score * idf for eid, score in term_scores.items()}
+
+                # Every query term has to match something (AND semantics, like ILIKE on the phrase)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {eid: s + term_scores[eid] for eid, s in scores.items() if eid in term_scores}
+                if not scores:
+                    return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+
+BACKENDS = {
+    'mysql': MySQLFullTextBackend,
+    'memory': InMemorySearchBackend,
+}
+
+
+# ==========================================
+# 2. APP WIRING
+# ==========================================
+def get_search_backend():
+    return current_app.extensions['search']
+
+
+def init_search(app):
+    name = app.config.get('SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        name = 'mysql' if app.config['SQLALCHEMY_DATABASE_URI'].startswith('mysql') else 'memory'
+    app.extensions['search'] = BACKENDS[name]()
+    _register_session_hooks()
+    return app.extensions['search']
+
+
+# Keep in-process indexes in step with committed Event writes.
+# Hooks are registered once per process and look up the current app's backend.
+def _register_session_hooks():
+    session_cls = db.session.session_factory.class_
+    if sa_event.contains(session_cls, 'after_flush', _collect):
+        return
+    sa_event.listen(session_cls, 'after_flush', _collect)
+    sa_event.listen(session_cls, 'after_commit', _apply)
+    sa_event.listen(session_cls, 'after_rollback', _discard)
+
+
+def _collect(session, flush_context):
+    pending = session.info.setdefault('search_pending', {'upsert': {}, 'delete': set()})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Event):
+            pending['upsert'][obj.id] = (obj.id, obj.title, obj.description)
+            pending['delete'].discard(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Event):
+            pending['upsert'].pop(obj.id, None)
+            pending['delete'].add(obj.id)
+
+
+def _apply(session):
+    pending = session.info.pop('search_pending', None)
+    if not pending or not has_app_context():
+        return
+    backend = current_app.extensions.get('search')
+    if backend is not None:
+        backend.remove_events(pending['delete'])
+        backend.index_events(pending['upsert'].values())
+
+
+def _discard(session):
+    session.info.pop('search_pending', None)
@@ -0,0 +1,297 @@
+import math
+import re
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.extensions import db, cache
+from app.jobs import job
+from app.models import Event, Fixture, FixtureAggregate, Player, ScoreEntry, Standing, Team
+
+
+# ==========================================
+# 1. RULES
+# ==========================================
+# Keyed by Sport.config_schema['scoring_unit']; a sport can override any value
+# with config_schema['standings'] = {"win": 3, "draw": 1, ...}.
+TEAM_RULES = {
+    'runs':   {'win': 2, 'draw': 1, 'loss': 0, 'tiebreak': 'net_run_rate'},      # Cricket
+    'goals':  {'win': 3, 'draw': 1, 'loss': 0, 'tiebreak': 'goal_difference'},   # Football
+    'points': {'win': 5, 'draw': 3, 'loss': 0, 'tiebreak': 'score_difference'},  # Kabaddi (PKL style)
+}
+DEFAULT_TEAM_RULES = {'win': 2, 'draw': 1, 'loss': 0, 'tiebreak': 'score_difference'}
+
+# Sinclair coefficients (IWF 2021-2024 cycle): coef = 10 ** (A * log10(bw / b) ** 2) for bw < b
+SINCLAIR = {
+    'men': (0.722762521, 193.609),
+    'women': (0.787004341, 153.757),
+}
+WEIGHT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*kg', re.IGNORECASE)
+# Stored attempt keys (see METRIC_ALIASES in app/users/services.py); a session counts as
+# lifted once all six are recorded
+SNATCH_METRICS, CJ_METRICS = ('s1', 's2', 's3'), ('c1', 'c2', 'c3')
+
+
+def team_rules(sport):
+    schema = sport.config_schema or {}
+    rules = dict(TEAM_RULES.get(schema.get('scoring_unit'), DEFAULT_TEAM_RULES))
+    rules.update(schema.get('standings', {}))
+    return rules
+
+
+def is_weightlifting(sport):
+    """Sinclair totals only make sense for sports scoring snatch and clean & jerk attempts"""
+    fields = (sport.config_schema or {}).get('scoring_fields') or ()
+    return any(f.startswith('snatch') for f in fields) and any(f.startswith('cj') for f in fields)
+
+
+def sinclair_coefficient(category, bodyweight=None):
+    """Uses the lifter's bodyweight if known, else the weight class limit ("Men's 73kg")"""
+    if bodyweight is None:
+        match = WEIGHT_RE.search(category or '')
+        if not match:
+            return 1.0
+        bodyweight = float(match.group(1))
+    a, b = SINCLAIR['women' if (category or '').lower().startswith('women') else 'men']
+    if bodyweight <= 0 or bodyweight >= b:
+        return 1.0
+    return 10 ** (a * math.log10(bodyweight / b) ** 2)
+
+
+def _bodyweight(details):
+    """The lifter's body_weight as a number, None if missing or unparsable (the form posts strings)"""
+    try:
+        value = float(details.get('body_weight'))
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _team_result(a_score, b_score, overs, rules):
+    """Standing deltas a single fixture contributes to each side (None if not played yet)"""
+    if a_score is None or b_score is None:
+        return None
+
+    def side(scored, conceded):
+        won, drawn = scored > conceded, scored == conceded
+        return {
+            'played': 1, 'won': int(won), 'drawn': int(drawn), 'lost': int(not won and not drawn),
+            'points': rules['win'] if won else rules['draw'] if drawn else rules['loss'],
+            'score_for': scored, 'score_against': conceded,
+            'overs_for': overs, 'overs_against': overs,
+        }
+    return side(a_score, b_score), side(b_score, a_score)
+
+
+def _fixture_overs(event):
+    """Overs per innings for net run rate (rules_config.standard.overs), 0 if not a cricket event"""
+    return float(((event.rules_config or {}).get('standard') or {}).get('overs') or 0)
+
+
+# ==========================================
+# 2. INCREMENTAL UPDATES
+# ==========================================
+# uq_standings_entry can't stop duplicate rows (team_id or player_id is NULL
+# on every row, and NULLs never collide), so standings rows are only created
+# while holding the event row lock (SELECT ... FOR UPDATE, a no-op on SQLite).
+def _lock_event(event_id):
+    db.session.query(Event.id).filter(Event.id == event_id).with_for_update().one()
+
+
+def _first_result(event_id):
+    """True if the event has no standings yet; checked again under the lock, so only one save builds them"""
+    if db.session.query(Standing.id).filter_by(event_id=event_id).first():
+        return False
+    _lock_event(event_id)
+    # Locking read: sees rows committed by a save that held the lock before us
+    return not db.session.query(Standing.id).filter_by(event_id=event_id).with_for_update().first()
+
+
+def _bump(event_id, deltas, team_id=None, player_id=None):
+    """Adds deltas to one standings row with a single UPDATE (creates the row on first use)"""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    values = {k: getattr(Standing, k) + v for k, v in deltas.items()}
+    values['updated_at'] = datetime.utcnow()
+    stmt = (update(Standing)
+            .where(Standing.event_id == event_id, Standing.team_id == team_id, Standing.player_id == player_id)
+            .values(**values))
+    if db.session.execute(stmt).rowcount == 0:
+        _lock_event(event_id)
+        if db.session.execute(stmt).rowcount == 0:  # nobody created it while we waited
+            db.session.add(Standing(event_id=event_id, team_id=team_id, player_id=player_id, **deltas))
+
+
+def _apply_team_delta(event_id, team_id, old, new):
+    fields = set(old or {}) | set(new or {})
+    deltas = {f: (new or {}).get(f, 0) - (old or {}).get(f, 0) for f in fields}
+    _bump(event_id, deltas, team_id=team_id)
+
+
+def _refresh_player(event, player_id):
+    """
+    Recomputes one player's row from their recorded scores in the event.
+    Cost depends on that player's sessions (normally 1), not on the event size.
+
+    Weightlifting: best session total (best snatch + best clean & jerk) and
+    its Sinclair total; a session counts as played once all six attempts are
+    in. Other individual sports: the sport's scoring_unit summed over the
+    sessions that recorded it, no Sinclair.
+    """
+    sessions = {}
+    for fixture_id, metric, value in (db.session.query(ScoreEntry.fixture_id, ScoreEntry.metric, ScoreEntry.value)
+                                      .join(Fixture, Fixture.id == ScoreEntry.fixture_id)
+                                      .filter(ScoreEntry.player_id == player_id, Fixture.event_id == event.id)):
+        sessions.setdefault(fixture_id, {})[metric] = value
+
+    player = db.session.get(Player, player_id)
+    details = player.details or {}
+    category = details.get('weight_class')
+    if is_weightlifting(event.sport):
+        played = sum(1 for attempts in sessions.values() if all(m in attempts for m in SNATCH_METRICS + CJ_METRICS))
+        total = max((max(attempts.get(m, 0) for m in SNATCH_METRICS) + max(attempts.get(m, 0) for m in CJ_METRICS)
+                     for attempts in sessions.values()), default=0)
+        sinclair = round(total * sinclair_coefficient(category, _bodyweight(details)), 3)
+    else:
+        unit = (event.sport.config_schema or {}).get('scoring_unit')
+        scored = [attempts[unit] for attempts in sessions.values() if unit in attempts]
+        played, total, sinclair = len(scored), sum(scored), None
+
+    standing = Standing.query.filter_by(event_id=event.id, team_id=None, player_id=player_id).first()
+    if standing is None:
+        _lock_event(event.id)
+        standing = (Standing.query.filter_by(event_id=event.id, team_id=None, player_id=player_id)
+                    .with_for_update().first())
+        if standing is None:
+            standing = Standing(event_id=event.id, player_id=player_id)
+            db.session.add(standing)
+    standing.category = category
+    standing.played = played
+    standing.best_total = total
+    standing.sinclair_total = sinclair
+    standing.updated_at = datetime.utcnow()
+
+
+def update_for_fixture(fixture, old_result, new_result, changed_player_ids):
+    """
+    Called by the scoring service in the same transaction as the score write.
+    old_result / new_result: FixtureAggregate values before and after the save.
+    Team sports undo the fixture's old contribution and add the new one, so
+    only the two teams' rows are touched; individual sports refresh the
+    lifters that changed.
+    """
+    event = fixture.event
+    if _first_result(event.id):
+        # First result for this event: build everything once (aggregate is already flushed)
+        rebuild_standings(event)
+    elif event.sport.type == 'team':
+        if fixture.team_a_id and fixture.team_b_id:
+            rules, overs = team_rules(event.sport), _fixture_overs(event)
+            old = _team_result(old_result.get('team_a_score'), old_result.get('team_b_score'), overs, rules) \
+                or (None, None)
+            new = _team_result(new_result.get('team_a_score'), new_result.get('team_b_score'), overs, rules) \
+                or (None, None)
+            _apply_team_delta(event.id, fixture.team_a_id, old[0], new[0])
+            _apply_team_delta(event.id, fixture.team_b_id, old[1], new[1])
+    else:
+        for player_id in changed_player_ids:
+            _refresh_player(event, player_id)
+
+    cache.invalidate_after_commit(db.session, f"standings:{event.id}")
+
+
+def rebuild_standings(event):
+    """Full recompute for one event (first result, backfills, manual repair)"""
+    _lock_event(event.id)
+    Standing.query.filter_by(event_id=event.id).delete()
+
+    if event.sport.type == 'team':
+        rules, overs = team_rules(event.sport), _fixture_overs(event)
+        rows = {}
+        for fixture, agg in (db.session.query(Fixture, FixtureAggregate)
+                             .join(FixtureAggregate, FixtureAggregate.fixture_id == Fixture.id)
+                             .filter(Fixture.event_id == event.id)):
+            result = _team_result(agg.team_a_score, agg.team_b_score, overs, rules)
+            if result is None or not (fixture.team_a_id and fixture.team_b_id):
+                continue
+            for team_id, deltas in zip((fixture.team_a_id, fixture.team_b_id), result):
+                row = rows.setdefault(team_id, {})
+                for key, value in deltas.items():
+                    row[key] = row.get(key, 0) + value
+        for team_id, values in rows.items():
+            db.session.add(Standing(event_id=event.id, team_id=team_id, **values))
+    else:
+        player_ids = [row.player_id for row in db.session.query(ScoreEntry.player_id)
+                      .join(Fixture, Fixture.id == ScoreEntry.fixture_id)
+                      .filter(Fixture.event_id == event.id).distinct()]
+        for player_id in player_ids:
+            _refresh_player(event, player_id)
+
+    event.updated_at = datetime.utcnow()  # new version for get_standings() and the event's validators
+    db.session.flush()
+    cache.invalidate_after_commit(db.session, f"standings:{event.id}")
+
+
+# ==========================================
+# 3. READ API (cached)
+# ==========================================
+def get_standings(event_id, version):
+    """
+    version: the event's updated_at. Tag bumps only reach this worker's
+    memory cache, so the key carries the version every worker reads from
+    the database, and a write handled elsewhere is never served stale here.
+    """
+    return cache.memoize(f"standings:{event_id}@{version.isoformat()}", lambda: _load_standings(event_id),
+                         tags=[f"standings:{event_id}"])
+
+
+def _load_standings(event_id):
+    event = db.session.get(Event, event_id)
+    if event.sport.type == 'team':
+        rules = team_rules(event.sport)
+        rows = []
+        for standing, team_name in (db.session.query(Standing, Team.name)
+                                    .join(Team, Team.id == Standing.team_id)
+                                    .filter(Standing.event_id == event_id)):
+            if rules['tiebreak'] == 'net_run_rate':
+                tiebreak = (standing.score_for / standing.overs_for if standing.overs_for else 0) - \
+                           (standing.score_against / standing.overs_against if standing.overs_against else 0)
+            else:
+                tiebreak = standing.score_for - standing.score_against
+            rows.append({
+                'team_id': standing.team_id, 'team': team_name,
+                'played': standing.played, 'won': standing.won, 'drawn': standing.drawn, 'lost': standing.lost,
+                'points': standing.points, 'tiebreak': round(tiebreak, 3),
+            })
+        rows.sort(key=lambda r: (-r['points'], -r['tiebreak'], r['team']))
+        return {'type': 'team', 'tiebreak': rules['tiebreak'], 'rows': rows}
+
+    categories = {}
+    lifters = (db.session.query(Standing, Player.name)
+               .join(Player, Player.id == Standing.player_id)
+               .filter(Standing.event_id == event_id))
+    for standing, name in lifters:
+        categories.setdefault(standing.category or 'Open', []).append({
+            'player_id': standing.player_id, 'player': name, 'played': standing.played,
+            'total': standing.best_total or 0, 'sinclair': standing.sinclair_total,
+        })
+    for rows in categories.values():
+        rows.sort(key=lambda r: (-r['total'], r['player']))
+    lifting = is_weightlifting(event.sport)
+    overall = sorted((r for rows in categories.values() for r in rows), key=lambda r: -(r['sinclair'] or 0)) \
+        if lifting else []
+    return {'type': 'individual', 'categories': categories, 'sinclair': overall[:10],
+            'unit': 'kg' if lifting else (event.sport.config_schema or {}).get('scoring_unit', '')}
+
+
+# ==========================================
+# 4. BACKGROUND RECOMPUTE (see app/jobs.py)
+# ==========================================
+# Full rebuilds (repairs, rule changes) scan every result of the event, so
+# they run on a job worker rather than in the request that asks for them.
+@job('standings.rebuild')
+def rebuild_standings_job(event_id):
+    event = db.session.get(Event, event_id)
+    if event is not None:
+        rebuild_standings(event)
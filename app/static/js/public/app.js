@@ -23,7 +23,7 @@ $(document).ready(function() {
         // 2. AJAX Request
         $.ajax({
             url: '/api/filter_events',
-            type: 'POST',
+            type: 'GET', // revalidated by ETag, usually a 304
             data: { sport_id: sportId },
             beforeSend: function() {
                 // Optional: Add a loading opacity effect
@@ -32,6 +32,7 @@ $(document).ready(function() {
             success: function(response) {
                 // 3. Update DOM with new HTML
                 $('#events-grid').html(response.html).css('opacity', '1');
+                window.nextEventsCursor = null;
                 
                 // Re-initialize animations if using AOS
                 if(typeof AOS !== 'undefined'){
@@ -65,7 +66,7 @@ $(document).ready(function() {
         // 2. Fetch Details via AJAX
         $.ajax({
             url: '/api/get_event_details',
-            type: 'POST',
+            type: 'GET', // revalidated by ETag, usually a 304
             data: { event_id: eventId },
             success: function(response) {
                 // 3. Inject Content
@@ -94,7 +95,7 @@ $('.filter-input').on('change keyup', function() {
 
         $.ajax({
             url: '/api/filter_events',
-            type: 'POST',
+            type: 'GET',
             data: formData,
             beforeSend: function() {
                 $('#events-grid').addClass('opacity-50');
@@ -103,11 +104,40 @@ $('.filter-input').on('change keyup', function() {
             success: function(response) {
                 $('#events-grid').html(response.html).removeClass('opacity-50');
                 $('#gridLoader').addClass('d-none');
+                window.nextEventsCursor = response.next_cursor;
             }
         });
 
     }, 300); // 300ms delay
 });
+
+// 2. INFINITE SCROLL (fetch only the next slice using the server cursor)
+// The server-rendered first page carries its cursor on the grid
+window.nextEventsCursor = $('#events-grid').data('next-cursor') || null;
+var loadingMore = false;
+
+$(window).on('scroll', function() {
+    if (!window.nextEventsCursor || loadingMore || !$('#events-grid').length) return;
+
+    var gridBottom = $('#events-grid').offset().top + $('#events-grid').outerHeight();
+    if ($(window).scrollTop() + $(window).height() < gridBottom - 200) return;
+
+    loadingMore = true;
+    var formData = $('#filterForm').serialize() + '&cursor=' + encodeURIComponent(window.nextEventsCursor);
+
+    $.ajax({
+        url: '/api/filter_events',
+        type: 'GET',
+        data: formData,
+        success: function(response) {
+            $('#events-grid').append(response.html);
+            window.nextEventsCursor = response.next_cursor;
+        },
+        complete: function() {
+            loadingMore = false;
+        }
+    });
+});
 // app/static/js/public/app.js
 
 // Make the function global by attaching it to 'window'
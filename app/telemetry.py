@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+
+
+# ==========================================
+# CONNECTION POOL TELEMETRY
+# ==========================================
+class PoolStats:
+    """
+    Live counters for one engine's connection pool.
+
+    Checkout latency is the time spent inside pool.connect(), i.e. waiting
+    for a free connection (or opening a new one). In-use / overflow come
+    from the pool's checkout and checkin events.
+    """
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)  # recent checkout waits (ms)
+        self.checkouts = 0
+        self.checkout_ms_total = 0.0
+        self.checkout_ms_max = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.overflow_checkouts = 0  # checkouts that needed a connection beyond pool_size
+        self.connects = 0
+        self.invalidations = 0
+
+    # --- Event handlers ---
+    def record_wait(self, elapsed_ms):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_ms_total += elapsed_ms
+            self.checkout_ms_max = max(self.checkout_ms_max, elapsed_ms)
+            self._latencies.append(elapsed_ms)
+
+    def on_checkout(self, pool):
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            size = _call(pool, 'size')
+            if size is not None and self.in_use > size:
+                self.overflow_checkouts += 1
+
+    def on_checkin(self):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def on_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def on_invalidate(self):
+        with self._lock:
+            self.invalidations += 1
+
+    # --- Reporting ---
+    def snapshot(self, pool):
+        with self._lock:
+            recent = sorted(self._latencies)
+            return {
+                'pool': {
+                    'class': type(pool).__name__,
+                    'size': _call(pool, 'size'),
+                    'checked_out': _call(pool, 'checkedout'),
+                    'overflow': _call(pool, 'overflow'),
+                    'status': pool.status(),
+                },
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'checkout_ms': {
+                    'avg': round(self.checkout_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                    'p50': _percentile(recent, 50),
+                    'p95': _percentile(recent, 95),
+                    'p99': _percentile(recent, 99),
+                    'max': round(self.checkout_ms_max, 3),
+                },
+            }
+
+
+def _call(pool, name):
+    """QueuePool sizing methods; StaticPool / SingletonThreadPool don't have them"""
+    method = getattr(pool, name, None)
+    return method() if callable(method) else None
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+def _time_checkouts(pool, stats):
+    """Wraps pool.connect() (what Engine.raw_connection calls) to time the wait"""
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            stats.record_wait((time.perf_counter() - start) * 1000)
+
+    pool.connect = timed_connect
+
+
+def instrument_engine(engine):
+    stats = PoolStats()
+    _time_checkouts(engine.pool, stats)
+
+    event.listen(engine.pool, 'checkout', lambda dbapi_conn, record, proxy: stats.on_checkout(engine.pool))
+    event.listen(engine.pool, 'checkin', lambda dbapi_conn, record: stats.on_checkin())
+    event.listen(engine.pool, 'connect', lambda dbapi_conn, record: stats.on_connect())
+    event.listen(engine.pool, 'invalidate', lambda dbapi_conn, record, exc: stats.on_invalidate())
+    # dispose() swaps in a fresh pool (listeners are copied over, the wrapper isn't)
+    event.listen(engine, 'engine_disposed', lambda eng: _time_checkouts(eng.pool, stats))
+    return stats
+
+
+def init_pool_telemetry(app):
+    from app.extensions import db
+    with app.app_context():
+        engine = db.engine
+        app.extensions['pool_stats'] = (engine, instrument_engine(engine))
+
+
+def pool_metrics(app):
+    engine, stats = app.extensions['pool_stats']
+    return stats.snapshot(engine.pool)
@@ -1,10 +1,20 @@
 import sys
-from datetime import datetime
-from flask import Blueprint, render_template, url_for, flash, redirect, request, jsonify
+from datetime import date, datetime, time as dtime, timedelta
+from flask import (Blueprint, render_template, url_for, flash, redirect, request, jsonify, abort, current_app,
+                   stream_with_context)
 from flask_login import login_required, current_user
 from app import db
 from app.models import Event, Venue, Sport, Team, Player, Fixture
-from app.utils import save_avatar
+from app.conditional import conditional, etag_for
+from app.queries import EventListingQuery, event_roster, sport_choices, venue_choices
+from app.users.services import (ScoreConflict, ScoreValidationError, apply_attempts, can_score,
+                                parse_score_form, validate_attempts)
+from app.avatars import AvatarError, save_avatar
+from app.exports import FORMATS as EXPORT_FORMATS, ExportError, export
+from app.jobs import enqueue
+from app.roster_import import RosterImportError, import_roster, read_rows, roster_template
+from app.scheduling import (ScheduleError, find_conflict, free_slots, lock_venue, match_minutes,
+                            parse_options as parse_schedule_options, schedule_event)
 from typing import Any, Dict
 from werkzeug.security import generate_password_hash
 users_bp = Blueprint('users', __name__)
@@ -52,18 +62,23 @@ def update_profile():
         current_user.username = request.form.get('username')
         current_user.email = request.form.get('email')
 
-        if 'avatar' in request.files:
-            file = request.files['avatar']
-            if file.filename != '':
-                picture_file = save_avatar(file)
-                current_user.avatar = picture_file
-
         try:
             db.session.commit()
             flash('Your profile has been updated!', 'success')
         except Exception as e:  # Catch specific errors is better, but generic Exception handles crashes
+            db.session.rollback()
             flash('Error updating profile. Username or Email might be taken.', 'danger: ', e)
 
+        # Streamed to disk and resized in the background; the old avatar is removed once replaced
+        if 'avatar' in request.files:
+            file = request.files['avatar']
+            if file.filename != '':
+                try:
+                    if not save_avatar(current_user, file):
+                        flash('Your new avatar is being processed and will appear shortly.', 'info')
+                except AvatarError as e:
+                    flash(str(e), 'danger')
+
     return redirect(url_for('users.profile'))
 
 
@@ -77,7 +92,7 @@ def manager_dashboard():
         flash('Access Denied: Managers only.', 'danger')
         return redirect(url_for('public.index'))
 
-    my_events = Event.query.filter_by(manager_id=current_user.id).all()
+    my_events = EventListingQuery().managed_by(current_user.id).all()
 
     return render_template('users/manager/manager_dashboard.html',
                            events=my_events,
@@ -138,8 +153,8 @@ def create_event():
             print(f"🔥 Error: {str(e)}", file=sys.stderr)
             return jsonify({'status': 'error', 'message': str(e)}), 500
 
-    sports = Sport.query.all()
-    venues = Venue.query.all()
+    sports = sport_choices()
+    venues = venue_choices()
     return render_template('users/manager/create_event.html',
                            active_page='create_event',
                            sports=sports, venues=venues, title="Create Event")
@@ -148,8 +163,13 @@ def create_event():
 @users_bp.route("/api/get_sport_config/<int:sport_id>")
 @login_required
 def get_sport_config(sport_id):
-    sport = Sport.query.get_or_404(sport_id)
-    return jsonify(sport.config_schema)
+    # Schemas change only when an admin edits the sport: let the browser keep it for a long time
+    updated_at = db.session.query(Sport.updated_at).filter(Sport.id == sport_id).scalar()
+    if updated_at is None:
+        abort(404)
+    return conditional(etag_for('sport', sport_id, updated_at), updated_at,
+                       lambda: jsonify(db.session.get(Sport, sport_id).config_schema),
+                       max_age=current_app.config['SPORT_CONFIG_MAX_AGE'], private=True)
 
 
 # ==========================================
@@ -161,7 +181,7 @@ def manager_my_events():
     if current_user.role != 'manager':
         return redirect(url_for('public.index'))
 
-    events = Event.query.filter_by(manager_id=current_user.id).order_by(Event.start_date.desc()).all()
+    events = EventListingQuery().managed_by(current_user.id).with_rosters().latest_first().all()
     return render_template('users/manager/my_events.html', events=events, active_page='my_events')
 
 
@@ -238,18 +258,95 @@ def add_player(team_id):
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+@users_bp.route("/api/event/<int:event_id>/import_roster", methods=['POST'])
+@login_required
+def import_roster_file(event_id):
+    """
+    multipart/form-data: file=<roster.csv | roster.xlsx>[, partial=1]
+    Adds every team and player of the file in one transaction. If any row is
+    invalid nothing is saved (422 with the row report), unless partial=1:
+    then the valid rows are saved and the others reported.
+    """
+    event = Event.query.get_or_404(event_id)
+    if event.manager_id != current_user.id:
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 403
+
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'status': 'error', 'message': 'Choose a .csv or .xlsx file to import.'}), 400
+    partial = request.form.get('partial') in ('1', 'true', 'on')
+
+    config = current_app.config
+    try:
+        report = import_roster(event, read_rows(upload.stream, upload.filename),
+                               chunk_size=config['IMPORT_CHUNK_ROWS'], max_rows=config['IMPORT_MAX_ROWS'],
+                               max_errors=config['IMPORT_MAX_ERRORS'])
+    except RosterImportError as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    if report['error_count'] and not partial:
+        db.session.rollback()
+        return jsonify(dict(report, status='error', saved=False,
+                            message=f"{report['error_count']} rows have errors; nothing was imported.")), 422
+
+    db.session.commit()
+    return jsonify(dict(report, status='success', saved=True,
+                        message=f"Imported {report['teams_created']} teams and "
+                                f"{report['players_created']} players."))
+
+
+@users_bp.route("/api/event/<int:event_id>/roster_template.csv")
+@login_required
+def roster_template_csv(event_id):
+    """Header + example row for this event's sport"""
+    event = Event.query.get_or_404(event_id)
+    if event.manager_id != current_user.id:
+        abort(403)
+    return current_app.response_class(
+        roster_template(event.sport.config_schema or {}), mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=roster-event-{event.id}.csv'})
+
+
+@users_bp.route("/api/event/<int:event_id>/export/<any(teams, players, fixtures, scores):dataset>."
+                "<any(csv, jsonl, parquet):fmt>")
+@login_required
+def export_event_data(event_id, dataset, fmt):
+    """Streams the dataset as it is read (see app/exports.py); same data as `flask export`"""
+    event = Event.query.get_or_404(event_id)
+    if event.manager_id != current_user.id:
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 403
+    try:
+        chunks = export(dataset, [event.id], fmt)
+    except ExportError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return current_app.response_class(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt], headers={
+        'Content-Disposition': f'attachment; filename=event-{event.id}-{dataset}.{fmt}',
+        'X-Accel-Buffering': 'no',  # nginx: pass chunks through as they come
+    })
+
+
 @users_bp.route("/api/team/<int:team_id>/get_players")
 @login_required
 def get_team_players(team_id):
-    team = Team.query.get_or_404(team_id)
+    # Validator first: Team.updated_at is bumped whenever one of its players changes
+    row = (db.session.query(Team.updated_at, Event.manager_id)
+           .join(Event, Event.id == Team.event_id).filter(Team.id == team_id).first())
+    if row is None:
+        abort(404)
     # Note: Read access might be okay for non-owners, but strictly:
-    if team.event.manager_id != current_user.id:
+    if row.manager_id != current_user.id:
         return jsonify({'html': '<div class="text-danger">Unauthorized</div>'}), 403
 
-    players = Player.query.filter_by(team_id=team.id).all()
-    html = render_template('users/manager/partials/player_list.html', players=players, sport_type=team.event.sport.name,
-                           title="Team Players")
-    return jsonify({'html': html})
+    def render_players():
+        team = db.session.get(Team, team_id)
+        players = Player.query.filter_by(team_id=team.id).all()
+        html = render_template('users/manager/partials/player_list.html', players=players,
+                               sport_type=team.event.sport.name, title="Team Players")
+        return jsonify({'html': html})
+
+    return conditional(etag_for('team-players', team_id, row.updated_at), row.updated_at, render_players,
+                       private=True)
 
 
 @users_bp.route("/api/event/<int:event_id>/add_fixture", methods=['POST'])
@@ -276,12 +373,28 @@ def add_fixture(event_id):
         # Since the database has no 'round_name' column, we recycle the 'title' column.
         match_title = data.get('round_name') if data.get('round_name') else data.get('title')
 
+        # Venue double-booking check (indexed range lookup, see app/scheduling.py)
+        venue_id = data.get('venue_id', type=int) or event.venue_id
+        end_time = start_time + timedelta(minutes=match_minutes(event.rules_config))
+        if venue_id:
+            lock_venue(venue_id)
+            clash = find_conflict(venue_id, start_time, end_time)
+            if clash:
+                return jsonify({
+                    'status': 'error',
+                    'message': f"Venue is booked {clash.start_time:%d %b %H:%M}-{clash.end_time:%H:%M} "
+                               f"({clash.title or 'another match'})",
+                    'conflict': {'fixture_id': clash.id, 'start_time': clash.start_time.isoformat(),
+                                 'end_time': clash.end_time.isoformat()},
+                }), 409
+
         new_fixture = Fixture(
             event_id=event.id,
-            venue_id=data.get('venue_id') or event.venue_id,
+            venue_id=venue_id,
             team_a_id=team_a_id if team_a_id else None,
             team_b_id=team_b_id if team_b_id else None,
             start_time=start_time,
+            end_time=end_time,
             title=match_title, # <--- Changed this
             # round_name=...  <--- REMOVED THIS LINE causing the error
         )
@@ -294,6 +407,91 @@ def add_fixture(event_id):
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+@users_bp.route("/api/event/<int:event_id>/generate_fixtures", methods=['POST'])
+@login_required
+def generate_fixtures(event_id):
+    """
+    Builds the whole schedule in one go:
+        {"format": "round_robin" | "groups_knockout" | "single_elimination",
+         "start": "2026-11-01T09:00", "venue_ids": [1, 2], "day_start": "09:00", "day_end": "21:00",
+         "match_minutes": 90, "rest_minutes": 120, "group_size": 4, "advance": 2,
+         "replace": false, "dry_run": false}
+    Only "format" is required. Fixtures are inserted in a single transaction;
+    "dry_run" returns them without saving.
+    """
+    event = Event.query.get_or_404(event_id)
+    if event.manager_id != current_user.id:
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        options = parse_schedule_options(data)
+        rows = schedule_event(event, data.get('format'), **options)
+    except ScheduleError as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    if options['dry_run']:
+        # ISO 8601 for every timestamp, like the clash payload (jsonify would send RFC 822)
+        return jsonify({'status': 'success', 'fixtures': [
+            {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+            for row in rows]})
+
+    db.session.commit()
+    return jsonify({
+        'status': 'success',
+        'message': f"{len(rows)} matches scheduled!",
+        'created': len(rows),
+        'first': min(row['start_time'] for row in rows).isoformat() if rows else None,
+        'last': max(row['start_time'] for row in rows).isoformat() if rows else None,
+    })
+
+
+@users_bp.route("/api/venue/<int:venue_id>/free_slots")
+@login_required
+def venue_free_slots(venue_id):
+    """
+    ?date=2026-11-02[&event_id=3 | &minutes=90][&day_start=09:00&day_end=21:00]
+    Gaps at the venue long enough for one match (the event's match length when given).
+    """
+    if db.session.get(Venue, venue_id) is None:
+        abort(404)
+    try:
+        day = date.fromisoformat(request.args.get('date', ''))
+        day_start = dtime.fromisoformat(request.args.get('day_start') or '09:00')
+        day_end = dtime.fromisoformat(request.args.get('day_end') or '21:00')
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'date must be YYYY-MM-DD, times HH:MM'}), 400
+
+    minutes = request.args.get('minutes', type=int)
+    event_id = request.args.get('event_id', type=int)
+    if not minutes:
+        rules = db.session.query(Event.rules_config).filter(Event.id == event_id).scalar() if event_id else None
+        minutes = match_minutes(rules)
+
+    gaps, bookings = free_slots(venue_id, day, minutes, day_start, day_end)
+    return jsonify({
+        'venue_id': venue_id,
+        'date': day.isoformat(),
+        'minutes': minutes,
+        'free': [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in gaps],
+        'booked': [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in bookings],
+    })
+
+
+@users_bp.route("/api/event/<int:event_id>/rebuild_standings", methods=['POST'])
+@login_required
+def rebuild_event_standings(event_id):
+    """Queues a full standings recompute (202); asking again while one is queued is a no-op"""
+    event = Event.query.get_or_404(event_id)
+    if event.manager_id != current_user.id:
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 403
+
+    job_id = enqueue('standings.rebuild', {'event_id': event.id}, unique_key=f"standings:{event.id}")
+    db.session.commit()
+    return jsonify({'status': 'queued', 'job_id': job_id, 'message': 'Standings will be recomputed shortly.'}), 202
+
+
 @users_bp.route("/manager/event/<int:event_id>/update_settings", methods=['POST'])
 @login_required
 def update_event_settings(event_id):
@@ -345,80 +543,67 @@ def change_password():
 @users_bp.route("/api/fixture/<int:fixture_id>/get_scores")
 @login_required
 def get_fixture_scores(fixture_id):
-    fixture = Fixture.query.get_or_404(fixture_id)
-    event = fixture.event
-
-    # Get all players participating in this event
-    players = []
-    teams = Team.query.filter_by(event_id=event.id).all()
+    # Only the columns the modal needs; the roster is cached per event, the scores merged per call
+    fixture = (db.session.query(Fixture.event_id, Fixture.score_data, Fixture.version)
+               .filter(Fixture.id == fixture_id).first())
+    if fixture is None:
+        abort(404)
 
-    for team in teams:
-        for player in team.players:
-            # Check if this player has a score in this specific fixture
-            # score_data structure: {'player_id_123': {'s1': 100, 'total': 200...}}
-            current_score = {}
-            if fixture.score_data:
-                current_score = fixture.score_data.get(str(player.id), {})
-
-            players.append({
-                'id': player.id,
-                'name': player.name,
-                'team_name': team.name,
-                'details': player.details,  # Contains weight_class
-                'scores': current_score
-            })
-
-    return jsonify({'players': players})
+    # score_data structure: {'<player_id>': {'s1': 100, 'total': 200...}}
+    scores = fixture.score_data or {}
+    players = [dict(player, scores=scores.get(str(player['id']), {}))
+               for player in event_roster(fixture.event_id)]
+    return jsonify({'players': players, 'version': fixture.version})
 
 
 @users_bp.route("/api/save_scores", methods=['POST'])
 @login_required
 def save_scores():
+    # Legacy form endpoint: keys look like "p_12_s1" (Player 12, Snatch 1)
     data = request.form
-    fixture_id = data.get('fixture_id')
-    fixture = Fixture.query.get_or_404(fixture_id)
-
-    # Initialize score dictionary
-    # We organize data by player ID
-    temp_scores = {}
-
-    # Parse the form data
-    # Keys look like: "p_12_s1" (Player 12, Snatch 1) or "p_5_c3" (Player 5, Clean & Jerk 3)
-    for key, value in data.items():
-        if key.startswith('p_'):
-            try:
-                parts = key.split('_')
-                p_id = parts[1]
-                metric = parts[2]  # s1, s2, c1, etc.
-
-                if p_id not in temp_scores:
-                    temp_scores[p_id] = {}
-
-                # Convert value to float, default to 0 if empty
-                temp_scores[p_id][metric] = float(value) if value else 0
-            except:
-                continue
-
-    # Calculate Totals logic
-    final_data = {}
-    for p_id, attempts in temp_scores.items():
-        # Get Best Snatch (Max of s1, s2, s3)
-        best_snatch = max(attempts.get('s1', 0), attempts.get('s2', 0), attempts.get('s3', 0))
+    fixture = Fixture.query.get_or_404(data.get('fixture_id'))
+    if not can_score(current_user, fixture):
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 403
 
-        # Get Best Clean & Jerk (Max of c1, c2, c3)
-        best_cj = max(attempts.get('c1', 0), attempts.get('c2', 0), attempts.get('c3', 0))
+    try:
+        attempts = validate_attempts(fixture, parse_score_form(data))
+        apply_attempts(fixture, attempts)
+    except ScoreValidationError as e:
+        return jsonify({'status': 'error', 'message': str(e), 'errors': e.errors}), 400
+    except ScoreConflict as e:
+        return jsonify({'status': 'error', 'message': str(e), 'version': e.current_version}), 409
 
-        attempts['best_snatch'] = best_snatch
-        attempts['best_cj'] = best_cj
-        attempts['total'] = best_snatch + best_cj
+    return jsonify({'status': 'success', 'message': 'Scores updated successfully!'})
 
-        final_data[p_id] = attempts
 
-    # Save to DB
-    fixture.score_data = final_data
-    db.session.commit()
+@users_bp.route("/api/fixture/<int:fixture_id>/scores", methods=['POST'])
+@login_required
+def save_scores_batch(fixture_id):
+    """
+    JSON batch scoring:
+        {"version": 3, "attempts": [{"player_id": 12, "metric": "snatch_1", "value": 100}, ...]}
+    Only the listed attempts are written. "version" is the fixture version
+    the client loaded; the save is rejected with 409 if someone else saved
+    in the meantime.
+    """
+    fixture = Fixture.query.get_or_404(fixture_id)
+    if not can_score(current_user, fixture):
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 403
 
-    return jsonify({'status': 'success', 'message': 'Scores updated successfully!'})
+    data = request.get_json(silent=True) or {}
+    try:
+        version = int(data['version'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': "'version' must be the integer fixture version"}), 400
+    try:
+        attempts = validate_attempts(fixture, data.get('attempts'))
+        changed = apply_attempts(fixture, attempts, expected_version=version)
+    except ScoreValidationError as e:
+        return jsonify({'status': 'error', 'message': str(e), 'errors': e.errors}), 400
+    except ScoreConflict as e:
+        return jsonify({'status': 'error', 'message': str(e), 'version': e.current_version}), 409
+
+    return jsonify({'status': 'success', 'version': fixture.version, 'players': changed})
 
 
 @users_bp.route("/api/player/<int:player_id>/delete", methods=['POST'])
@@ -0,0 +1,234 @@
+import math
+import re
+from datetime import datetime
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.extensions import db, live
+from app.models import Player, Team, ScoreEntry, FixtureAggregate
+from app.standings import update_for_fixture
+
+
+# ==========================================
+# 1. SCORING (Batch attempts -> Fixture.score_data)
+# ==========================================
+# score_data is keyed by str(player_id); each entry holds the raw attempts
+# (s1..s3 = snatch, c1..c3 = clean & jerk) plus the derived totals below.
+# Sport.config_schema['scoring_fields'] uses the long names, the stored keys
+# (and the scoring modal) use the short ones.
+METRIC_ALIASES = {
+    'snatch_1': 's1', 'snatch_2': 's2', 'snatch_3': 's3',
+    'cj_1': 'c1', 'cj_2': 'c2', 'cj_3': 'c3',
+}
+DERIVED_FIELDS = ('best_snatch', 'best_cj', 'total')
+METRIC_RE = re.compile(r'^[a-z][a-z0-9_]{0,31}$')
+
+
+class ScoreValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid attempt(s)")
+        self.errors = errors  # [{'index': i, 'message': '...'}]
+
+
+class ScoreConflict(Exception):
+    """The fixture changed since the client read it (optimistic concurrency)"""
+
+    def __init__(self, current_version):
+        super().__init__(f"Fixture was updated by someone else (version {current_version})")
+        self.current_version = current_version
+
+
+def allowed_metrics(sport):
+    """Stored metric keys the sport accepts, or None if the schema doesn't restrict them"""
+    fields = (sport.config_schema or {}).get('scoring_fields')
+    if not fields:
+        return None
+    return {METRIC_ALIASES.get(f, f) for f in fields}
+
+
+def can_score(user, fixture):
+    """Score writes: the event's manager or an admin (several of them may score one fixture at once)"""
+    return user.role == 'admin' or (user.role == 'manager' and fixture.event.manager_id == user.id)
+
+
+def validate_attempts(fixture, raw_attempts):
+    """
+    raw_attempts: [{'player_id': 12, 'metric': 'snatch_1' | 's1', 'value': 100}, ...]
+    Returns normalized (player_id, metric, value) tuples or raises ScoreValidationError.
+    """
+    if not isinstance(raw_attempts, list) or not raw_attempts:
+        raise ScoreValidationError([{'index': None, 'message': "'attempts' must be a non-empty list"}])
+
+    allowed = allowed_metrics(fixture.event.sport)
+    errors, attempts = [], []
+    for i, item in enumerate(raw_attempts):
+        try:
+            player_id = int(item['player_id'])
+            metric = METRIC_ALIASES.get(item['metric'], item['metric'])
+            value = item.get('value')
+            if isinstance(value, bool):
+                raise TypeError(value)
+            value = float(value) if value not in (None, '') else 0.0
+        except (KeyError, TypeError, ValueError):
+            errors.append({'index': i, 'message': 'Each attempt needs player_id, metric and a numeric value'})
+            continue
+        if not math.isfinite(value) or value < 0:
+            # NaN / inf aren't valid JSON (MySQL rejects them), and a lifted weight can't be negative
+            errors.append({'index': i, 'message': f"Invalid value for '{item['metric']}'"})
+            continue
+
+        if not isinstance(metric, str) or not METRIC_RE.match(metric) or metric in DERIVED_FIELDS:
+            errors.append({'index': i, 'message': f"Invalid metric '{item['metric']}'"})
+        elif allowed is not None and metric not in allowed:
+            errors.append({'index': i, 'message': f"'{item['metric']}' is not a scoring field for this sport"})
+        else:
+            attempts.append((i, player_id, metric, value))
+
+    # One query to confirm every player is registered in this fixture's event
+    player_ids = {a[1] for a in attempts}
+    if player_ids:
+        valid_ids = {row.id for row in db.session.query(Player.id)
+                     .join(Team, Player.team_id == Team.id)
+                     .filter(Team.event_id == fixture.event_id, Player.id.in_(player_ids))}
+        for i, player_id, _, _ in attempts:
+            if player_id not in valid_ids:
+                errors.append({'index': i, 'message': f"Player {player_id} is not part of this event"})
+
+    if errors:
+        raise ScoreValidationError(sorted(errors, key=lambda e: e['index']))
+    return [(player_id, metric, value) for _, player_id, metric, value in attempts]
+
+
+def compute_totals(entries):
+    """
+    Recomputes the derived fields for every player entry in one pass.
+    entries: {player_id: {metric: value}} (modified in place and returned)
+    """
+    for attempts in entries.values():
+        best_snatch = max((attempts.get(k, 0) for k in ('s1', 's2', 's3')), default=0)
+        best_cj = max((attempts.get(k, 0) for k in ('c1', 'c2', 'c3')), default=0)
+        attempts['best_snatch'] = best_snatch
+        attempts['best_cj'] = best_cj
+        attempts['total'] = best_snatch + best_cj
+    return entries
+
+
+def apply_attempts(fixture, attempts, expected_version=None, retries=3):
+    """
+    Merges only the given attempts into fixture.score_data and commits.
+
+    The fixture row is version checked on UPDATE (Fixture.version), so two
+    judges saving at once can't silently overwrite each other: without an
+    expected_version we re-read and re-merge on conflict, with one we
+    raise ScoreConflict so the client can reload.
+    Returns {player_id: entry} for the players that changed.
+    """
+    for _ in range(retries):
+        if expected_version is not None and fixture.version != expected_version:
+            raise ScoreConflict(fixture.version)
+
+        scores = {pid: dict(entry) for pid, entry in (fixture.score_data or {}).items()}
+        changed, changed_attempts = {}, []
+        for player_id, metric, value in attempts:
+            entry = scores.setdefault(str(player_id), {})
+            if entry.get(metric) != value:
+                entry[metric] = value
+                changed[str(player_id)] = entry
+                changed_attempts.append((player_id, metric, value))
+
+        if not changed:
+            return {}
+
+        compute_totals(changed)
+        fixture.score_data = scores
+        try:
+            # Queries below autoflush the fixture UPDATE, so they share the conflict handling
+            record_entries(fixture, changed_attempts)
+            previous, current = refresh_aggregate(fixture, scores)
+            update_for_fixture(fixture, previous, current, {int(pid) for pid in changed})
+            db.session.flush()  # fixture.version is now the one being committed
+            publish_score_delta(fixture, changed)
+            db.session.commit()
+            return changed
+        except StaleDataError:
+            db.session.rollback()  # expires fixture, next loop reads the winner's data
+
+    raise ScoreConflict(fixture.version)
+
+
+def publish_score_delta(fixture, changed):
+    """Queues the delta for the live streams; the broker sends it once the commit succeeds"""
+    message = {'type': 'scores', 'fixture_id': fixture.id, 'event_id': fixture.event_id,
+               'version': fixture.version, 'players': changed}
+    for channel in (f"fixture:{fixture.id}", f"event:{fixture.event_id}"):
+        live.publish_after_commit(db.session, channel, message)
+
+
+def record_entries(fixture, attempts):
+    """Upserts the normalized ScoreEntry rows for the attempts that changed"""
+    player_ids = {player_id for player_id, _, _ in attempts}
+    existing = {(e.player_id, e.metric): e for e in ScoreEntry.query.filter(
+        ScoreEntry.fixture_id == fixture.id, ScoreEntry.player_id.in_(player_ids))}
+
+    now = datetime.utcnow()
+    for player_id, metric, value in attempts:
+        entry = existing.get((player_id, metric))
+        if entry is None:
+            entry = ScoreEntry(fixture_id=fixture.id, player_id=player_id, metric=metric)
+            db.session.add(entry)
+            existing[(player_id, metric)] = entry
+        entry.value = value
+        entry.recorded_at = now
+
+
+def build_aggregate(scores, player_teams, team_a_id, team_b_id, scoring_unit):
+    """
+    Pure function behind FixtureAggregate.
+    scores: Fixture.score_data, player_teams: {player_id: team_id}
+    """
+    summary, team_totals = {}, {}
+    top_player_id, top_total = None, None
+    for pid, entry in scores.items():
+        summary[pid] = {k: entry[k] for k in DERIVED_FIELDS if k in entry}
+        total = entry.get('total')
+        if total is not None and (top_total is None or total > top_total):
+            top_player_id, top_total = int(pid), total
+        if scoring_unit and scoring_unit in entry:
+            team_id = player_teams.get(int(pid))
+            team_totals[team_id] = team_totals.get(team_id, 0) + entry[scoring_unit]
+
+    return {
+        'team_a_score': team_totals.get(team_a_id) if team_a_id else None,
+        'team_b_score': team_totals.get(team_b_id) if team_b_id else None,
+        'top_player_id': top_player_id,
+        'top_total': top_total,
+        'summary': summary,
+    }
+
+
+def refresh_aggregate(fixture, scores):
+    """Rewrites the fixture's materialized aggregate from the merged score_data"""
+    player_ids = [int(pid) for pid in scores]
+    player_teams = dict(db.session.query(Player.id, Player.team_id).filter(Player.id.in_(player_ids))) \
+        if player_ids else {}
+    values = build_aggregate(scores, player_teams, fixture.team_a_id, fixture.team_b_id,
+                             (fixture.event.sport.config_schema or {}).get('scoring_unit'))
+
+    aggregate = fixture.aggregate or FixtureAggregate(fixture_id=fixture.id)
+    previous = {key: getattr(aggregate, key) for key in values}
+    for key, value in values.items():
+        setattr(aggregate, key, value)
+    aggregate.updated_at = datetime.utcnow()
+    fixture.aggregate = aggregate
+    return previous, values
+
+
+def parse_score_form(form):
+    """Legacy scoring form: keys like 'p_12_s1' (player 12, snatch 1) -> attempt dicts"""
+    attempts = []
+    for key, value in form.items():
+        if key.startswith('p_'):
+            parts = key.split('_', 2)
+            if len(parts) == 3:
+                attempts.append({'player_id': parts[1], 'metric': parts[2], 'value': value})
+    return attempts
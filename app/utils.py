@@ -1,41 +1,37 @@
-import os
-import secrets
-from flask import current_app
-# from flask_mail import Message
-from flask import url_for
+from flask import current_app, request, url_for
 
+from app.extensions import db
+from app.jobs import enqueue, job
+from app.models import User
 
-def save_avatar(form_picture):
-    # 1. Generate a random name to prevent filename collisions
-    random_hex = secrets.token_hex(8)
-    _, f_ext = os.path.splitext(form_picture.filename)
-    picture_fn = random_hex + f_ext
 
-    # 2. Construct the full path
-    # Make sure this folder exists: app/static/images/uploads/avatars
-    picture_path = os.path.join(current_app.root_path, 'static/images/uploads/avatars', picture_fn)
-
-    # 3. Save the image
-    form_picture.save(picture_path)
+def send_reset_email(user):
+    """Queues the reset mail (the caller commits); a worker builds the link and sends it"""
+    enqueue('auth.reset_email', {'user_id': user.id, 'base_url': request.url_root},
+            unique_key=f"reset-email:{user.id}")
 
-    return picture_fn
 
+@job('auth.reset_email', max_attempts=8)
+def deliver_reset_email(user_id, base_url):
+    user = db.session.get(User, user_id)
+    if user is None:
+        return
+    token = user.get_reset_token()
+    # No request in a worker: build the external link against the host the user asked from
+    with current_app.test_request_context(base_url=base_url):
+        link = url_for('auth.reset_token', token=token, _external=True)
 
+    send_mail('Password Reset Request', [user.email], f'''To reset your password, visit the following link: {link}
+If you did not make this request then simply ignore this email.
+''')
 
 
+def send_mail(subject, recipients, body):
+    """Sends through Flask-Mail when MAIL_SERVER is set; otherwise only logs (development)"""
+    if not current_app.config.get('MAIL_SERVER'):
+        current_app.logger.warning("Mail to %s (MAIL_SERVER not set, not sent):\n%s", ', '.join(recipients), body)
+        return
+    from flask_mail import Mail, Message
 
-def send_reset_email(user):
-    token = user.get_reset_token()
-    # msg = Message('Password Reset Request',
-    #               sender='noreply@sportsmanager.com',
-    #               recipients=[user.email])
-
-    link = url_for('auth.reset_token', token=token, _external=True)
-
-#     print(f'''To reset your password, visit the following link: {link}
-# If you did not make this request then simply ignore this email.
-# ''')
-    print(f'''To reset your password, visit the following link: {link}
-     If you did not make this request then simply ignore this email.
-     ''')
-    # mail.send(msg)
\ No newline at end of file
+    mail = current_app.extensions.get('mail') or Mail(current_app)
+    mail.send(Message(subject, sender=current_app.config['MAIL_DEFAULT_SENDER'], recipients=recipients, body=body))
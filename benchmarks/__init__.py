@@ -0,0 +1,9 @@
+"""
+Benchmarks. Each module is runnable on its own, e.g.
+
+    python -m benchmarks.standings_update
+
+and works against a scratch SQLite database (config.ScratchConfig, in memory
+or a temporary file), so they never touch the configured MySQL database.
+benchmarks.routes writes its results as JSON for comparing commits.
+"""
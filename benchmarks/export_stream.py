@@ -0,0 +1,124 @@
+"""
+Streaming exports: time to first byte, throughput and peak memory for an
+event's flattened scores (and fixtures) at growing sizes, per format.
+
+Seeds one event per size on a scratch SQLite file (team fixtures, 10 scorers
+a fixture, 5 metrics each) and reads the export endpoint chunk by chunk
+like a client would. The peak Python memory is measured in a second, traced
+pass; it should stay about the same from the smallest size to the largest.
+
+    python -m benchmarks.export_stream --score-rows 10000 100000 300000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Event, Fixture, Player, Sport, Team, User
+from benchmarks.routes import build_app
+
+METRICS = ('runs', 'balls', 'fours', 'sixes', 'wickets')
+SCORERS = 10  # per fixture, five a side
+
+
+def seed_event(event_id, n_score_rows):
+    n_fixtures = max(1, n_score_rows // (SCORERS * len(METRICS)))
+    n_teams = 20
+    db.session.add(Event(id=event_id, title=f'Season {event_id}', sport_id=1, manager_id=1,
+                         start_date=datetime(2026, 1, 1)))
+    team_base, player_base = event_id * 1000, event_id * 100000
+    db.session.execute(insert(Team), [{'id': team_base + t, 'event_id': event_id, 'name': f'Team {t}'}
+                                      for t in range(n_teams)])
+    db.session.execute(insert(Player), [{'id': player_base + t * 5 + p, 'team_id': team_base + t,
+                                         'name': f'Player {t}-{p}', 'details': {'role': 'Batsman'}}
+                                        for t in range(n_teams) for p in range(5)])
+    rows = []
+    for i in range(n_fixtures):
+        a, b = i % n_teams, (i + 1 + i // n_teams) % n_teams
+        scorers = [player_base + a * 5 + p for p in range(5)] + [player_base + b * 5 + p for p in range(5)]
+        rows.append({'event_id': event_id, 'team_a_id': team_base + a, 'team_b_id': team_base + b,
+                     'title': f'Match {i}', 'start_time': datetime(2026, 1, 1) + timedelta(hours=3 * i),
+                     'score_data': {str(pid): {m: (pid + i + k) % 60 for k, m in enumerate(METRICS)}
+                                    for pid in scorers}})
+        if len(rows) == 5000:
+            db.session.execute(insert(Fixture), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Fixture), rows)
+    db.session.commit()
+    return n_fixtures
+
+
+def read(client, url):
+    """(seconds to first chunk, seconds in total, bytes)"""
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    chunks = iter(response.response)
+    size = len(next(chunks))
+    first = time.perf_counter() - start
+    for chunk in chunks:
+        size += len(chunk)
+    response.close()
+    return first, time.perf_counter() - start, size
+
+
+def traced_peak(client, url):
+    tracemalloc.start()
+    read(client, url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--score-rows', type=int, nargs='+', default=[10000, 100000, 300000])
+    parser.add_argument('--formats', nargs='+', default=['csv', 'jsonl', 'parquet'])
+    args = parser.parse_args()
+
+    formats = list(args.formats)
+    if 'parquet' in formats:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("pyarrow not installed: skipping Parquet")
+            formats.remove('parquet')
+
+    fd, tmp_db = tempfile.mkstemp(suffix='.sqlite')
+    os.close(fd)
+    try:
+        app = build_app(f'sqlite:///{tmp_db}')
+        with app.app_context():
+            db.create_all()
+            db.session.add_all([Sport(id=1, name='Cricket', type='team', config_schema={'roles': ['Batsman']}),
+                                User(id=1, username='mgr', email='mgr@example.com', role='manager',
+                                     password_hash='x')])
+            db.session.commit()
+            fixtures = {n: seed_event(i + 1, n) for i, n in enumerate(args.score_rows)}
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = '1'
+            session['_fresh'] = True
+
+        print(f"{'dataset':>9} {'rows':>8} {'format':>8} {'first byte ms':>14} {'total s':>8} "
+              f"{'rows/s':>9} {'MB':>7} {'peak MB':>8}")
+        for i, n in enumerate(args.score_rows):
+            for dataset, rows in (('scores', fixtures[n] * SCORERS * len(METRICS)), ('fixtures', fixtures[n])):
+                for fmt in formats:
+                    url = f'/users/api/event/{i + 1}/export/{dataset}.{fmt}'
+                    first, total, size = read(client, url)
+                    peak = traced_peak(client, url)
+                    print(f"{dataset:>9} {rows:>8} {fmt:>8} {first * 1000:>14.1f} {total:>8.2f} "
+                          f"{rows / total:>9.0f} {size / 2 ** 20:>7.1f} {peak / 2 ** 20:>8.1f}")
+    finally:
+        os.remove(tmp_db)
+
+
+if __name__ == '__main__':
+    main()
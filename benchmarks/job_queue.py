@@ -0,0 +1,63 @@
+"""
+Job queue: enqueue rate, drain throughput and pick-up latency of the
+SQL-backed queue (app/jobs.py) on a scratch SQLite file.
+
+Enqueues N no-op (or sleeping) jobs in one transaction, then drains them
+with a burst Worker at each concurrency; queue_stats() gives the wait from
+due to picked up and the run time per job.
+
+    python -m benchmarks.job_queue --jobs 2000 --concurrency 1 4 8 --sleep-ms 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.extensions import db
+from app.jobs import Worker, enqueue, job, queue_stats
+from app.models import Job
+from benchmarks.routes import build_app
+
+
+@job('bench.sleep')
+def sleep_job(ms):
+    if ms:
+        time.sleep(ms / 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--sleep-ms', type=float, default=5.0, help='Time each job takes.')
+    args = parser.parse_args()
+
+    fd, tmp_db = tempfile.mkstemp(suffix='.sqlite')
+    os.close(fd)
+    try:
+        app = build_app(f'sqlite:///{tmp_db}')
+        with app.app_context():
+            db.create_all()
+            print(f"{'threads':>7} {'enqueue/s':>10} {'drain s':>8} {'jobs/s':>8} {'wait p50':>9} "
+                  f"{'wait p95':>9} {'run p50':>8}")
+            for concurrency in args.concurrency:
+                db.session.query(Job).delete()
+                db.session.commit()
+                start = time.perf_counter()
+                for _ in range(args.jobs):
+                    enqueue('bench.sleep', {'ms': args.sleep_ms})
+                db.session.commit()
+                enqueued = time.perf_counter() - start
+
+                start = time.perf_counter()
+                Worker(app, concurrency=concurrency, poll_interval=0.01).run(burst=True)
+                drained = time.perf_counter() - start
+                stats = queue_stats(window=args.jobs)
+                print(f"{concurrency:>7} {args.jobs / enqueued:>10.0f} {drained:>8.2f} {args.jobs / drained:>8.0f} "
+                      f"{stats['wait_ms']['p50']:>9.1f} {stats['wait_ms']['p95']:>9.1f} {stats['run_ms']['p50']:>8.1f}")
+    finally:
+        os.remove(tmp_db)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+How many concurrent live score streams (SSE) one worker sustains.
+
+Runs the app on a threaded Werkzeug server, opens N raw socket subscribers
+on one fixture's stream, then saves scores through the batch endpoint and
+measures the time from the save request to each subscriber receiving the
+delta. Repeated for every subscriber count given. The subscribers run in
+the same process as the server, so at high counts the latencies include
+their share of the GIL: read them as an upper bound.
+
+    python -m benchmarks.live_stream --subscribers 100 500 1000 --saves 30
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from app.extensions import live
+from benchmarks.routes import build_app, pick_targets, seed
+
+
+# ==========================================
+# 1. SUBSCRIBER (one raw socket per client)
+# ==========================================
+class Subscriber(threading.Thread):
+    def __init__(self, port, path, received):
+        super().__init__(daemon=True)
+        self.sock = socket.create_connection(('127.0.0.1', port))
+        self.sock.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n".encode())
+        self.received = received  # version -> [arrival times], shared by all subscribers
+
+    def run(self):
+        try:
+            for line in self.sock.makefile('rb'):
+                if line.startswith(b'data: '):
+                    arrived = time.perf_counter()
+                    message = json.loads(line[6:])
+                    if message.get('type') == 'scores':
+                        self.received.setdefault(message['version'], []).append(arrived)
+        except (OSError, ValueError):
+            pass
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 2)
+
+
+# ==========================================
+# 2. ONE LEVEL
+# ==========================================
+def run_level(port, client, fixture_id, scorers, n_subscribers, saves, interval):
+    received = {}
+    start = time.perf_counter()
+    subscribers = [Subscriber(port, f'/api/fixture/{fixture_id}/stream', received) for _ in range(n_subscribers)]
+    for sub in subscribers:
+        sub.start()
+    connected = wait_for(lambda: live.stats['subscribers'] >= n_subscribers, timeout=60)
+    connect_s = time.perf_counter() - start
+
+    sent, rejected = {}, 0
+    for i in range(saves):
+        attempts = [{'player_id': pid, 'metric': 'runs', 'value': 100 + len(sent) * 7 + n}
+                    for n, pid in enumerate(scorers)]
+        t0 = time.perf_counter()
+        response = client.post(f'/users/api/fixture/{fixture_id}/scores', json={'attempts': attempts})
+        if response.status_code == 200:
+            sent[response.get_json()['version']] = t0
+        else:
+            rejected += 1
+        time.sleep(interval)
+
+    expected = len(sent) * n_subscribers
+    wait_for(lambda: sum(len(received.get(v, ())) for v in sent) >= expected, timeout=30)
+
+    latencies = sorted((arrived - sent[version]) * 1000
+                       for version, times in received.items() if version in sent for arrived in times)
+    threads = threading.active_count()  # server + subscriber threads while connected
+    for sub in subscribers:
+        sub.close()
+    wait_for(lambda: live.stats['subscribers'] == 0, timeout=30)
+
+    return {
+        'subscribers': n_subscribers,
+        'connected': connected,
+        'connect_s': round(connect_s, 2),
+        'saves': len(sent),
+        'rejected_saves': rejected,
+        'delivered': f"{len(latencies)}/{expected}",
+        'latency_ms': {'p50': _percentile(latencies, 50), 'p95': _percentile(latencies, 95),
+                       'p99': _percentile(latencies, 99), 'max': round(latencies[-1], 2),
+                       'mean': round(statistics.mean(latencies), 2)} if latencies else None,
+        'threads': threads,
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--saves', type=int, default=30, help='Score saves per level.')
+    parser.add_argument('--interval', type=float, default=0.05, help='Seconds between saves.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the results as JSON.')
+    args = parser.parse_args()
+    args.users, args.events, args.players_per_team = 200, 20, 8  # only one fixture is scored
+
+    fd, tmp_db = tempfile.mkstemp(suffix='.sqlite')
+    os.close(fd)
+    try:
+        app = build_app(f'sqlite:///{tmp_db}')
+        app.config.update(LIVE_MAX_SUBSCRIBERS=max(args.subscribers) + 10, LIVE_HEARTBEAT=1,
+                          LIVE_STREAM_MAX_SECONDS=3600)
+        seed(app, args)
+        targets = pick_targets(app, random.Random(args.seed), samples=1)
+        fixture_id, scorers = next(iter(targets['fixtures'].items()))
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(targets['manager_id'])
+            session['_fresh'] = True
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)  # no access log per stream
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        results = []
+        for n in args.subscribers:
+            row = run_level(server.server_port, client, fixture_id, scorers, n, args.saves, args.interval)
+            results.append(row)
+            lat = row['latency_ms'] or {'p50': 0, 'p95': 0, 'p99': 0}
+            print(f"{n:>6} subscribers  connect {row['connect_s']:>5.2f}s  delivered {row['delivered']:>12}  "
+                  f"p50 {lat['p50']:>7.2f}ms  p95 {lat['p95']:>7.2f}ms  p99 {lat['p99']:>7.2f}ms  "
+                  f"threads {row['threads']:>5}  rss {row['max_rss_mb']}MB")
+        server.shutdown()
+        print(f"resyncs (slow clients): {live.stats['resyncs']}")
+    finally:
+        os.remove(tmp_db)
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump({'levels': results, 'live': dict(live.stats)}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Bulk roster import versus building the roster one request at a time.
+
+Writes a kabaddi roster (12 players a team) as CSV, and as XLSX when
+openpyxl is installed, and uploads it to the import endpoint of a fresh
+event on a scratch SQLite file. Reports the wall time, statements run and
+the peak Python memory of each upload. The peak is measured in a second,
+traced run, because tracing slows the import down. The peak includes the
+test client building the multipart body in memory, and the import's
+per-name duplicate sets, which grow with the roster. For comparison, the
+first --baseline players go through add_team / add_player, one request and
+one commit each; that rate is extrapolated to the full roster.
+
+    python -m benchmarks.roster_import --players 10000 50000 --baseline 500
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.extensions import db
+from app.models import Event, Player, Sport, Team, User
+from app.profiling import count_queries
+from benchmarks.routes import build_app
+
+ROLES = ['Raider', 'Defender', 'All-rounder']
+PER_TEAM = 12
+
+
+def roster_rows(n_players, rng):
+    yield ['team', 'city', 'coach_name', 'player', 'role', 'jersey']
+    for i in range(n_players):
+        team = i // PER_TEAM
+        yield [f'Team {team}', f'City {team % 40}', f'Coach {team}', f'Player {i}', rng.choice(ROLES), i % PER_TEAM + 1]
+
+
+def write_csv(path, n_players, rng):
+    with open(path, 'w', newline='') as fh:
+        csv.writer(fh).writerows(roster_rows(n_players, rng))
+
+
+def write_xlsx(path, n_players, rng):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in roster_rows(n_players, rng):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def new_event(app, n):
+    with app.app_context():
+        event = Event(title=f'Pro League {n}', sport_id=1, manager_id=1, start_date=datetime(2026, 11, 2))
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+
+def upload(client, event_id, path):
+    with open(path, 'rb') as fh:
+        return client.post(f'/users/api/event/{event_id}/import_roster',
+                           data={'file': (fh, os.path.basename(path))}, content_type='multipart/form-data')
+
+
+def bulk(app, client, path, n_players):
+    event_id = new_event(app, n_players)
+    with app.app_context(), count_queries() as counter:
+        start = time.perf_counter()
+        response = upload(client, event_id, path)
+        elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.get_json()
+    report = response.get_json()
+    assert report['players_created'] == n_players, report
+
+    traced_event = new_event(app, n_players)
+    tracemalloc.start()
+    upload(client, traced_event, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    with app.app_context():
+        stored = (db.session.query(db.func.count(Player.id)).join(Team, Team.id == Player.team_id)
+                  .filter(Team.event_id == event_id).scalar())
+    return elapsed, counter.count, peak, stored
+
+
+def one_by_one(app, client, n_players, rng):
+    """The manage_event screen's path: a form POST per team, a JSON POST per player"""
+    event_id = new_event(app, -n_players)
+    rows = list(roster_rows(n_players, rng))[1:]
+    start = time.perf_counter()
+    team_ids = {}
+    for team, city, coach, player, role, jersey in rows:
+        if team not in team_ids:
+            response = client.post(f'/users/api/event/{event_id}/add_team',
+                                   data={'name': team, 'city': city, 'coach_name': coach})
+            team_ids[team] = response.get_json()['team_id']
+        client.post(f'/users/api/team/{team_ids[team]}/add_player',
+                    json={'name': player, 'role': role, 'jersey': jersey})
+    return time.perf_counter() - start, len(rows) + len(team_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--baseline', type=int, default=500, help='Players added one request at a time.')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    tmp_db = os.path.join(workdir, 'bench.sqlite')
+    try:
+        app = build_app(f'sqlite:///{tmp_db}')
+        app.config['IMPORT_MAX_ROWS'] = max(args.players)
+        with app.app_context():
+            db.create_all()
+            db.session.add_all([Sport(id=1, name='Kabaddi', type='team', config_schema={'roles': ROLES}),
+                                User(id=1, username='mgr', email='mgr@example.com', role='manager',
+                                     password_hash='x')])
+            db.session.commit()
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = '1'
+            session['_fresh'] = True
+
+        seconds, requests = one_by_one(app, client, args.baseline, random.Random(args.seed))
+        per_player = seconds / args.baseline
+        print(f"one by one: {args.baseline} players in {seconds:.2f}s ({requests} requests), "
+              f"{per_player * 1000:.2f} ms per player")
+
+        formats = [('csv', write_csv)]
+        try:
+            import openpyxl  # noqa: F401
+            formats.append(('xlsx', write_xlsx))
+        except ImportError:
+            print("openpyxl not installed: skipping XLSX")
+
+        print(f"{'players':>8} {'format':>6} {'file MB':>8} {'import s':>9} {'rows/s':>9} {'queries':>8} "
+              f"{'peak MB':>8} {'one by one s (est.)':>20}")
+        for n in args.players:
+            for fmt, write in formats:
+                path = os.path.join(workdir, f'roster-{n}.{fmt}')
+                write(path, n, random.Random(args.seed))
+                elapsed, queries, peak, stored = bulk(app, client, path, n)
+                assert stored == n
+                print(f"{n:>8} {fmt:>6} {os.path.getsize(path) / 2 ** 20:>8.2f} {elapsed:>9.2f} {n / elapsed:>9.0f} "
+                      f"{queries:>8} {peak / 2 ** 20:>8.1f} {per_player * n:>20.0f}")
+    finally:
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Fixture scheduler at scale: solver time per format / team count / venue
+count, then an end-to-end run (plan + single bulk INSERT + commit) against
+a scratch database, with a check that no venue is double-booked and every
+team gets its rest. Finally times the clash check add_fixture runs.
+
+    python -m benchmarks.scheduler --teams 32 128 256 --venues 24 --busy 0.2
+"""
+import argparse
+import random
+import time
+from datetime import datetime, time as dtime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.extensions import db
+from app.models import Event, Fixture, Sport, Team, User, Venue
+from app.scheduling import (DailyWindow, VenueCalendar, assign_times, find_conflict, plan_rounds,
+                            schedule_event)
+from config import ScratchConfig
+
+FORMATS = ('round_robin', 'groups_knockout', 'single_elimination')
+
+
+# ==========================================
+# 1. SOLVER ONLY
+# ==========================================
+def random_bookings(rng, n_venues, days, duration, share):
+    """Other events' fixtures: `share` of each venue's daily slots already taken"""
+    calendars = {}
+    slots_per_day = (21 - 9) * 60 // duration
+    for venue_id in range(1, n_venues + 1):
+        busy = [(day * 1440 + 540 + slot * duration, day * 1440 + 540 + (slot + 1) * duration)
+                for day in range(days) for slot in range(slots_per_day) if rng.random() < share]
+        calendars[venue_id] = busy
+    return calendars
+
+
+def check(booked, duration, rest, busy):
+    """Asserts the constraints on a solver result; returns the schedule length in days"""
+    by_venue, by_team = {}, {}
+    for match in booked:
+        by_venue.setdefault(match['venue_id'], []).append(match['start'])
+        for team in (match['team_a_id'], match['team_b_id']):
+            if team is not None:
+                by_team.setdefault(team, []).append(match['start'])
+    for venue_id, starts in by_venue.items():
+        starts.sort()
+        assert all(b - a >= duration for a, b in zip(starts, starts[1:])), f"venue {venue_id} double-booked"
+        for begin, end in busy.get(venue_id, ()):
+            assert all(s + duration <= begin or s >= end for s in starts), f"venue {venue_id} clashes with a booking"
+    for team, starts in by_team.items():
+        starts.sort()
+        assert all(b - a >= duration + rest for a, b in zip(starts, starts[1:])), f"team {team} not rested"
+    return (max(m['start'] for m in booked) // 1440) + 1 if booked else 0
+
+
+def solver_runs(args, rng):
+    window = DailyWindow(dtime(9), dtime(21), args.minutes)
+    busy = random_bookings(rng, args.venues, 400, args.minutes, args.busy)
+    print(f"{'format':<20} {'teams':>6} {'matches':>8} {'plan ms':>9} {'assign ms':>10} {'days':>6}")
+    for fmt in FORMATS:
+        for n in args.teams:
+            start = time.perf_counter()
+            rounds = plan_rounds(list(range(1, n + 1)), fmt)
+            planned = time.perf_counter()
+            calendars = {v: VenueCalendar(b) for v, b in busy.items()}
+            booked = assign_times(rounds, calendars, window, start=540, rest=args.rest, changeover=0)
+            done = time.perf_counter()
+            days = check(booked, args.minutes, args.rest, busy)
+            print(f"{fmt:<20} {n:>6} {len(booked):>8} {(planned - start) * 1000:>9.1f} "
+                  f"{(done - planned) * 1000:>10.1f} {days:>6}")
+
+
+# ==========================================
+# 2. END TO END (DB)
+# ==========================================
+def end_to_end(args):
+    app = create_app(ScratchConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Sport(id=1, name='Football', type='team', config_schema={'roles': []}),
+                            User(id=1, username='mgr', email='mgr@example.com', role='manager', password_hash='x')])
+        db.session.execute(insert(Venue), [{'id': v, 'name': f'Ground {v}', 'city': 'Raipur'}
+                                           for v in range(1, args.venues + 1)])
+        n = max(args.teams)
+        events = [Event(id=i, title=f'League {i}', sport_id=1, manager_id=1, start_date=datetime(2026, 11, 2),
+                        rules_config={'standard': {'match_minutes': args.minutes}}) for i in (1, 2)]
+        db.session.add_all(events)
+        db.session.execute(insert(Team), [{'id': e * n + t + 1, 'event_id': e + 1, 'name': f'Team {e}-{t}'}
+                                          for e in range(2) for t in range(n)])
+        db.session.commit()
+
+        venue_ids = list(range(1, args.venues + 1))
+        for event in events:  # the second league has to fit around the first one's bookings
+            start = time.perf_counter()
+            rows = schedule_event(event, 'round_robin', venue_ids=venue_ids, rest_minutes=args.rest,
+                                  changeover_minutes=0)
+            db.session.commit()
+            print(f"event {event.id}: {len(rows)} fixtures planned + inserted + committed "
+                  f"in {time.perf_counter() - start:.2f}s")
+
+        fixtures = db.session.query(Fixture.venue_id, Fixture.start_time, Fixture.end_time).order_by(
+            Fixture.venue_id, Fixture.start_time).all()
+        clashes = sum(1 for a, b in zip(fixtures, fixtures[1:]) if a.venue_id == b.venue_id
+                      and b.start_time < a.end_time)
+        print(f"{len(fixtures)} fixtures in the database, {clashes} venue double-bookings")
+
+        # Single booking checks (what add_fixture runs) against the full table
+        rng = random.Random(args.seed)
+        span = (fixtures[-1].start_time - fixtures[0].start_time).total_seconds() // 60
+        probes = [(rng.randint(1, args.venues), fixtures[0].start_time + timedelta(minutes=rng.randrange(int(span))))
+                  for _ in range(args.probes)]
+        start = time.perf_counter()
+        found = sum(find_conflict(venue_id, at, at + timedelta(minutes=args.minutes)) is not None
+                    for venue_id, at in probes)
+        elapsed = (time.perf_counter() - start) / len(probes) * 1000
+        print(f"find_conflict: {elapsed:.3f} ms per check over {len(fixtures)} fixtures ({found}/{len(probes)} clashed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--teams', type=int, nargs='+', default=[32, 128, 256])
+    parser.add_argument('--venues', type=int, default=24)
+    parser.add_argument('--minutes', type=int, default=90, help='Match length.')
+    parser.add_argument('--rest', type=int, default=120, help='Minimum rest between a team\'s matches.')
+    parser.add_argument('--busy', type=float, default=0.2, help='Share of venue slots already booked.')
+    parser.add_argument('--probes', type=int, default=1000, help='Single booking checks to time.')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    solver_runs(args, random.Random(args.seed))
+    print()
+    end_to_end(args)
+
+
+if __name__ == '__main__':
+    main()
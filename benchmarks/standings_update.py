@@ -0,0 +1,87 @@
+"""
+Shows that a score save updates standings in (roughly) constant time,
+whatever the number of fixtures already played in the event.
+
+    python -m benchmarks.standings_update --sizes 10 100 1000 5000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.extensions import db
+from app.models import Event, Fixture, FixtureAggregate, Player, Sport, Team, User
+from app.profiling import count_queries
+from app.users.services import apply_attempts
+from config import ScratchConfig
+
+
+def seed_event(n_fixtures, n_teams=20):
+    """One cricket event with n_fixtures already-scored fixtures"""
+    sport = Sport(name='Cricket', type='team', config_schema={'roles': ['Batsman'], 'scoring_unit': 'runs'})
+    manager = User(username='bench', email='bench@example.com', role='manager', password_hash='x')
+    db.session.add_all([sport, manager])
+    db.session.flush()
+    event = Event(title='Bench League', sport_id=sport.id, manager_id=manager.id, start_date=datetime(2026, 1, 1),
+                  rules_config={'standard': {'overs': 20}})
+    db.session.add(event)
+    db.session.flush()
+
+    db.session.execute(insert(Team), [{'id': t + 1, 'event_id': event.id, 'name': f'Team {t}'} for t in range(n_teams)])
+    db.session.execute(insert(Player), [{'id': t + 1, 'team_id': t + 1, 'name': f'Captain {t}', 'details': {}}
+                                        for t in range(n_teams)])
+    fixtures = []
+    for i in range(n_fixtures):
+        a, b = i % n_teams + 1, (i + 1 + i // n_teams) % n_teams + 1
+        b = b if b != a else a % n_teams + 1
+        fixtures.append({'id': i + 1, 'event_id': event.id, 'team_a_id': a, 'team_b_id': b,
+                         'start_time': datetime(2026, 1, 1) + timedelta(hours=i),
+                         'score_data': {str(a): {'runs': 150}, str(b): {'runs': 140}}})
+    db.session.execute(insert(Fixture), fixtures)
+    db.session.execute(insert(FixtureAggregate), [
+        {'fixture_id': f['id'], 'team_a_score': 150, 'team_b_score': 140, 'summary': {},
+         'updated_at': datetime.utcnow()} for f in fixtures
+    ])
+    db.session.commit()
+    return fixtures[-1]
+
+
+def run(size, repeats):
+    app = create_app(ScratchConfig)
+    with app.app_context():
+        db.create_all()
+        target = seed_event(size)
+        fixture = db.session.get(Fixture, target['id'])
+
+        # First save builds the event's standings once; measure the saves after it
+        apply_attempts(fixture, [(target['team_a_id'], 'runs', 100.0)])
+
+        timings, queries = [], []
+        for i in range(repeats):
+            runs = 120.0 + (i % 2) * 60  # flip the result every save
+            with count_queries() as counter:
+                start = time.perf_counter()
+                apply_attempts(fixture, [(target['team_a_id'], 'runs', runs)])
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(counter.count)
+        db.session.remove()
+    return statistics.median(timings), max(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'fixtures':>10} {'median ms':>10} {'queries':>8}")
+    for size in args.sizes:
+        median_ms, queries = run(size, args.repeats)
+        print(f"{size:>10} {median_ms:>10.2f} {queries:>8}")
+
+
+if __name__ == '__main__':
+    main()
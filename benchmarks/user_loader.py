@@ -0,0 +1,80 @@
+"""
+Counts the SQL round trips of common authenticated requests with the user
+loader hitting the DB every time (before) and served from the cached
+snapshot (after).
+
+    python -m benchmarks.user_loader --users 2000 --events 500 --follows 200
+"""
+import argparse
+import random
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.cli import _seed_listing_rows
+from app.extensions import db
+from app.models import User, registrations
+from app.profiling import count_queries
+from config import ScratchConfig
+
+REQUESTS = [
+    ('GET', '/', None),
+    ('POST', '/api/filter_events', {'sport_id': 'all'}),
+    ('POST', '/api/get_event_details', {'event_id': 1}),
+    ('GET', '/users/manager/dashboard', None),
+    ('GET', '/users/dashboard', None),
+]
+
+
+def seed(n_users, n_events, follows):
+    """Listing dataset plus n_users public users; the benchmark user follows `follows` events"""
+    _seed_listing_rows(n_events, teams_per_event=2, players_per_team=3)
+    first_id = db.session.query(db.func.max(User.id)).scalar() + 1
+    db.session.execute(insert(User), [
+        {'id': first_id + i, 'username': f'fan{i}', 'email': f'fan{i}@example.com', 'role': 'public',
+         'password_hash': 'x'} for i in range(n_users)
+    ])
+    rng = random.Random(7)
+    db.session.execute(insert(registrations), [
+        {'user_id': 1, 'event_id': event_id} for event_id in rng.sample(range(1, n_events + 1), follows)
+    ])
+    db.session.commit()
+
+
+def measure(ttl, args):
+    config = type('BenchConfig', (ScratchConfig,), {'USER_CACHE_TTL': ttl})
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        seed(args.users, args.events, args.follows)
+        engine = db.engine
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'  # manager 0 from the listing dataset
+        session['_fresh'] = True
+
+    results = {}
+    for method, url, data in REQUESTS:
+        client.open(url, method=method, data=data)  # warm the caches
+        with count_queries(engine) as counter:
+            client.open(url, method=method, data=data)
+        results[url] = counter.count
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--follows', type=int, default=200)
+    args = parser.parse_args()
+
+    before, after = measure(0, args), measure(60, args)
+    print(f"{'request':<32} {'before':>7} {'after':>7}")
+    for url in before:
+        print(f"{url:<32} {before[url]:>7} {after[url]:>7}")
+
+
+if __name__ == '__main__':
+    main()
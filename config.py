@@ -39,13 +39,113 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # -------------------------
+    # Connection pool (per worker process)
+    # -------------------------
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(env("DB_POOL_SIZE", "10")),
+        "max_overflow": int(env("DB_POOL_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(env("DB_POOL_TIMEOUT", "30")),        # seconds to wait for a free connection
+        "pool_recycle": int(env("DB_POOL_RECYCLE", "1800")),      # below MySQL's wait_timeout
+        "pool_pre_ping": env("DB_POOL_PRE_PING", "1") == "1",     # drop dead connections before use
+    }
+
+    # -------------------------
+    # Listings / Pagination
+    # -------------------------
+    EVENTS_PAGE_SIZE = int(env("EVENTS_PAGE_SIZE", "12"))
+    EVENTS_MAX_PAGE_SIZE = int(env("EVENTS_MAX_PAGE_SIZE", "50"))
+
+    # -------------------------
+    # Search ('auto' = MySQL FULLTEXT on MySQL, in-memory index otherwise)
+    # -------------------------
+    SEARCH_BACKEND = env("SEARCH_BACKEND", "auto")
+    SEARCH_MAX_RESULTS = int(env("SEARCH_MAX_RESULTS", "200"))
+
+    # -------------------------
+    # Cache ('memory' = per-worker TTL+LRU, 'redis' = shared)
+    # -------------------------
+    CACHE_BACKEND = env("CACHE_BACKEND", "memory")
+    CACHE_DEFAULT_TTL = int(env("CACHE_DEFAULT_TTL", "300"))
+    CACHE_MAX_ENTRIES = int(env("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_REDIS_URL = env("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+    # -------------------------
+    # Live score streams (SSE; 'memory' = this worker only, 'redis' = fan out across workers)
+    # -------------------------
+    LIVE_BACKEND = env("LIVE_BACKEND", "memory")
+    LIVE_REDIS_URL = env("LIVE_REDIS_URL", CACHE_REDIS_URL)
+    LIVE_MAX_SUBSCRIBERS = int(env("LIVE_MAX_SUBSCRIBERS", "1000"))  # open streams per worker
+    LIVE_MAX_PENDING = int(env("LIVE_MAX_PENDING", "64"))  # queued deltas before a slow client is told to resync
+    LIVE_HEARTBEAT = int(env("LIVE_HEARTBEAT", "15"))  # seconds
+    LIVE_STREAM_MAX_SECONDS = int(env("LIVE_STREAM_MAX_SECONDS", "300"))  # then the browser reconnects
+
+    # -------------------------
+    # Logged-in user snapshots (seconds, 0 = load the user from the DB every request)
+    # -------------------------
+    USER_CACHE_TTL = int(env("USER_CACHE_TTL", "60"))
+
+    # -------------------------
+    # Static assets (fingerprinted URLs + immutable caching; off in debug so edits show up)
+    # -------------------------
+    STATIC_FINGERPRINT = env("STATIC_FINGERPRINT", "0" if DEBUG else "1") == "1"
+    STATIC_MAX_AGE = int(env("STATIC_MAX_AGE", "31536000"))
+
+    # -------------------------
+    # Conditional GETs (ETag / Last-Modified, see app/conditional.py)
+    # -------------------------
+    SPORT_CONFIG_MAX_AGE = int(env("SPORT_CONFIG_MAX_AGE", "2592000"))  # 30 days, still revalidated by ETag
+
+    # -------------------------
+    # Avatar uploads (resized by a background job, see app/avatars.py)
+    # -------------------------
+    AVATAR_MAX_BYTES = int(env("AVATAR_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    # -------------------------
+    # Background jobs (SQL-backed queue, see app/jobs.py; run `flask jobs work`)
+    # -------------------------
+    JOBS_CONCURRENCY = int(env("JOBS_CONCURRENCY", "4"))  # jobs running at once per worker
+    JOBS_POOL = env("JOBS_POOL", "thread")  # 'process' for CPU-heavy handlers (forks; needs a real database)
+    JOBS_POLL_INTERVAL = float(env("JOBS_POLL_INTERVAL", "1"))  # seconds between polls of an idle queue
+    JOBS_LEASE_SECONDS = int(env("JOBS_LEASE_SECONDS", "300"))  # a silent worker's jobs are requeued after this
+    JOBS_MAX_ATTEMPTS = int(env("JOBS_MAX_ATTEMPTS", "5"))
+    JOBS_BACKOFF_BASE = float(env("JOBS_BACKOFF_BASE", "10"))  # seconds before the first retry, then doubled
+    JOBS_BACKOFF_MAX = float(env("JOBS_BACKOFF_MAX", "3600"))
+    JOBS_KEEP_DAYS = int(env("JOBS_KEEP_DAYS", "7"))  # finished jobs kept for the metrics (`flask jobs purge`)
+
+    # -------------------------
+    # Bulk roster import (CSV / XLSX, see app/roster_import.py)
+    # -------------------------
+    IMPORT_CHUNK_ROWS = int(env("IMPORT_CHUNK_ROWS", "1000"))  # rows per executemany INSERT
+    IMPORT_MAX_ROWS = int(env("IMPORT_MAX_ROWS", "50000"))
+    IMPORT_MAX_ERRORS = int(env("IMPORT_MAX_ERRORS", "200"))  # row errors listed in the report
+
+    # -------------------------
+    # SQL profiling per request (off by default; see app/profiling.py)
+    # -------------------------
+    SQL_PROFILING = env("SQL_PROFILING", "0") == "1"
+    SQL_PROFILING_N_PLUS_ONE = int(env("SQL_PROFILING_N_PLUS_ONE", "5"))  # same statement > K times
+    SQL_SLOW_REQUEST_MS = int(env("SQL_SLOW_REQUEST_MS", "500"))
+    SQL_SLOW_LOG = env("SQL_SLOW_LOG")  # file path; unset = normal logging config only
+
     ADMIN_PASSWORD = env("ADMIN_PASSWORD", "admin123")
     MANAGER_PASSWORD = env("MANAGER_PASSWORD", "pass123")
     USER_PASSWORD = env("USER_PASSWORD", "pass123")
 
-    # Config to send reset email link
-    # MAIL_SERVER = 'smtp.googlemail.com'
-    # MAIL_PORT = 587
-    # MAIL_USE_TLS = True
-    # MAIL_USERNAME = os.environ.get('EMAIL_USER')
-    # MAIL_PASSWORD = os.environ.get('EMAIL_PASS')
+    # -------------------------
+    # Mail (reset links; sent by a background job). Unset MAIL_SERVER = links are only logged
+    # -------------------------
+    MAIL_SERVER = env("MAIL_SERVER")  # e.g. smtp.googlemail.com
+    MAIL_PORT = int(env("MAIL_PORT", "587"))
+    MAIL_USE_TLS = env("MAIL_USE_TLS", "1") == "1"
+    MAIL_USERNAME = env("EMAIL_USER")
+    MAIL_PASSWORD = env("EMAIL_PASS")
+    MAIL_DEFAULT_SENDER = env("MAIL_DEFAULT_SENDER", "noreply@sportsmanager.com")
+
+
+class ScratchConfig(Config):
+    """Throwaway in-memory SQLite app for perf checks and benchmarks (never touches the real DB)"""
+    SQLALCHEMY_DATABASE_URI = env("SCRATCH_DATABASE_URI", "sqlite://")
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # in-memory SQLite uses a single static connection
+    TESTING = True
+    WTF_CSRF_ENABLED = False
@@ -1,5 +1,5 @@
 import random
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from faker import Faker
 from app import create_app, db
 from app.models import User, Sport, Venue, Event, Team, Player, Fixture
@@ -17,6 +17,18 @@ EVENTS_PER_MANAGER = 2
 
 # --- CHHATTISGARH CONFIGURATION ---
 CG_CITIES = ['Raipur', 'Bilaspur', 'Durg', 'Bhilai']
+TEAM_SUFFIXES = ['Lions', 'Tigers', 'Royals', 'Stars', 'Warriors']
+
+SPORTS = [
+    {'name': 'Cricket', 'type': 'team',
+     'config_schema': {"roles": ["Batsman", "Bowler", "Wicketkeeper"], "scoring_unit": "runs"}},
+    {'name': 'Football', 'type': 'team',
+     'config_schema': {"roles": ["Striker", "Midfielder", "Defender", "Goalie"], "scoring_unit": "goals"}},
+    {'name': 'Kabaddi', 'type': 'team',
+     'config_schema': {"roles": ["Raider", "Defender"], "scoring_unit": "points"}},
+    {'name': 'Badminton', 'type': 'individual',
+     'config_schema': {"roles": ["Single", "Double"], "scoring_unit": "sets"}}
+]
 
 
 def create_database():
@@ -62,7 +74,9 @@ def seed_weightlifting():
     print("✅ Weightlifting configured successfully.")
 
 
-def seed_data():
+def seed_data(today=None):
+    """Demo dataset; event dates and statuses are relative to `today` (default: the real today)"""
+    today = today or datetime.now().date()
     app = create_app()
     with app.app_context():
         # 1. WIPE EVERYTHING CLEAN
@@ -73,19 +87,8 @@ def seed_data():
 
         # 2. SPORTS
         print("🏆 Seeding Sports...")
-        sports_data = [
-            {'name': 'Cricket', 'type': 'team',
-             'config_schema': {"roles": ["Batsman", "Bowler", "Wicketkeeper"], "scoring_unit": "runs"}},
-            {'name': 'Football', 'type': 'team',
-             'config_schema': {"roles": ["Striker", "Midfielder", "Defender", "Goalie"], "scoring_unit": "goals"}},
-            {'name': 'Kabaddi', 'type': 'team',
-             'config_schema': {"roles": ["Raider", "Defender"], "scoring_unit": "points"}},
-            {'name': 'Badminton', 'type': 'individual',
-             'config_schema': {"roles": ["Single", "Double"], "scoring_unit": "sets"}}
-        ]
-
         db_sports = []
-        for s in sports_data:
+        for s in SPORTS:
             sport = Sport(name=s['name'], type=s['type'], config_schema=s['config_schema'])
             db.session.add(sport)
             db_sports.append(sport)
@@ -146,9 +149,9 @@ def seed_data():
         for mgr in managers:
             for _ in range(EVENTS_PER_MANAGER):
                 sport = random.choice(db_sports)
-                start_date = fake.date_between(start_date='-2m', end_date='+2m')
+                start_date = fake.date_between(start_date=today - timedelta(days=60),
+                                               end_date=today + timedelta(days=60))
 
-                today = datetime.now().date()
                 if start_date < today:
                     status = 'completed'
                 elif start_date == today:
@@ -176,7 +179,7 @@ def seed_data():
                 for _ in range(random.randint(4, 6)):
                     # Use CG City for Team Name
                     team_city = random.choice(CG_CITIES)
-                    t_name = f"{team_city} {random.choice(['Lions', 'Tigers', 'Royals', 'Stars', 'Warriors'])}"
+                    t_name = f"{team_city} {random.choice(TEAM_SUFFIXES)}"
 
                     team = Team(event_id=event.id, name=t_name, city=team_city, coach_name=fake.name())
                     db.session.add(team)
@@ -217,6 +220,249 @@ def seed_data():
         print(f"   - Specific User: suyashuser@gmail.com")
 
 
-if __name__ == '__main__':
+
+# ==========================================
+# BULK SEEDING (load-testing datasets)
+# ==========================================
+# python dbs.py --users 100000 --events 20000 --seed 42
+#
+# Rows are generated lazily and written in batches with Core executemany,
+# so memory stays flat whatever the size. Synthetic accounts share one
+# precomputed password hash (USER_PASSWORD / MANAGER_PASSWORD) instead of
+# hashing per user, and Faker only fills small pools of names that rows
+# sample from. IDs are assigned up front so child rows never read back.
+NAME_POOL_SIZE = 2000
+# Seeded runs date events from this day instead of the wall clock, so the
+# same --seed gives the same dataset whichever day it runs (--anchor-date overrides)
+SEED_ANCHOR_DATE = date(2026, 1, 1)
+
+
+def anchor_date(seed=None, anchor=None):
+    """The "today" generated dates and statuses are relative to"""
+    if anchor is not None:
+        return anchor
+    return SEED_ANCHOR_DATE if seed is not None else datetime.now().date()
+
+
+def batched(rows, size):
+    """Yields lists of at most `size` items from any iterable"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_rows(model_or_table, rows, batch_size=5000):
+    """Core executemany in batches; returns the number of rows written"""
+    table = getattr(model_or_table, '__table__', model_or_table)
+    total = 0
+    for batch in batched(rows, batch_size):
+        db.session.execute(sqlalchemy.insert(table), batch)
+        total += len(batch)
+    db.session.commit()
+    return total
+
+
+class BulkPlan:
+    """Sizes and the id ranges derived from them (shared by the generators below)"""
+
+    def __init__(self, users, events, managers=None, venues=None, teams_per_event=(4, 6),
+                 players_per_team=12, fixtures_per_event=3, follows_per_user=3):
+        self.users = users
+        self.events = events
+        self.managers = managers or max(TOTAL_MANAGERS, users // 50)
+        self.venues = venues or max(TOTAL_VENUES, events // 100)
+        self.teams_per_event = teams_per_event
+        self.players_per_team = players_per_team
+        self.fixtures_per_event = fixtures_per_event
+        self.follows_per_user = follows_per_user
+
+        # ids: 1 = admin, then managers, then public users
+        self.first_manager_id = 2
+        self.first_user_id = self.first_manager_id + self.managers
+
+
+def generate_users(plan, rng, password_hashes):
+    yield {'id': 1, 'username': 'admin', 'email': 'admin@suyash.com', 'role': 'admin',
+           'password_hash': password_hashes['admin']}
+    for i in range(plan.managers):
+        username, email = ('suyashmanager', 'suyashmanager@gmail.com') if i == 0 else \
+            (f"{fake.first_name().lower()}.m{i}", f"manager{i}@example.com")
+        yield {'id': plan.first_manager_id + i, 'username': username, 'email': email, 'role': 'manager',
+               'password_hash': password_hashes['manager']}
+    for i in range(plan.users):
+        username, email = ('suyashuser', 'suyashuser@gmail.com') if i == 0 else \
+            (f"{fake.user_name()}{i}", f"user{i}@example.com")  # suffix keeps both unique without fake.unique
+        yield {'id': plan.first_user_id + i, 'username': username[:50], 'email': email, 'role': 'user',
+               'password_hash': password_hashes['user']}
+
+
+def generate_venues(plan, rng):
+    for i in range(plan.venues):
+        yield {'id': i + 1, 'name': f"{fake.company()} Stadium", 'city': rng.choice(CG_CITIES),
+               'address': fake.address()}
+
+
+def generate_events(plan, rng, sports, today):
+    for i in range(plan.events):
+        sport = sports[i % len(sports)]
+        start_date = today + timedelta(days=rng.randint(-60, 60))
+        status = 'completed' if start_date < today else 'live' if start_date == today else 'upcoming'
+        yield {
+            'id': i + 1, 'sport_id': sport['id'], 'manager_id': plan.first_manager_id + rng.randrange(plan.managers),
+            'venue_id': rng.randint(1, plan.venues), 'start_date': start_date, 'status': status,
+            'title': f"{rng.choice(CG_CITIES)} {sport['name']} Cup {start_date.year}",
+            'description': fake.paragraph(nb_sentences=2),
+            'rules_config': {"standard": {"overs": 20}, "custom": []},
+        }
+
+
+def generate_rosters(plan, rng, events, sports):
+    """
+    Teams, players and fixtures for the team-sport events.
+    Yields ('team' | 'player' | 'fixture', row) so one pass over the events feeds three tables.
+    """
+    sports_by_id = {sport['id']: sport for sport in sports}
+    names = [fake.name_male() for _ in range(NAME_POOL_SIZE)]
+    team_id, player_id = 0, 0
+    for event in events:
+        sport = sports_by_id[event['sport_id']]
+        if sport['type'] != 'team':
+            continue
+        roles = sport['config_schema'].get('roles') or ['Player']
+        teams = []
+        for _ in range(rng.randint(*plan.teams_per_event)):
+            team_id += 1
+            city = rng.choice(CG_CITIES)
+            team = {'id': team_id, 'event_id': event['id'], 'name': f"{city} {rng.choice(TEAM_SUFFIXES)}",
+                    'city': city, 'coach_name': rng.choice(names)}
+            teams.append(team)
+            yield 'team', team
+            for _ in range(plan.players_per_team):
+                player_id += 1
+                yield 'player', {'id': player_id, 'team_id': team_id, 'name': rng.choice(names),
+                                 'details': {"role": rng.choice(roles)}}
+
+        event_start = datetime.combine(event['start_date'], datetime.min.time())
+        for _ in range(plan.fixtures_per_event):
+            t1, t2 = rng.sample(teams, 2)
+            yield 'fixture', {
+                'event_id': event['id'], 'venue_id': event['venue_id'], 'team_a_id': t1['id'], 'team_b_id': t2['id'],
+                'start_time': event_start + timedelta(days=rng.randint(0, 5), hours=rng.randint(10, 20)),
+                'title': f"{t1['name']} vs {t2['name']}", 'score_data': {},
+            }
+
+
+def generate_follows(plan, rng):
+    for i in range(plan.users):
+        for event_id in rng.sample(range(1, plan.events + 1), min(plan.follows_per_user, plan.events)):
+            yield {'user_id': plan.first_user_id + i, 'event_id': event_id}
+
+
+def seed_bulk(plan, seed=None, batch_size=5000, anchor=None):
+    """Fills an empty schema (caller handles create_all); needs an app context"""
+    from werkzeug.security import generate_password_hash
+    from app.models import registrations
+
+    rng = random.Random(seed)
+    if seed is not None:
+        Faker.seed(seed)
+    timings = {}
+
+    def timed(name, count_fn):
+        start = datetime.now()
+        count = count_fn()
+        seconds = (datetime.now() - start).total_seconds()
+        timings[name] = (count, seconds)
+        print(f"   {name:<9} {count:>9,} rows in {seconds:6.1f}s ({count / max(seconds, 1e-6):,.0f}/s)")
+
+    print("🏆 Seeding Sports...")
+    insert_rows(Sport, [{'id': i + 1, **sport} for i, sport in enumerate(SPORTS)])
+    seed_weightlifting()
+    sports = [{'id': s.id, 'name': s.name, 'type': s.type, 'config_schema': s.config_schema or {}}
+              for s in Sport.query.order_by(Sport.id)]
+
+    print("🔑 Hashing the shared passwords (once each)...")
+    password_hashes = {'admin': generate_password_hash(Config.ADMIN_PASSWORD),
+                       'manager': generate_password_hash(Config.MANAGER_PASSWORD),
+                       'user': generate_password_hash(Config.USER_PASSWORD)}
+
+    print("🚀 Bulk inserting...")
+    timed('users', lambda: insert_rows(User, generate_users(plan, rng, password_hashes), batch_size))
+    timed('venues', lambda: insert_rows(Venue, generate_venues(plan, rng), batch_size))
+
+    # Events are kept (as small dicts) because the roster pass needs their sport / date / venue
+    events = list(generate_events(plan, rng, sports, anchor_date(seed, anchor)))
+    timed('events', lambda: insert_rows(Event, events, batch_size))
+
+    def insert_rosters():
+        pending = {'team': [], 'player': [], 'fixture': []}
+        models = {'team': Team, 'player': Player, 'fixture': Fixture}
+        counts = dict.fromkeys(pending, 0)
+        for kind, row in generate_rosters(plan, rng, events, sports):
+            pending[kind].append(row)
+            if len(pending[kind]) == batch_size:
+                if kind != 'team':  # children reference teams: flush those first
+                    _flush_batch(Team, pending['team'], counts, 'team')
+                _flush_batch(models[kind], pending[kind], counts, kind)
+        for kind in ('team', 'player', 'fixture'):
+            _flush_batch(models[kind], pending[kind], counts, kind)
+        db.session.commit()
+        print(f"   (teams {counts['team']:,}, players {counts['player']:,}, fixtures {counts['fixture']:,})")
+        return sum(counts.values())
+
+    timed('rosters', insert_rosters)
+    timed('follows', lambda: insert_rows(registrations, generate_follows(plan, rng), batch_size))
+    return timings
+
+
+def _flush_batch(model, rows, counts, kind):
+    if rows:
+        db.session.execute(sqlalchemy.insert(model.__table__), rows)
+        counts[kind] += len(rows)
+        rows.clear()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Seed the database (demo data by default, or a bulk dataset).")
+    parser.add_argument('--users', type=int, help='Public users to generate (switches to bulk mode).')
+    parser.add_argument('--events', type=int, help='Events to generate (switches to bulk mode).')
+    parser.add_argument('--managers', type=int, help='Default: users / 50.')
+    parser.add_argument('--venues', type=int, help='Default: events / 100.')
+    parser.add_argument('--players-per-team', type=int, default=12)
+    parser.add_argument('--follows-per-user', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, help='Random seed for a reproducible dataset.')
+    parser.add_argument('--anchor-date', type=date.fromisoformat,
+                        help=f"YYYY-MM-DD that event dates are generated around (with --seed, default "
+                             f"{SEED_ANCHOR_DATE}; otherwise today).")
+    args = parser.parse_args()
+
     create_database()
-    seed_data()
\ No newline at end of file
+    if args.users is None and args.events is None:
+        if args.seed is not None:
+            random.seed(args.seed)
+            Faker.seed(args.seed)
+        seed_data(anchor_date(args.seed, args.anchor_date))
+        return
+
+    plan = BulkPlan(args.users or TOTAL_USERS, args.events or TOTAL_MANAGERS * EVENTS_PER_MANAGER,
+                    managers=args.managers, venues=args.venues, players_per_team=args.players_per_team,
+                    follows_per_user=args.follows_per_user)
+    app = create_app()
+    with app.app_context():
+        print("🗑️  Dropping old tables...")
+        db.drop_all()
+        print("🔨 Creating new tables...")
+        db.create_all()
+        seed_bulk(plan, seed=args.seed, batch_size=args.batch_size, anchor=args.anchor_date)
+    print(f"\n✨ SUCCESS! Bulk dataset: {plan.users:,} users, {plan.events:,} events.")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""fulltext search on events
+
+Revision ID: 8c41d2f0a7b3
+Revises: 3238f15f228d
+Create Date: 2026-10-17 10:12:41.220318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41d2f0a7b3'
+down_revision = '3238f15f228d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FULLTEXT only exists on MySQL; other databases use the in-memory search index
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_title_description_ft', ['title', 'description'],
+                              unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_title_description_ft')
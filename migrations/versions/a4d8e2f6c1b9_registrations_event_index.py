@@ -0,0 +1,41 @@
+"""index registrations by event for follower lookups
+
+Revision ID: a4d8e2f6c1b9
+Revises: f1b3e7c2d8a4
+Create Date: 2026-10-17 15:12:40.214385
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d8e2f6c1b9'
+down_revision = 'f1b3e7c2d8a4'
+branch_labels = None
+depends_on = None
+
+
+def _keep_fk_index(table, column, dropping):
+    """
+    MySQL won't drop the last index a foreign key can use, and creating ours
+    made InnoDB discard the one it had added for the key. Put that one back
+    (InnoDB names it after the column) before dropping ours.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    if not any(index['column_names'][:1] == [column] and index['name'] not in dropping
+               for index in sa.inspect(bind).get_indexes(table)):
+        op.create_index(column, table, [column], unique=False)
+
+
+def upgrade():
+    with op.batch_alter_table('registrations', schema=None) as batch_op:
+        batch_op.create_index('ix_registrations_event', ['event_id'], unique=False)
+
+
+def downgrade():
+    _keep_fk_index('registrations', 'event_id', ['ix_registrations_event'])
+    with op.batch_alter_table('registrations', schema=None) as batch_op:
+        batch_op.drop_index('ix_registrations_event')
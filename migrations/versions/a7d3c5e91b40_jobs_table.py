@@ -0,0 +1,51 @@
+"""jobs table (background job queue)
+
+Revision ID: a7d3c5e91b40
+Revises: e83f1c6a9d42
+Create Date: 2026-10-17 21:12:48.305117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3c5e91b40'
+down_revision = 'e83f1c6a9d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by app.jobs.enqueue(), drained by `flask jobs work`
+    op.create_table('jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('payload', mysql.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('unique_key', sa.String(length=100), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(length=64), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_status_run_at', ['status', 'run_at'], unique=False)
+        batch_op.create_index('ix_jobs_status_finished', ['status', 'finished_at'], unique=False)
+        batch_op.create_index('ix_jobs_unique_key', ['unique_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_unique_key')
+        batch_op.drop_index('ix_jobs_status_finished')
+        batch_op.drop_index('ix_jobs_status_run_at')
+
+    op.drop_table('jobs')
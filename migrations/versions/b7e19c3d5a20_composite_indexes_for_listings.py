@@ -0,0 +1,74 @@
+"""composite indexes for listing and ownership queries
+
+Revision ID: b7e19c3d5a20
+Revises: 8c41d2f0a7b3
+Create Date: 2026-10-17 11:03:27.518944
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e19c3d5a20'
+down_revision = '8c41d2f0a7b3'
+branch_labels = None
+depends_on = None
+
+
+def _keep_fk_index(table, column, dropping):
+    """
+    MySQL won't drop the last index a foreign key can use, and creating ours
+    made InnoDB discard the one it had added for the key. Put that one back
+    (InnoDB names it after the column) before dropping ours.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    if not any(index['column_names'][:1] == [column] and index['name'] not in dropping
+               for index in sa.inspect(bind).get_indexes(table)):
+        op.create_index(column, table, [column], unique=False)
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_manager_status', ['manager_id', 'status'], unique=False)
+        batch_op.create_index('ix_events_manager_start', ['manager_id', 'start_date'], unique=False)
+        batch_op.create_index('ix_events_start_id', ['start_date', 'id'], unique=False)
+        batch_op.create_index('ix_events_sport_start', ['sport_id', 'start_date', 'id'], unique=False)
+        batch_op.create_index('ix_events_venue_start', ['venue_id', 'start_date', 'id'], unique=False)
+        batch_op.create_index('ix_events_status', ['status'], unique=False)
+
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.create_index('ix_teams_event', ['event_id'], unique=False)
+
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.create_index('ix_players_team', ['team_id'], unique=False)
+
+    with op.batch_alter_table('fixtures', schema=None) as batch_op:
+        batch_op.create_index('ix_fixtures_event_start', ['event_id', 'start_time'], unique=False)
+
+
+def downgrade():
+    _keep_fk_index('fixtures', 'event_id', ['ix_fixtures_event_start'])
+    with op.batch_alter_table('fixtures', schema=None) as batch_op:
+        batch_op.drop_index('ix_fixtures_event_start')
+
+    _keep_fk_index('players', 'team_id', ['ix_players_team'])
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.drop_index('ix_players_team')
+
+    _keep_fk_index('teams', 'event_id', ['ix_teams_event'])
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.drop_index('ix_teams_event')
+
+    _keep_fk_index('events', 'manager_id', ['ix_events_manager_status', 'ix_events_manager_start'])
+    _keep_fk_index('events', 'sport_id', ['ix_events_sport_start'])
+    _keep_fk_index('events', 'venue_id', ['ix_events_venue_start'])
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_status')
+        batch_op.drop_index('ix_events_venue_start')
+        batch_op.drop_index('ix_events_sport_start')
+        batch_op.drop_index('ix_events_start_id')
+        batch_op.drop_index('ix_events_manager_start')
+        batch_op.drop_index('ix_events_manager_status')
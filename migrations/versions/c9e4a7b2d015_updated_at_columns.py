@@ -0,0 +1,41 @@
+"""updated_at columns for conditional GETs
+
+Revision ID: c9e4a7b2d015
+Revises: a4d8e2f6c1b9
+Create Date: 2026-10-17 17:40:03.518227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e4a7b2d015'
+down_revision = 'a4d8e2f6c1b9'
+branch_labels = None
+depends_on = None
+
+TABLES = ('sports', 'events', 'teams', 'fixtures')
+
+
+def upgrade():
+    # Added nullable, backfilled, then tightened: SQLite can't ADD COLUMN with a
+    # non-constant default
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(sa.text(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP"))
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_updated_at')
+
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,26 @@
+"""fixture version column for optimistic concurrency
+
+Revision ID: d2a6f4b81c09
+Revises: b7e19c3d5a20
+Create Date: 2026-10-17 12:20:05.771402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a6f4b81c09'
+down_revision = 'b7e19c3d5a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('fixtures', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('fixtures', schema=None) as batch_op:
+        batch_op.drop_column('version')
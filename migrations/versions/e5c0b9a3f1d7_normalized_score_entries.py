@@ -0,0 +1,108 @@
+"""normalized score entries and fixture aggregates
+
+Revision ID: e5c0b9a3f1d7
+Revises: d2a6f4b81c09
+Create Date: 2026-10-17 13:41:52.093317
+
+"""
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c0b9a3f1d7'
+down_revision = 'd2a6f4b81c09'
+branch_labels = None
+depends_on = None
+
+DERIVED_FIELDS = ('best_snatch', 'best_cj', 'total')
+
+
+def upgrade():
+    score_entries = op.create_table('score_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fixture_id', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=32), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('recorded_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['fixture_id'], ['fixtures.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('fixture_id', 'player_id', 'metric', name='uq_score_entries_attempt')
+    )
+    with op.batch_alter_table('score_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_score_entries_player_metric', ['player_id', 'metric'], unique=False)
+        batch_op.create_index('ix_score_entries_metric_value', ['metric', 'value'], unique=False)
+
+    fixture_aggregates = op.create_table('fixture_aggregates',
+        sa.Column('fixture_id', sa.Integer(), nullable=False),
+        sa.Column('team_a_score', sa.Float(), nullable=True),
+        sa.Column('team_b_score', sa.Float(), nullable=True),
+        sa.Column('top_player_id', sa.Integer(), nullable=True),
+        sa.Column('top_total', sa.Float(), nullable=True),
+        sa.Column('summary', mysql.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['fixture_id'], ['fixtures.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('fixture_id')
+    )
+
+    _backfill(score_entries, fixture_aggregates)
+
+
+def _backfill(score_entries, fixture_aggregates):
+    """Copies every Fixture.score_data blob into the new tables"""
+    bind = op.get_bind()
+    now = datetime.utcnow()
+
+    player_teams = dict(bind.execute(sa.text("SELECT id, team_id FROM players")).fetchall())
+    rows = bind.execute(sa.text(
+        "SELECT f.id, f.team_a_id, f.team_b_id, f.score_data, s.config_schema "
+        "FROM fixtures f JOIN events e ON e.id = f.event_id JOIN sports s ON s.id = e.sport_id "
+        "WHERE f.score_data IS NOT NULL"
+    )).fetchall()
+
+    for fixture_id, team_a_id, team_b_id, score_data, config_schema in rows:
+        scores = json.loads(score_data) if isinstance(score_data, str) else (score_data or {})
+        schema = json.loads(config_schema) if isinstance(config_schema, str) else (config_schema or {})
+        scoring_unit = schema.get('scoring_unit')
+
+        entries, summary, team_totals = [], {}, {}
+        top_player_id, top_total = None, None
+        for pid, entry in scores.items():
+            if int(pid) not in player_teams:
+                continue  # player was deleted, nothing to point the row at
+            for metric, value in entry.items():
+                if metric not in DERIVED_FIELDS and isinstance(value, (int, float)):
+                    entries.append({'fixture_id': fixture_id, 'player_id': int(pid), 'metric': metric,
+                                    'value': value, 'recorded_at': now})
+            summary[pid] = {k: entry[k] for k in DERIVED_FIELDS if k in entry}
+            total = entry.get('total')
+            if total is not None and (top_total is None or total > top_total):
+                top_player_id, top_total = int(pid), total
+            if scoring_unit and scoring_unit in entry:
+                team_id = player_teams[int(pid)]
+                team_totals[team_id] = team_totals.get(team_id, 0) + entry[scoring_unit]
+
+        if entries:
+            op.bulk_insert(score_entries, entries)
+        op.bulk_insert(fixture_aggregates, [{
+            'fixture_id': fixture_id,
+            'team_a_score': team_totals.get(team_a_id) if team_a_id else None,
+            'team_b_score': team_totals.get(team_b_id) if team_b_id else None,
+            'top_player_id': top_player_id,
+            'top_total': top_total,
+            'summary': summary,
+            'updated_at': now,
+        }])
+
+
+def downgrade():
+    op.drop_table('fixture_aggregates')
+    # Indexes go with the table. Dropping ix_score_entries_player_metric on its own fails on
+    # MySQL: it is the only index the player_id foreign key can use
+    op.drop_table('score_entries')
@@ -0,0 +1,87 @@
+"""fixture end_time and venue occupancy index
+
+Revision ID: e83f1c6a9d42
+Revises: c9e4a7b2d015
+Create Date: 2026-10-17 19:05:27.660914
+
+"""
+import json
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e83f1c6a9d42'
+down_revision = 'c9e4a7b2d015'
+branch_labels = None
+depends_on = None
+
+
+def _keep_fk_index(table, column, dropping):
+    """
+    MySQL won't drop the last index a foreign key can use, and creating ours
+    made InnoDB discard the one it had added for the key. Put that one back
+    (InnoDB names it after the column) before dropping ours.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    if not any(index['column_names'][:1] == [column] and index['name'] not in dropping
+               for index in sa.inspect(bind).get_indexes(table)):
+        op.create_index(column, table, [column], unique=False)
+
+
+def _match_minutes(rules_config):
+    # Frozen copy of app.scheduling.match_minutes as of this revision
+    if isinstance(rules_config, str):
+        rules_config = json.loads(rules_config)
+    standard = (rules_config or {}).get('standard') or {}
+
+    def number(key):
+        try:
+            return float(standard.get(key) or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    if number('match_minutes'):
+        minutes = number('match_minutes')
+    elif number('Match Duration (mins)'):
+        minutes = number('Match Duration (mins)')
+    elif number('Half Duration (mins)'):
+        minutes = number('Half Duration (mins)') * 2 + 15
+    elif number('Overs Per Innings'):
+        minutes = number('Overs Per Innings') * 2 * 4 + 20
+    else:
+        minutes = 90
+    return max(1, min(int(minutes), 24 * 60))
+
+
+def upgrade():
+    with op.batch_alter_table('fixtures', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('end_time', sa.DateTime(), nullable=True))
+
+    # Backfill from each event's match length
+    conn = op.get_bind()
+    fixtures = sa.table('fixtures', sa.column('id', sa.Integer), sa.column('event_id', sa.Integer),
+                        sa.column('start_time', sa.DateTime), sa.column('end_time', sa.DateTime))
+    events = sa.table('events', sa.column('id', sa.Integer), sa.column('rules_config', sa.JSON))
+    minutes = {row.id: _match_minutes(row.rules_config) for row in conn.execute(sa.select(events))}
+    rows = conn.execute(sa.select(fixtures.c.id, fixtures.c.event_id, fixtures.c.start_time)).all()
+    if rows:
+        conn.execute(fixtures.update().where(fixtures.c.id == sa.bindparam('fid')).values(
+            end_time=sa.bindparam('end')), [
+            {'fid': row.id, 'end': row.start_time + timedelta(minutes=minutes.get(row.event_id, 90))}
+            for row in rows])
+
+    with op.batch_alter_table('fixtures', schema=None) as batch_op:
+        batch_op.alter_column('end_time', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_fixtures_venue_time', ['venue_id', 'start_time', 'end_time'], unique=False)
+
+
+def downgrade():
+    _keep_fk_index('fixtures', 'venue_id', ['ix_fixtures_venue_time'])
+    with op.batch_alter_table('fixtures', schema=None) as batch_op:
+        batch_op.drop_index('ix_fixtures_venue_time')
+        batch_op.drop_column('end_time')
@@ -0,0 +1,48 @@
+"""standings table
+
+Revision ID: f1b3e7c2d8a4
+Revises: e5c0b9a3f1d7
+Create Date: 2026-10-17 14:26:10.448915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b3e7c2d8a4'
+down_revision = 'e5c0b9a3f1d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are created on the first score save of each event (app/standings.py)
+    op.create_table('standings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('player_id', sa.Integer(), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('played', sa.Integer(), nullable=False),
+        sa.Column('won', sa.Integer(), nullable=False),
+        sa.Column('drawn', sa.Integer(), nullable=False),
+        sa.Column('lost', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Float(), nullable=False),
+        sa.Column('score_for', sa.Float(), nullable=False),
+        sa.Column('score_against', sa.Float(), nullable=False),
+        sa.Column('overs_for', sa.Float(), nullable=False),
+        sa.Column('overs_against', sa.Float(), nullable=False),
+        sa.Column('best_total', sa.Float(), nullable=True),
+        sa.Column('sinclair_total', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id', 'team_id', 'player_id', name='uq_standings_entry')
+    )
+
+
+def downgrade():
+    op.drop_table('standings')